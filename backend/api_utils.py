@@ -2,39 +2,169 @@ import sys
 import os
 import pandas as pd
 import json
+from typing import Optional
 
 # Add parent directory to path to import forecast.py
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from forecast import run_forecast
+    from forecast import ForecastEngine, FORECAST_YEARS, SeasonNotFoundError
+    from model import CACHE_DIR
+    import profiling
 except ImportError:
     # Fallback for when running from root
-    from nba_mvp_model.forecast import run_forecast
+    from nba_mvp_model.forecast import ForecastEngine, FORECAST_YEARS, SeasonNotFoundError
+    from nba_mvp_model.model import CACHE_DIR
+    from nba_mvp_model import profiling
 
-def get_leaderboard_data(year: int):
+from leaderboard_cache import LeaderboardCache
+
+# One engine per process: the served model bundles (the latest version of
+# every model in models/registry.json) and season panels stay in memory
+# between requests and are only rebuilt when their files change.
+# MODEL_INFERENCE picks the predict backend: auto, sklearn, numpy or numba.
+# Only numpy / numba memory-map the compact .forest.npz; auto is sklearn
+# (unpickling the full .pkl) unless numba is installed.
+engine = ForecastEngine(inference=os.environ.get("MODEL_INFERENCE", "auto"))
+
+# Serialized leaderboards keyed on input digests. Set LEADERBOARD_CACHE_DIR
+# to an empty string to keep the cache in memory only.
+leaderboard_cache = LeaderboardCache(
+    maxsize=int(os.environ.get("LEADERBOARD_CACHE_SIZE", "32")),
+    ttl=float(os.environ.get("LEADERBOARD_CACHE_TTL", "3600")),
+    disk_dir=os.environ.get("LEADERBOARD_CACHE_DIR",
+                            os.path.join(CACHE_DIR, "leaderboards")),
+)
+
+# MVP_PROFILE=cprofile|pyinstrument dumps a profile of every leaderboard,
+# simulate and refresh call to MVP_PROFILE_DIR (default cache/profiles).
+profiling.configure_profiling(os.environ.get("MVP_PROFILE") or None,
+                              os.environ.get("MVP_PROFILE_DIR") or os.path.join(CACHE_DIR, "profiles"))
+
+
+def warm_engine():
+    """
+    Load the model and build the current forecast seasons at startup.
+    Failures are logged rather than raised so the API still comes up;
+    the request path will report the error.
+    """
+    try:
+        engine.warm(FORECAST_YEARS)
+    except Exception as e:
+        print(f"Error warming forecast engine: {e}")
+
+
+def leaderboard_to_records(df: pd.DataFrame):
+    """
+    Convert a leaderboard DataFrame into JSON-safe records.
+    """
+    # Replace Infinity with large numbers or None, and NaN with None
+    # Using numpy for robust infinity checking
+    import numpy as np
+    df = df.replace([np.inf, -np.inf], None)
+    df = df.replace([pd.NA, pd.NaT], None)
+    # object first: float columns would turn the None back into NaN
+    df = df.astype(object).where(pd.notnull(df), None)
+
+    return df.to_dict(orient="records")
+
+
+@profiling.profiled("leaderboard")
+def get_cached_leaderboard(year: int, model: Optional[str] = None):
+    """
+    Return the CachedLeaderboard for a year and model selection (a model
+    name, "ensemble" or "all"; None = default model), computing it only
+    when the (year, selection, model digest, data digest) key is not cached
+    yet. Returns a dict with "error" and "status_code" on failure.
+    """
+    try:
+        selection = engine.resolve_selection(model)
+    except ValueError as e:
+        return {"error": str(e), "status_code": 400}
+    try:
+        model_digest, data_digest, last_modified = engine.fingerprint(year)
+        entry = leaderboard_cache.get((year, selection, model_digest, data_digest))
+        if entry is not None:
+            return entry
+
+        state = engine.season(year)
+        key = (year, selection, state.model_digest, state.digest)
+        return leaderboard_cache.put(
+            key, leaderboard_to_records(state.leaderboards[selection]), last_modified
+        )
+    except SeasonNotFoundError as e:
+        return {"error": str(e), "status_code": 404}
+    except Exception as e:
+        print(f"Error generating forecast: {e}")
+        return {"error": str(e), "status_code": 500}
+
+
+@profiling.profiled("refresh")
+def refresh_season(year: int, scrape: bool = False):
+    """
+    Incrementally refresh one season and put its new leaderboard in the
+    cache right away, so the next request is served from memory.
+    Returns the refresh report, or a dict with "error" and "status_code".
+    """
+    try:
+        report = engine.refresh(year, scrape=scrape)
+    except SeasonNotFoundError as e:
+        return {"error": str(e), "status_code": 404}
+    except Exception as e:
+        print(f"Error refreshing season {year}: {e}")
+        return {"error": str(e), "status_code": 500}
+
+    entry = get_cached_leaderboard(year)
+    if isinstance(entry, dict):
+        return entry
+    report["etag"] = entry.etag
+    return report
+
+
+# Upper bound on hypothetical players scored per /api/simulate call
+MAX_SIMULATE_BATCH = 100
+
+
+@profiling.profiled("simulate")
+def get_simulation(year: int, players, model: Optional[str] = None):
+    """
+    Score a batch of hypothetical stat lines against a season.
+    Returns a list of results, or a dict with "error" and "status_code".
+    """
+    if not players:
+        return {"error": "No players to simulate", "status_code": 400}
+    if len(players) > MAX_SIMULATE_BATCH:
+        return {"error": f"At most {MAX_SIMULATE_BATCH} players per request",
+                "status_code": 400}
+    try:
+        return engine.simulate(year, players, model=model)
+    except SeasonNotFoundError as e:
+        return {"error": str(e), "status_code": 404}
+    except (ValueError, TypeError) as e:
+        return {"error": str(e), "status_code": 400}
+    except Exception as e:
+        print(f"Error running simulation: {e}")
+        return {"error": str(e), "status_code": 500}
+
+
+def get_leaderboard_data(year: int, model: Optional[str] = None):
     """
     Fetches the leaderboard for a specific year.
     Returns a list of dictionaries.
     """
-    # Run forecast for the specific year (or all, then filter)
-    # forecast.py's run_forecast takes a list of years
+    entry = get_cached_leaderboard(year, model)
+    if isinstance(entry, dict):
+        return entry
+    return entry.records
+
+
+def get_model_info():
+    """
+    Served models with their registry metadata (version, metrics, feature
+    hash).
+    """
     try:
-        leaderboards = run_forecast([year])
-        if year in leaderboards:
-            df = leaderboards[year]
-            # Convert to dict
-            # We want to keep specific columns and format them
-            # Replace Infinity with large numbers or None, and NaN with None
-            # Using numpy for robust infinity checking
-            import numpy as np
-            df = df.replace([np.inf, -np.inf], None)
-            df = df.replace([pd.NA, pd.NaT], None)
-            df = df.where(pd.notnull(df), None)
-            
-            return df.to_dict(orient="records")
-        else:
-            return []
+        return engine.model_info()
     except Exception as e:
-        print(f"Error generating forecast: {e}")
+        print(f"Error reading model registry: {e}")
         return {"error": str(e)}
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class CachedLeaderboard:
+    records: List[dict]
+    etag: str
+    last_modified: float   # epoch seconds of the newest input file
+    created_at: float
+
+
+def make_etag(key: Tuple) -> str:
+    """
+    Strong ETag derived from (year, model digest, data digest). The key is
+    content-addressed, so the same inputs always produce the same tag, even
+    across restarts and processes.
+    """
+    raw = ":".join(str(k) for k in key)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+class LeaderboardCache:
+    """
+    Serialized leaderboards keyed by (year, selection, model digest, data
+    digest).
+
+    The in-memory layer is an LRU bounded by `maxsize`. If `disk_dir` is
+    set, entries are also written there as JSON so they survive restarts.
+    Both tiers expire entries `ttl` seconds after they were computed (a
+    disk entry reloaded into memory keeps its original age). A put also
+    drops every entry of the same (year, selection) under older digests:
+    once the model or the season's CSVs change they are never asked for
+    again.
+    """
+
+    def __init__(self, maxsize: int = 32, ttl: float = 3600.0,
+                 disk_dir: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk_dir = disk_dir or None
+        self._entries: "OrderedDict[Tuple, CachedLeaderboard]" = OrderedDict()
+        self._lock = threading.Lock()
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._sweep_disk()
+
+    @staticmethod
+    def _slot(key: Tuple) -> str:
+        # (year, selection): the part of the key a newer entry supersedes
+        return "-".join(re.sub(r"[^A-Za-z0-9_]", "_", str(k)) for k in key[:2])
+
+    def _disk_path(self, key: Tuple) -> str:
+        name = f"{self._slot(key)}-{make_etag(key).strip(chr(34))}.json"
+        return os.path.join(self.disk_dir, name)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return now - created_at > self.ttl
+
+    def _sweep_disk(self) -> None:
+        """
+        Remove disk entries older than the TTL (by file mtime, which is
+        when they were written).
+        """
+        now = time.time()
+        for name in os.listdir(self.disk_dir):
+            path = os.path.join(self.disk_dir, name)
+            try:
+                if name.endswith(".json") and self._expired(os.path.getmtime(path), now):
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _read_disk(self, key: Tuple) -> Optional[CachedLeaderboard]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        created_at = payload.get("created_at", 0.0)
+        if self._expired(created_at, time.time()):
+            self._remove_disk(path)
+            return None
+        return CachedLeaderboard(
+            records=payload["records"],
+            etag=make_etag(key),
+            last_modified=payload["last_modified"],
+            created_at=created_at,
+        )
+
+    def _write_disk(self, key: Tuple, entry: CachedLeaderboard) -> None:
+        path = self._disk_path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"records": entry.records,
+                           "last_modified": entry.last_modified,
+                           "created_at": entry.created_at}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Warning: could not write leaderboard cache {path}: {e}")
+            return
+        # Older digests of the same (year, selection) are dead
+        prefix = self._slot(key) + "-"
+        for name in os.listdir(self.disk_dir):
+            if name.startswith(prefix) and name.endswith(".json") and name != os.path.basename(path):
+                # The etag part is hex, so another slot can't share the prefix
+                if re.fullmatch(r"[0-9a-f]{32}\.json", name[len(prefix):]):
+                    self._remove_disk(os.path.join(self.disk_dir, name))
+
+    @staticmethod
+    def _remove_disk(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, key: Tuple) -> Optional[CachedLeaderboard]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry.created_at, now):
+                    self._entries.move_to_end(key)
+                    return entry
+                del self._entries[key]
+
+        if self.disk_dir:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+                return entry
+        return None
+
+    def put(self, key: Tuple, records: List[dict],
+            last_modified: float) -> CachedLeaderboard:
+        entry = CachedLeaderboard(
+            records=records,
+            etag=make_etag(key),
+            last_modified=last_modified,
+            created_at=time.time(),
+        )
+        self._remember(key, entry, supersede=True)
+        if self.disk_dir:
+            self._write_disk(key, entry)
+        return entry
+
+    def _remember(self, key: Tuple, entry: CachedLeaderboard, supersede: bool = False) -> None:
+        with self._lock:
+            if supersede:
+                for old in [k for k in self._entries if k[:2] == key[:2] and k != key]:
+                    del self._entries[old]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
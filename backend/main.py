@@ -1,8 +1,32 @@
-from fastapi import FastAPI, HTTPException
+import hmac
+import os
+import time
+from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, Union
+
+from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from api_utils import get_leaderboard_data
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel
+from api_utils import (
+    get_cached_leaderboard,
+    get_model_info,
+    get_simulation,
+    profiling,
+    refresh_season,
+    warm_engine,
+)
+
 
-app = FastAPI(title="NBA MVP Forecaster API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model bundles and current-season panel once, before traffic
+    warm_engine()
+    yield
+
+
+app = FastAPI(title="NBA MVP Forecaster API", lifespan=lifespan)
 
 # Allow CORS for frontend
 app.add_middleware(
@@ -11,18 +35,116 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "Server-Timing"],
 )
 
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    # Stage spans run during the request (CSV reads, feature engineering,
+    # predict, ...) are reported in a Server-Timing header and added to
+    # the /metrics totals
+    start = time.perf_counter()
+    with profiling.collect_timings() as timings:
+        response = await call_next(request)
+    total = time.perf_counter() - start
+    route = request.scope.get("route")
+    profiling.record_request(getattr(route, "path", "unmatched"), total)
+    response.headers["Server-Timing"] = profiling.server_timing_header(timings, total)
+    response.headers["Timing-Allow-Origin"] = "*"
+    return response
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the NBA MVP Forecaster API"}
 
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """
+    Conditional GET check (RFC 9110 precedence): If-None-Match when the
+    client sends it, otherwise If-Modified-Since.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+@app.get("/metrics")
+def metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(profiling.prometheus_text(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/models")
+def list_models():
+    result = get_model_info()
+    if isinstance(result, dict) and "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    return result
+
+
 @app.get("/api/leaderboard/{year}")
-def get_leaderboard(year: int):
-    data = get_leaderboard_data(year)
-    if isinstance(data, dict) and "error" in data:
-        raise HTTPException(status_code=500, detail=data["error"])
-    return data
+def get_leaderboard(year: int, request: Request, model: Optional[str] = None):
+    # model: a registered model name, "ensemble" (mean of all served
+    # models) or "all" (side by side); default is the registry default
+    entry = get_cached_leaderboard(year, model)
+    if isinstance(entry, dict) and "error" in entry:
+        raise HTTPException(status_code=entry.get("status_code", 500), detail=entry["error"])
+
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        # Let clients keep the payload but revalidate on every use
+        "Cache-Control": "no-cache",
+    }
+    if is_not_modified(request, entry.etag, entry.last_modified):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(entry.records, headers=headers)
+
+class SimulateRequest(BaseModel):
+    year: int = 2026
+    # Each entry maps panel columns (PTS_per_g, PER, "W/L%_team", ...) to
+    # values, plus optional "name" and "base_player"
+    players: List[Dict[str, Optional[Union[float, str]]]]
+    # Registered model name or "ensemble"; default is the registry default
+    model: Optional[str] = None
+
+
+@app.post("/api/simulate")
+def simulate(request: SimulateRequest):
+    result = get_simulation(request.year, request.players, model=request.model)
+    if isinstance(result, dict) and "error" in result:
+        raise HTTPException(status_code=result["status_code"], detail=result["error"])
+    return result
+
+
+@app.post("/api/refresh/{year}")
+def refresh(year: int, scrape: bool = False,
+            x_refresh_token: Optional[str] = Header(default=None)):
+    # Disabled unless REFRESH_TOKEN is configured; re-scraping is expensive
+    expected = os.environ.get("REFRESH_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_refresh_token or not hmac.compare_digest(x_refresh_token, expected):
+        raise HTTPException(status_code=403, detail="Invalid refresh token")
+
+    report = refresh_season(year, scrape=scrape)
+    if "error" in report:
+        raise HTTPException(status_code=report.get("status_code", 500), detail=report["error"])
+    return report
+
 
 if __name__ == "__main__":
     import uvicorn
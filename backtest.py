@@ -0,0 +1,272 @@
+"""
+Rolling-origin (walk-forward) backtest.
+
+For every origin N, each model is trained on all labelled seasons <= N and
+scored on season N+1, mirroring how the forecast is used: only the past is
+known when a season is predicted. With data/ covering 2013..2026 the
+origins run 2013..2024; 2026 has no MVP voting yet, so N=2025 has nothing
+to test on and is skipped.
+
+- Season panels come from the per-season panel cache (cache/panels/).
+- (origin, model) fits run in a process pool.
+- Fitted models are cached in cache/backtest/ under a key built from the
+  model, its parameters, the panel cache keys of the training seasons,
+  the feature columns and the feature code version, so a rerun only fits
+  what is new (a new season, changed CSVs or features, other parameters).
+- Predictions of every fold are scored with model.leaderboard_metrics in
+  one pass and written as a per-season table to results/.
+
+Each model uses one fixed configuration at every origin, BACKTEST_PARAMS,
+and there is no nested search. --registry-params uses the latest
+registered best params instead; those were tuned by LOSO on the training
+seasons of model.py, which include most test seasons here, so that run is
+look-ahead biased and only useful for comparison. Every output row records
+the params and their source.
+
+Usage:
+    python backtest.py                               # all models, all origins
+    python backtest.py --models random_forest --first-origin 2016 --workers 4
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+
+from model import (
+    CACHE_DIR,
+    HAS_XGB,
+    PROJECT_ROOT,
+    RAW_DATA_DIR,
+    build_panel_dataset,
+    engineer_features,
+    feature_code_version,
+    leaderboard_metrics,
+    panel_cache_key,
+    resolve_n_jobs,
+    save_metrics_json,
+    select_feature_matrix,
+    split_core_budget,
+    summarize_leaderboard_metrics,
+)
+from model_registry import ModelRegistry, feature_hash
+
+if HAS_XGB:
+    from xgboost import XGBRegressor
+
+try:
+    import joblib
+except ImportError:  # very old sklearn fallback
+    from sklearn.externals import joblib
+
+BACKTEST_CACHE_DIR = os.path.join(CACHE_DIR, "backtest")
+BACKTEST_CACHE_VERSION = 1
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
+
+# Fixed configuration of every model at every origin (no look-ahead)
+BACKTEST_PARAMS: Dict[str, Dict] = {
+    "ridge": {"alpha": 1.0},
+    "random_forest": {"n_estimators": 500, "max_depth": 10, "min_samples_leaf": 1},
+    "xgboost": {"n_estimators": 300, "max_depth": 3, "learning_rate": 0.05},
+}
+
+
+def labelled_seasons() -> List[int]:
+    """
+    Seasons under data/ that have MVP voting results.
+    """
+    years = []
+    for name in sorted(os.listdir(RAW_DATA_DIR)):
+        if name.isdigit() and os.path.exists(os.path.join(RAW_DATA_DIR, name, "mvp_voting.csv")):
+            years.append(int(name))
+    return years
+
+
+def make_estimator(name: str, params: Dict, n_jobs: int = 1):
+    if name == "ridge":
+        return Ridge(random_state=42, **params)
+    if name == "random_forest":
+        return RandomForestRegressor(random_state=42, n_jobs=n_jobs, **params)
+    if name == "xgboost":
+        if not HAS_XGB:
+            raise ImportError("xgboost is required for the xgboost backtest (pip install xgboost).")
+        return XGBRegressor(objective="reg:squarederror", tree_method="hist",
+                            random_state=42, n_jobs=n_jobs, **params)
+    raise ValueError(f"Unknown backtest model {name!r}; choose from {list(BACKTEST_PARAMS)}")
+
+
+def model_params(name: str, registry: Optional[ModelRegistry] = None) -> Dict:
+    """
+    BACKTEST_PARAMS for a model, or with a registry its latest registered
+    best params (falling back to BACKTEST_PARAMS). Registered params were
+    tuned on seasons the backtest tests on, so they leak the future.
+    """
+    if registry is None:
+        return dict(BACKTEST_PARAMS[name])
+    try:
+        params = registry.entry(name).get("params")
+    except KeyError:
+        params = None
+    return dict(params) if params else dict(BACKTEST_PARAMS[name])
+
+
+def fold_cache_key(name: str, params: Dict, origin: int, train_keys: List[str],
+                   feature_cols: List[str]) -> str:
+    """
+    Key of one fitted fold: model, params, the panel cache keys (code
+    version + CSV hashes) of every training season, the feature columns
+    (model_registry.feature_hash) and the feature engineering code version.
+    """
+    raw = json.dumps([BACKTEST_CACHE_VERSION, name, params, origin, train_keys,
+                      feature_hash(feature_cols), feature_code_version()],
+                     sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+# ---------------------------------------------------------------------------
+# Folds
+# ---------------------------------------------------------------------------
+
+def run_fold(task: Dict) -> Tuple[str, int, np.ndarray, bool, float]:
+    """
+    Fit (or load) one (model, origin) fold and predict its test season.
+    Runs in a worker process; returns (model, origin, predictions,
+    loaded_from_cache, seconds).
+    """
+    start = time.perf_counter()
+    path = os.path.join(BACKTEST_CACHE_DIR, f"{task['name']}-{task['origin']}-{task['key']}.joblib")
+    cached = os.path.exists(path)
+    if cached:
+        estimator = joblib.load(path)
+    else:
+        estimator = make_estimator(task["name"], task["params"], n_jobs=task["n_jobs"])
+        estimator.fit(task["X_train"], task["y_train"])
+        os.makedirs(BACKTEST_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(estimator, tmp)
+        os.replace(tmp, path)
+    y_pred = np.asarray(estimator.predict(task["X_test"]), dtype=np.float64)
+    return task["name"], task["origin"], y_pred, cached, time.perf_counter() - start
+
+
+def run_backtest(models: List[str], origins: List[int], workers: int = 1,
+                 use_cache: bool = True, rebuild: bool = False,
+                 registry_params: bool = False) -> pd.DataFrame:
+    """
+    Walk-forward backtest. Returns the per-(model, season) metrics frame
+    from leaderboard_metrics with origin, season_end_year, params_source
+    ("fixed", or "registry" with registry_params) and params (JSON)
+    columns.
+    """
+    seasons = labelled_seasons()
+    origins = [n for n in origins if n in seasons and n + 1 in seasons]
+    if not origins:
+        raise ValueError(f"No origin N with labelled seasons N and N+1 (labelled: {seasons})")
+    years = [y for y in seasons if y <= max(origins) + 1]
+
+    panel = build_panel_dataset(years, use_cache=use_cache, rebuild=rebuild, workers=workers)
+    # z-scores are within-season, so engineering the whole panel at once
+    # leaks nothing across seasons
+    panel = engineer_features(panel)
+    train_keys = {year: panel_cache_key(year) for year in years}
+
+    registry = ModelRegistry() if registry_params else None
+    params = {name: model_params(name, registry) for name in models}
+
+    n_tasks = len(models) * len(origins)
+    outer, inner = split_core_budget(workers, n_tasks)
+    tasks = []
+    test_frames = {}
+    for origin in origins:
+        train_df = panel[panel["season_end_year"] <= origin]
+        test_df = panel[panel["season_end_year"] == origin + 1]
+        X_train, y_train, feature_cols = select_feature_matrix(train_df)
+        X_test, y_test, _ = select_feature_matrix(test_df, feature_cols=feature_cols)
+        test_frames[origin] = (test_df.loc[X_test.index], y_test)
+        keys = [train_keys[y] for y in years if y <= origin]
+        for name in models:
+            tasks.append({
+                "name": name, "origin": origin, "params": params[name], "n_jobs": inner,
+                "key": fold_cache_key(name, params[name], origin, keys, feature_cols),
+                "X_train": X_train, "y_train": y_train, "X_test": X_test,
+            })
+
+    print(f"Backtest: {len(models)} model(s) x {len(origins)} origins "
+          f"({origins[0]}..{origins[-1]}), {outer} worker(s) x {inner} thread(s)")
+    if outer > 1:
+        with ProcessPoolExecutor(max_workers=outer) as pool:
+            results = list(pool.map(run_fold, tasks))
+    else:
+        results = [run_fold(task) for task in tasks]
+
+    fits = 0
+    fold_preds: Dict[Tuple[str, int], np.ndarray] = {}
+    for name, origin, y_pred, cached, seconds in results:
+        fold_preds[(name, origin)] = y_pred
+        fits += not cached
+        print(f"  {name:15s} origin {origin}: {'cached' if cached else 'fitted'} ({seconds:.1f} s)")
+    print(f"{fits} fit(s), {len(results) - fits} loaded from {BACKTEST_CACHE_DIR}")
+
+    # Every test season stacked once; each model's predictions aligned to it
+    eval_df = pd.concat([test_frames[o][0] for o in origins], ignore_index=True)
+    y_true = np.concatenate([test_frames[o][1] for o in origins])
+    predictions = {name: np.concatenate([fold_preds[(name, o)] for o in origins]) for name in models}
+
+    metrics = leaderboard_metrics(eval_df, y_true, predictions)
+    season_end_year = dict(zip(eval_df["season"], eval_df["season_end_year"].astype(int)))
+    metrics.insert(2, "season_end_year", metrics["season"].map(season_end_year))
+    metrics.insert(3, "origin", metrics["season_end_year"] - 1)
+    metrics["params_source"] = "registry" if registry_params else "fixed"
+    metrics["params"] = metrics["model"].map({name: json.dumps(p, sort_keys=True) for name, p in params.items()})
+    return metrics
+
+
+def main():
+    available = [m for m in BACKTEST_PARAMS if m != "xgboost" or HAS_XGB]
+    seasons = labelled_seasons()
+
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest over the seasons in data/")
+    parser.add_argument("--models", nargs="*", choices=list(BACKTEST_PARAMS), default=available)
+    parser.add_argument("--first-origin", type=int, default=seasons[0] if seasons else 2013,
+                        help="First training cut-off season (train <= N, test N+1)")
+    parser.add_argument("--last-origin", type=int, default=2025)
+    parser.add_argument("--workers", type=int, default=-1,
+                        help="Core budget, split between fold processes and estimator threads (-1 = all cores)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Recompute every season panel and refresh the panel cache")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the per-season panel cache")
+    parser.add_argument("--registry-params", action="store_true",
+                        help="Use the latest registered best params (tuned on later seasons: look-ahead biased)")
+    parser.add_argument("--out", default=os.path.join(RESULTS_DIR, "backtest_metrics"),
+                        help="Output path without extension (.csv and .json are written)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    metrics = run_backtest(args.models, list(range(args.first_origin, args.last_origin + 1)),
+                           workers=resolve_n_jobs(args.workers),
+                           use_cache=not args.no_cache, rebuild=args.rebuild,
+                           registry_params=args.registry_params)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    metrics.to_csv(f"{args.out}.csv", index=False)
+    save_metrics_json(metrics, f"{args.out}.json")
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print("\nPer-season metrics:")
+        print(metrics.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+        print("\nSummary:")
+        print(summarize_leaderboard_metrics(metrics).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print(f"\nSaved {args.out}.csv / .json ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
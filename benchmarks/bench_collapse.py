@@ -0,0 +1,80 @@
+"""
+Benchmark of collapse_multiteam_players and compute_primary_team against
+the pre-vectorization implementations, on every season in data/.
+
+The reference implementations and the per-season identity check live in
+tests/test_collapse.py (run by pytest); this script only times them.
+
+Usage:
+    python benchmarks/bench_collapse.py [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.join(PROJECT_ROOT, "tests"))
+
+from model import (  # noqa: E402
+    RAW_DATA_DIR,
+    load_player_tables_for_year,
+    build_player_index,
+    collapse_multiteam_players,
+    compute_primary_team,
+)
+from test_collapse import (  # noqa: E402
+    reference_collapse_multiteam_players,
+    reference_compute_primary_team,
+)
+
+
+# ---------------------------------------------------------------------------
+# Runs
+# ---------------------------------------------------------------------------
+
+def run_reference(tables):
+    for tabs in tables.values():
+        for df in tabs[:4]:
+            reference_collapse_multiteam_players(df)
+        reference_compute_primary_team(tabs[0])
+
+
+def run_vectorized(tables):
+    for tabs in tables.values():
+        player_index = build_player_index(*tabs)
+        for df in tabs[:4]:
+            collapse_multiteam_players(df, player_index)
+        compute_primary_team(tabs[0], player_index)
+
+
+def best_of(fn, tables, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(tables)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-team collapse")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    years = sorted(int(d) for d in os.listdir(RAW_DATA_DIR) if d.isdigit())
+    with contextlib.redirect_stdout(io.StringIO()):
+        tables = {y: load_player_tables_for_year(y) for y in years}
+
+    print(f"{len(years)} seasons ({years[0]}-{years[-1]})")
+    t_ref = best_of(run_reference, tables, args.repeat)
+    t_vec = best_of(run_vectorized, tables, args.repeat)
+    print(f"reference : {t_ref * 1000:8.1f} ms")
+    print(f"vectorized: {t_vec * 1000:8.1f} ms  ({t_ref / t_vec:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Benchmark + regression check for HTML table extraction in the scraper.
+
+The reference below is the previous read_table_from_html: a full-page
+pd.read_html, then a BeautifulSoup parse, then a read_html per HTML
+comment, repeated for every table id read from a page. The current code
+parses each page once with lxml (HtmlTables) and reads every id from that
+index.
+
+Fixture pages are either saved Basketball Reference pages (--fixtures DIR,
+files named like NBA_2024_standings.html / awards_2024.html, e.g.
+tests/fixtures/bbref or pages copied out of cache/scrape/objects) or, by
+default, synthetic pages in the same
+shape built from data/<year>/*.csv: a two-row header with an over_header
+band, repeated header rows in the body, secondary tables inside HTML
+comments, and page chrome around them.
+
+Usage:
+    python benchmarks/bench_html_tables.py [--repeat 3] [--years 2022 2023 2024]
+    python benchmarks/bench_html_tables.py --fixtures tests/fixtures/bbref
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from io import StringIO
+
+import pandas as pd
+from bs4 import BeautifulSoup, Comment
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import RAW_DATA_DIR  # noqa: E402
+from scrape_basketball_reference import HtmlTables  # noqa: E402
+
+
+# Table ids read from each kind of page
+PAGE_TABLES = {
+    "totals": ["totals_stats"],
+    "per_game": ["per_game_stats"],
+    "per_poss": ["per_poss_stats"],
+    "advanced": ["advanced_stats"],
+    "standings": ["confs_standings_E", "confs_standings_W"],
+    "awards": ["mvp"],
+}
+
+
+# ---------------------------------------------------------------------------
+# Reference (multi-parse) implementation
+# ---------------------------------------------------------------------------
+
+def reference_read_table_from_html(html, table_id):
+    # Same steps as before, minus the URL re-download. Literal HTML is
+    # wrapped in StringIO, which pandas now requires.
+    try:
+        tables = pd.read_html(StringIO(html), attrs={"id": table_id})
+        if tables:
+            return tables[0]
+    except ValueError:
+        pass
+
+    soup = BeautifulSoup(html, "lxml")
+    table_tag = soup.find("table", id=table_id)
+    if table_tag is not None:
+        tables = pd.read_html(StringIO(str(table_tag)))
+        if tables:
+            return tables[0]
+
+    comments = soup.find_all(string=lambda text: isinstance(text, Comment))
+    for c in comments:
+        if table_id in c:
+            try:
+                tables = pd.read_html(StringIO(str(c)), attrs={"id": table_id})
+                if tables:
+                    return tables[0]
+            except Exception:
+                continue
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Fixture pages
+# ---------------------------------------------------------------------------
+
+CHROME = (
+    "<div id='header'><nav>" + "".join(f"<a href='/p{i}'>Link {i}</a>" for i in range(300)) + "</nav></div>"
+    "<script>" + "var x = 1;" * 2000 + "</script>"
+)
+
+
+def table_html(df, table_id, over_header=None):
+    cols = list(df.columns)
+    head = ""
+    if over_header:
+        head += "<tr class='over_header'>" + "".join(
+            f"<th colspan='{span}'>{label}</th>" for label, span in over_header) + "</tr>"
+    header_row = "<tr>" + "".join(f"<th>{c}</th>" for c in cols) + "</tr>"
+    head += header_row
+    body = []
+    for i, row in enumerate(df.itertuples(index=False)):
+        if i and i % 20 == 0:
+            body.append(header_row.replace("<tr>", "<tr class='thead'>"))
+        body.append("<tr>" + "".join(f"<td>{'' if pd.isna(v) else v}</td>" for v in row) + "</tr>")
+    return (f"<div class='table_container' id='div_{table_id}'><table id='{table_id}'>"
+            f"<thead>{head}</thead><tbody>{''.join(body)}</tbody></table></div>")
+
+
+def page_html(*blocks):
+    return f"<html><head><title>fixture</title></head><body>{CHROME}{''.join(blocks)}</body></html>"
+
+
+def commented(block):
+    return f"<div class='placeholder'></div><!--\n{block}\n-->"
+
+
+def synthetic_pages(years):
+    pages = {}
+    for year in years:
+        base = os.path.join(RAW_DATA_DIR, str(year))
+
+        def read(name):
+            return pd.read_csv(os.path.join(base, name), encoding="latin-1")
+
+        for label in ["totals", "per_game", "per_poss", "advanced"]:
+            df = read(f"players_{label}.csv").drop(columns=["season_end_year", "season"], errors="ignore")
+            n = len(df.columns)
+            over = [("", 5), ("Stats", n - 5)] if label == "per_poss" else None
+            # Each player page also carries a smaller commented-out table
+            extra = commented(table_html(df.head(30), f"{label}_leaders"))
+            pages[f"NBA_{year}_{label}.html"] = page_html(table_html(df, f"{label}_stats", over), extra)
+
+        east = read("standings_east.csv").drop(columns=["season_end_year", "season", "Conference"], errors="ignore")
+        west = read("standings_west.csv").drop(columns=["season_end_year", "season", "Conference"], errors="ignore")
+        pages[f"NBA_{year}_standings.html"] = page_html(
+            table_html(east, "confs_standings_E"),
+            commented(table_html(west, "confs_standings_W")),
+            commented(table_html(pd.concat([east, west]), "expanded_standings")),
+        )
+
+        mvp_path = os.path.join(base, "mvp_voting.csv")
+        if os.path.exists(mvp_path):
+            mvp = read("mvp_voting.csv").drop(columns=["season_end_year", "season"], errors="ignore")
+            pages[f"awards_{year}.html"] = page_html(
+                commented(table_html(mvp.head(3), "roy")),
+                commented(table_html(mvp, "mvp")),
+            )
+    return pages
+
+
+def load_fixture_dir(path):
+    # Walks subdirectories too, so a tree laid out like the site
+    # (tests/fixtures/bbref/leagues, .../awards) can be passed as is
+    pages = {}
+    for dirpath, _, names in sorted(os.walk(path)):
+        for name in sorted(names):
+            if name.endswith(".html"):
+                with open(os.path.join(dirpath, name), "r", encoding="utf-8") as f:
+                    pages[name] = f.read()
+    return pages
+
+
+def table_ids_for(page_name):
+    if page_name.startswith("awards_"):
+        return PAGE_TABLES["awards"]
+    match = re.match(r"NBA_\d{4}_(\w+)\.html$", page_name)
+    return PAGE_TABLES.get(match.group(1), []) if match else []
+
+
+# ---------------------------------------------------------------------------
+# Runs
+# ---------------------------------------------------------------------------
+
+def run_reference(pages):
+    return {(name, tid): reference_read_table_from_html(html, tid)
+            for name, html in pages.items() for tid in table_ids_for(name)}
+
+
+def run_indexed(pages):
+    out = {}
+    for name, html in pages.items():
+        tables = HtmlTables(html)
+        for tid in table_ids_for(name):
+            out[(name, tid)] = tables.read(tid)
+    return out
+
+
+def best_of(fn, pages, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(pages)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML table extraction")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--years", type=int, nargs="*", default=[2022, 2023, 2024])
+    parser.add_argument("--fixtures", help="Directory of saved Basketball Reference pages")
+    args = parser.parse_args()
+
+    pages = load_fixture_dir(args.fixtures) if args.fixtures else synthetic_pages(args.years)
+    size_mb = sum(len(html) for html in pages.values()) / 1e6
+    print(f"{len(pages)} pages, {size_mb:.1f} MB of HTML")
+
+    ref, new = run_reference(pages), run_indexed(pages)
+    for key, expected in ref.items():
+        if expected is None:
+            assert new[key] is None, key
+        else:
+            pd.testing.assert_frame_equal(expected, new[key])
+    print(f"Outputs identical for {len(ref)} tables")
+
+    t_ref = best_of(run_reference, pages, args.repeat)
+    t_new = best_of(run_indexed, pages, args.repeat)
+    print(f"reference: {t_ref * 1000:8.1f} ms")
+    print(f"indexed  : {t_new * 1000:8.1f} ms  ({t_ref / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
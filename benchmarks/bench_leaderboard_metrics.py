@@ -0,0 +1,115 @@
+"""
+Benchmark + regression check for the vectorized leaderboard evaluator.
+
+The reference below is the previous evaluate_leaderboards loop (filter
+each season, sort it, idxmax, spearmanr) extended with NDCG@k, run once per
+model. model.leaderboard_metrics scores every (model, season) in one
+grouped pass. Both run on the labelled seasons in data/ with several
+synthetic "models" (the true share plus noise of different sizes); hits
+must match exactly and Spearman / NDCG to floating-point tolerance.
+
+Usage:
+    python benchmarks/bench_leaderboard_metrics.py [--models 5] [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import NDCG_K, build_panel_dataset, leaderboard_metrics  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Reference (per-season loop) implementation
+# ---------------------------------------------------------------------------
+
+def reference_metrics(test_df, y_true, y_pred, k=NDCG_K):
+    df = test_df.copy()
+    df["y_true"] = y_true
+    df["y_pred"] = y_pred
+    discount = 1.0 / np.log2(np.arange(2, k + 2))
+    rows = []
+    for s in df["season"].unique():
+        sub = df[df["season"] == s].copy()
+        # Stable sort so tied predictions keep row order
+        sub = sub.sort_values("y_pred", ascending=False, kind="stable")
+        top1_preds = sub.head(1)["Player"].tolist()
+        top3_preds = sub.head(3)["Player"].tolist()
+        true_mvp = df.loc[df["season"] == s, "y_true"].idxmax()
+        true_mvp = df.loc[true_mvp, "Player"]
+
+        rho, _ = spearmanr(sub["y_true"], sub["y_pred"])
+        dcg = (sub["y_true"].to_numpy()[:k] * discount[:min(k, len(sub))]).sum()
+        ideal = np.sort(sub["y_true"].to_numpy())[::-1][:k]
+        idcg = (ideal * discount[:len(ideal)]).sum()
+        rows.append({
+            "season": s,
+            "mvp": true_mvp,
+            "mae": np.abs(sub["y_true"] - sub["y_pred"]).mean(),
+            "top1_hit": int(true_mvp in top1_preds),
+            "top3_hit": int(true_mvp in top3_preds),
+            "spearman": rho,
+            "ndcg_at_k": dcg / idcg if idcg > 0 else np.nan,
+        })
+    return pd.DataFrame(rows)
+
+
+def best_of(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark leaderboard evaluation")
+    parser.add_argument("--years", type=int, nargs="*", default=list(range(2013, 2026)))
+    parser.add_argument("--models", type=int, default=5, help="Synthetic models to score")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        panel = build_panel_dataset(args.years)
+    panel = panel.dropna(subset=["Voting_Share"]).reset_index(drop=True)
+    y_true = panel["Voting_Share"].to_numpy()
+
+    rng = np.random.default_rng(0)
+    predictions = {
+        f"noise_{i}": np.clip(y_true + rng.normal(0, 0.02 * (i + 1), len(y_true)), 0, None)
+        for i in range(args.models)
+    }
+    print(f"{panel['season'].nunique()} seasons x {len(predictions)} models, {len(panel)} rows")
+
+    def run_reference():
+        return pd.concat(
+            [reference_metrics(panel, y_true, pred).assign(model=name)
+             for name, pred in predictions.items()],
+            ignore_index=True,
+        )
+
+    t_ref, ref = best_of(run_reference, args.repeat)
+    t_new, new = best_of(lambda: leaderboard_metrics(panel, y_true, predictions), args.repeat)
+
+    for col in ["model", "season", "mvp", "top1_hit", "top3_hit"]:
+        np.testing.assert_array_equal(ref[col].to_numpy(), new[col].to_numpy())
+    for col in ["mae", "spearman", "ndcg_at_k"]:
+        np.testing.assert_allclose(ref[col].to_numpy(), new[col].to_numpy(), rtol=1e-12, atol=1e-14)
+    print(f"Metrics match for {len(new)} (model, season) rows")
+
+    print(f"per-season loop: {t_ref * 1000:8.1f} ms")
+    print(f"vectorized     : {t_new * 1000:8.1f} ms  ({t_ref / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Artifact size, load time and predict latency for the served model.
+
+Compares the current pickle (models/<name>.pkl) with the compact export
+from compact_model.py and two joblib variants written here only for
+comparison:
+
+    pickle            joblib.load of the .pkl (the sklearn serving path)
+    joblib (zlib)     compressed bundle with float32-snapped thresholds
+    joblib (mmap)     uncompressed bundle loaded with mmap_mode="r"
+    flat .npz         FlatForest arrays
+    flat (mmap)       FlatForest arrays memory-mapped (the numpy / numba
+                      serving path)
+
+Predictions on the forecast season must be identical across all of them.
+The exports are written to a temporary directory; models/ is not touched.
+
+Usage:
+    python benchmarks/bench_model_artifact.py [--model models/<name>.pkl] [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compact_model import FlatForest, compact_path, export_compact, float32_floor  # noqa: E402
+from forecast import DEFAULT_MODEL_PATH, FORECAST_YEARS, build_forecast_features  # noqa: E402
+
+
+def snap_thresholds_to_float32(model) -> None:
+    """
+    In place: replace every split threshold of a fitted sklearn forest with
+    float32_floor(threshold). Predictions are unchanged and the low mantissa
+    bits become zeros, which compresses far better.
+    """
+    for est in model.estimators_:
+        thresholds = est.tree_.threshold
+        thresholds[:] = float32_floor(thresholds).astype(np.float64)
+
+
+def best_of(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark served model artifact formats")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="model-artifacts-")
+    try:
+        pkl = os.path.join(tmp_dir, os.path.basename(args.model))
+        shutil.copyfile(args.model, pkl)
+        export_compact(pkl)
+
+        bundle = joblib.load(pkl)
+        snap_thresholds_to_float32(bundle["model"])
+        zlib_path = os.path.join(tmp_dir, "bundle_zlib.joblib")
+        joblib.dump(bundle, zlib_path, compress=("zlib", 3))
+        mmap_path = os.path.join(tmp_dir, "bundle_mmap.joblib")
+        joblib.dump(bundle, mmap_path)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, X = build_forecast_features(FORECAST_YEARS, bundle["feature_cols"])
+
+        loaders = [
+            ("pickle", pkl, lambda: joblib.load(pkl)["model"]),
+            ("joblib (zlib)", zlib_path, lambda: joblib.load(zlib_path)["model"]),
+            ("joblib (mmap)", mmap_path, lambda: joblib.load(mmap_path, mmap_mode="r")["model"]),
+            ("flat .npz", compact_path(pkl), lambda: FlatForest.load(compact_path(pkl))[0]),
+            ("flat (mmap)", compact_path(pkl), lambda: FlatForest.load(compact_path(pkl), mmap_mode="r")[0]),
+        ]
+
+        print(f"Forecast batch: {X.shape[0]} rows x {X.shape[1]} features\n")
+        print(f"{'format':15s} {'size MB':>8s} {'load ms':>9s} {'predict ms':>11s}")
+        reference = None
+        for name, path, load in loaders:
+            t_load, model = best_of(load, args.repeat)
+            if hasattr(model, "set_params"):
+                model.set_params(n_jobs=1)
+            t_pred, y = best_of(lambda: model.predict(X), args.repeat)
+            if reference is None:
+                reference = y
+            np.testing.assert_array_equal(reference, y)
+            print(f"{name:15s} {os.path.getsize(path) / 1e6:8.2f} {t_load * 1000:9.1f} {t_pred * 1000:11.1f}")
+        print("\nPredictions identical across formats")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
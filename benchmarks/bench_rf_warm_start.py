@@ -0,0 +1,80 @@
+"""
+Benchmark (and full-grid check) of warm-started random-forest tuning;
+tests/test_rf_warm_start.py checks the same on a small grid.
+
+Runs the RF grid from model.py (RF_PARAM_GRID) over the cached LOSO folds
+twice: once fitting every n_estimators size from scratch, once growing a
+single forest per (depth, leaf, fold) with warm_start. The per-candidate
+CV MAEs must be identical and both must pick the same configuration; then
+the two wall-clock times are compared.
+
+The full grid takes a while on a small machine; --sizes scales the
+n_estimators values down for a quick check.
+
+Usage:
+    python benchmarks/bench_rf_warm_start.py [--n-jobs -1] [--sizes 200 500]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+from sklearn.model_selection import ParameterGrid  # noqa: E402
+
+from model import (  # noqa: E402
+    RF_PARAM_GRID,
+    TRAIN_YEARS,
+    FoldCache,
+    build_panel_dataset,
+    engineer_features,
+    evaluate_candidates,
+    select_feature_matrix,
+    temporal_split,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark warm-started RF tuning")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--sizes", type=int, nargs="*", default=RF_PARAM_GRID["n_estimators"],
+                        help="n_estimators values to search (default: the grid in model.py)")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        panel = engineer_features(build_panel_dataset(TRAIN_YEARS))
+    train_df, _, _ = temporal_split(panel)
+    X_train, y_train, _ = select_feature_matrix(train_df)
+    fold_cache = FoldCache(X_train, y_train, train_df["season_end_year"].values)
+
+    grid = dict(RF_PARAM_GRID, n_estimators=sorted(args.sizes))
+    candidates = list(ParameterGrid(grid))
+    rf = RandomForestRegressor(random_state=42)
+
+    timings = {}
+    maes = {}
+    for warm_start in (False, True):
+        start = time.perf_counter()
+        maes[warm_start] = evaluate_candidates(rf, candidates, fold_cache,
+                                               n_jobs=args.n_jobs, warm_start=warm_start)
+        timings[warm_start] = time.perf_counter() - start
+
+    np.testing.assert_array_equal(maes[False], maes[True])
+    best_fresh = candidates[int(np.argmin(maes[False]))]
+    best_warm = candidates[int(np.argmin(maes[True]))]
+    assert best_fresh == best_warm, (best_fresh, best_warm)
+    print(f"Identical CV MAE for {len(candidates)} candidates; best {best_warm} "
+          f"(MAE {maes[True].min():.5f})")
+
+    print(f"fresh fits : {timings[False]:8.1f} s")
+    print(f"warm start : {timings[True]:8.1f} s  ({timings[False] / timings[True]:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
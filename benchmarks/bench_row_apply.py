@@ -0,0 +1,167 @@
+"""
+Micro-benchmark for the row-wise .apply calls removed from
+clean_standings (header-row detection via team_row_mask, team-name
+cleaning and abbreviation mapping) and build_season_dataset (primary-team fallback).
+
+Each reference below is the previous row-wise version. Outputs are
+checked for equality before timing.
+
+Usage:
+    python benchmarks/bench_row_apply.py [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import (  # noqa: E402
+    RAW_DATA_DIR,
+    TEAM_NAME_TO_ABBREV,
+    clean_team_name,
+    clean_standings,
+    team_row_mask,
+)
+
+
+# ---------------------------------------------------------------------------
+# Reference (row-wise) implementations
+# ---------------------------------------------------------------------------
+
+def reference_team_row_mask(w: pd.Series) -> np.ndarray:
+    def is_numeric_or_dash(x):
+        x = str(x)
+        if x == "—":
+            return True
+        try:
+            float(x)
+            return True
+        except ValueError:
+            return False
+
+    return w.apply(is_numeric_or_dash).to_numpy()
+
+
+def reference_clean_standings(df: pd.DataFrame) -> pd.DataFrame:
+    df = df[reference_team_row_mask(df["W"])].copy()
+    df["Team"] = df["Team"].apply(clean_team_name)
+
+    def map_team_abbrev(name: str) -> str:
+        base = name.replace("*", "").strip()
+        return TEAM_NAME_TO_ABBREV.get(base, base)
+
+    df["team_abbrev"] = df["Team"].apply(map_team_abbrev)
+
+    for col in ["W", "L", "PS/G", "PA/G", "SRS"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df["W/L%"] = pd.to_numeric(df["W/L%"], errors="coerce")
+    df["GB"] = df["GB"].replace("—", 0)
+    df["GB"] = pd.to_numeric(df["GB"], errors="coerce")
+
+    keep_cols = [
+        "team_abbrev", "W", "L", "W/L%", "GB",
+        "PS/G", "PA/G", "SRS", "Conference",
+        "season_end_year", "season"
+    ]
+    return df[keep_cols]
+
+
+def reference_resolve_primary_team(season_df: pd.DataFrame) -> pd.Series:
+    def resolve_primary_team(row):
+        if pd.notna(row.get("primary_team")):
+            return row["primary_team"]
+        t = row.get("Team", None)
+        if t and t != "TOT":
+            return t
+        return np.nan
+
+    return season_df.apply(resolve_primary_team, axis=1)
+
+
+def vectorized_resolve_primary_team(season_df: pd.DataFrame) -> pd.Series:
+    # Mirrors the code in build_season_dataset
+    team = season_df["Team"]
+    fallback_team = team.where((team != "TOT") & (team != ""))
+    return season_df["primary_team"].combine_first(fallback_team)
+
+
+# ---------------------------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------------------------
+
+def load_inputs():
+    years = sorted(int(d) for d in os.listdir(RAW_DATA_DIR) if d.isdigit())
+    standings = {}
+    teams = {}
+    rng = np.random.default_rng(0)
+    for year in years:
+        base = os.path.join(RAW_DATA_DIR, str(year))
+        raw = pd.read_csv(os.path.join(base, "standings.csv"), encoding="latin-1")
+        # Add a division header row so the header filter has work to do
+        header = raw.iloc[[0]].copy()
+        header["W"] = "Atlantic Division"
+        standings[year] = pd.concat([header, raw], ignore_index=True)
+
+        totals = pd.read_csv(os.path.join(base, "players_totals.csv"), encoding="latin-1")
+        frame = totals[["Team"]].copy()
+        # Roughly the share of players whose primary team is unknown
+        frame["primary_team"] = totals["Team"].where(rng.random(len(totals)) > 0.1)
+        frame.loc[frame["Team"] == "TOT", "primary_team"] = np.nan
+        teams[year] = frame
+    return years, standings, teams
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark removal of row-wise apply")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    years, standings, teams = load_inputs()
+
+    for year in years:
+        np.testing.assert_array_equal(
+            reference_team_row_mask(standings[year]["W"]), team_row_mask(standings[year]["W"])
+        )
+        pd.testing.assert_frame_equal(
+            reference_clean_standings(standings[year]), clean_standings(standings[year])
+        )
+        pd.testing.assert_series_equal(
+            reference_resolve_primary_team(teams[year]),
+            vectorized_resolve_primary_team(teams[year]),
+            check_dtype=False, check_names=False,
+        )
+    print(f"Outputs identical for {len(years)} seasons")
+
+    cases = [
+        ("team_row_mask",
+         lambda: [reference_team_row_mask(df["W"]) for df in standings.values()],
+         lambda: [team_row_mask(df["W"]) for df in standings.values()]),
+        ("clean_standings",
+         lambda: [reference_clean_standings(df) for df in standings.values()],
+         lambda: [clean_standings(df) for df in standings.values()]),
+        ("resolve_primary_team",
+         lambda: [reference_resolve_primary_team(df) for df in teams.values()],
+         lambda: [vectorized_resolve_primary_team(df) for df in teams.values()]),
+    ]
+    for name, before, after in cases:
+        t_before = best_of(before, args.repeat)
+        t_after = best_of(after, args.repeat)
+        print(f"{name:22s} before {t_before * 1000:7.2f} ms  "
+              f"after {t_after * 1000:7.2f} ms  ({t_before / t_after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
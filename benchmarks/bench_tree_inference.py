@@ -0,0 +1,97 @@
+"""
+Benchmark + regression check for the forest inference backends.
+
+Scores the forecast season and larger "what-if" batches (forecast rows
+tiled and perturbed, as in simulate-many-scenarios workloads) with:
+
+    sklearn   RandomForestRegressor.predict (n_jobs=1)
+    numpy     FlatForest, all trees advanced level by level
+    numba     FlatForest, compiled row-block kernel (if numba is installed)
+
+Every backend's predictions must be bit-identical to sklearn's. numba's
+one-off compile time is reported separately from the timed runs.
+
+Usage:
+    python benchmarks/bench_tree_inference.py [--rows 10000 50000] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compact_model import HAS_NUMBA, FlatForest  # noqa: E402
+from forecast import DEFAULT_MODEL_PATH, FORECAST_YEARS, build_forecast_features  # noqa: E402
+from model import load_model_bundle  # noqa: E402
+
+
+def scenario_batch(X: np.ndarray, n_rows: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    reps = -(-n_rows // len(X))
+    batch = np.tile(X, (reps, 1))[:n_rows]
+    return batch * rng.lognormal(0.0, 0.1, size=batch.shape)
+
+
+def best_of(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark forest inference backends")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--rows", type=int, nargs="*", default=[10000, 50000],
+                        help="Scenario batch sizes (the forecast season is always included)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    model, feature_cols, _ = load_model_bundle(args.model)
+    model.set_params(n_jobs=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, X_forecast = build_forecast_features(FORECAST_YEARS, feature_cols)
+    X_forecast = X_forecast.to_numpy(dtype=np.float64)
+
+    backends = {"sklearn": model}
+    flat = FlatForest.from_sklearn(model)
+    backends["numpy"] = flat
+    if HAS_NUMBA:
+        flat_numba = FlatForest.from_sklearn(model)
+        flat_numba.kernel = "numba"
+        start = time.perf_counter()
+        flat_numba.predict(X_forecast[:1])
+        print(f"numba compile/load: {time.perf_counter() - start:.2f} s")
+        backends["numba"] = flat_numba
+    else:
+        print("numba not installed; skipping the numba kernel")
+
+    print(f"{flat.n_estimators} trees, {flat.node_count} nodes\n")
+    batches = [("forecast", X_forecast)] + [
+        (f"{n} scenarios", scenario_batch(X_forecast, n)) for n in args.rows
+    ]
+    header = "".join(f"{name:>12s}" for name in backends)
+    print(f"{'batch':18s}{header}   (ms)")
+    for label, X in batches:
+        reference = None
+        cells = []
+        for name, backend in backends.items():
+            t, y = best_of(lambda: backend.predict(X), args.repeat)
+            if reference is None:
+                reference = y
+            np.testing.assert_array_equal(reference, y)
+            cells.append(f"{t * 1000:12.1f}")
+        print(f"{label:18s}{''.join(cells)}")
+    print("\nPredictions bit-identical across backends")
+
+
+if __name__ == "__main__":
+    main()
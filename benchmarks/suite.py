@@ -0,0 +1,413 @@
+"""
+End-to-end benchmark suite.
+
+Times every stage of the pipeline and writes the results as JSON, so two
+runs (e.g. before and after a change) can be compared with --compare.
+
+Groups:
+    parse     HtmlTables parse of scraper fixture pages (the checked-in
+              tests/fixtures/bbref by default, --fixtures DIR of saved
+              pages, or --fixtures synthetic for pages built from data/)
+    panel     build_panel_dataset without the panel cache and from it;
+              stream_feature_matrix
+    features  engineer_features, select_feature_matrix
+    fit       fit_ridge / fit_random_forest / fit_xgb _with_loso_cv on the
+              last --fit-seasons labelled seasons
+    predict   model.predict of every served model on the forecast season
+              (pickled sklearn model and, where exported, the flat forest)
+    api       GET /api/leaderboard/{year} through the FastAPI app, served
+              from the leaderboard cache ("hit") and re-serialized ("miss")
+
+Scales are SEASONSxPLAYERS multipliers of the checked-in data: 1x1 is
+data/ itself; anything else is a synthetic tree written once by
+synthetic_data.py under cache/benchmarks/. The parse, predict and api
+groups only run at 1x1 (they need the real forecast season and model).
+
+Each benchmark is timed --repeat times (fits --fit-repeat times) and the
+min / median / mean are stored. Results go to
+results/benchmarks/<UTC time>-<git sha>.json unless --out is given.
+
+Usage:
+    python benchmarks/suite.py                                   # 1x1, every group
+    python benchmarks/suite.py --groups panel features --scales 1x1 10x1 1x10
+    python benchmarks/suite.py --compare results/benchmarks/old.json results/benchmarks/new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.append(PROJECT_ROOT)
+
+# Saved Basketball Reference pages the parse group reads by default
+FIXTURE_DIR = os.path.join(PROJECT_ROOT, "tests", "fixtures", "bbref")
+
+import model  # noqa: E402
+from model import (  # noqa: E402
+    HAS_XGB,
+    FoldCache,
+    build_panel_dataset,
+    engineer_features,
+    fit_random_forest_with_loso_cv,
+    fit_ridge_with_loso_cv,
+    fit_xgb_with_loso_cv,
+    select_feature_matrix,
+    stream_feature_matrix,
+)
+import synthetic_data  # noqa: E402
+
+GROUPS = ["parse", "panel", "features", "fit", "predict", "api"]
+REAL_DATA_ONLY = {"parse", "predict", "api"}
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "results", "benchmarks")
+SYNTHETIC_DIR = os.path.join(model.CACHE_DIR, "benchmarks")
+FORECAST_YEAR = 2026
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+def measure(fn: Callable[[], object], repeat: int, number: int = 1, warmup: bool = False) -> Dict:
+    """
+    Time `number` calls of fn, `repeat` times. Seconds are per call.
+    """
+    if warmup:
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Data context for one scale
+# ---------------------------------------------------------------------------
+
+class Context:
+    """
+    A data tree (data/ or a synthetic copy) and the intermediate products
+    the benchmarks share, built lazily and outside the timed region.
+    """
+
+    def __init__(self, scale: str, args):
+        self.scale = scale
+        self.args = args
+        seasons, players = (int(v) for v in scale.lower().split("x"))
+        self.real = seasons == 1 and players == 1
+        if self.real:
+            self.data_dir = os.path.join(model.PROJECT_ROOT, "data")
+            self.store_dir = os.path.join(model.CACHE_DIR, "season_store")
+            self.panel_dir = os.path.join(model.CACHE_DIR, "panels")
+            self.years = synthetic_data.source_years(self.data_dir)
+        else:
+            root = os.path.join(SYNTHETIC_DIR, f"s{seasons}p{players}")
+            self.data_dir = os.path.join(root, "data")
+            self.store_dir = os.path.join(root, "season_store")
+            self.panel_dir = os.path.join(root, "panels")
+            print(f"Preparing synthetic data {scale} in {root} ...")
+            self.years = synthetic_data.generate(self.data_dir, seasons, players)
+        self._cache: Dict[str, object] = {}
+
+    def activate(self) -> None:
+        # The loaders read these module globals at call time
+        model.RAW_DATA_DIR = self.data_dir
+        model.SEASON_STORE_DIR = self.store_dir
+        model.PANEL_CACHE_DIR = self.panel_dir
+
+    def _get(self, key: str, build: Callable[[], object]):
+        if key not in self._cache:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def panel(self):
+        return self._get("panel", lambda: build_panel_dataset(self.years))
+
+    @property
+    def engineered(self):
+        return self._get("engineered", lambda: engineer_features(self.panel))
+
+    @property
+    def fit_data(self) -> Tuple:
+        def build():
+            fit_years = self.years[-self.args.fit_seasons:]
+            df = self.engineered[self.engineered["season_end_year"].isin(fit_years)]
+            X, y, _ = select_feature_matrix(df)
+            groups = df["season_end_year"].to_numpy()
+            return X, y, groups, FoldCache(X, y, groups)
+        return self._get("fit_data", build)
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+#
+# Each benchmark takes the Context and yields (name, fn, options): fn is
+# the timed call, options may set number / warmup / repeat / info.
+
+BENCHMARKS: List[Tuple[str, Callable]] = []
+
+
+def benchmark(group: str):
+    def decorator(func):
+        BENCHMARKS.append((group, func))
+        return func
+    return decorator
+
+
+@benchmark("parse")
+def bench_parse(ctx: Context):
+    from bench_html_tables import load_fixture_dir, synthetic_pages, table_ids_for
+    from scrape_basketball_reference import HtmlTables
+
+    if ctx.args.fixtures == "synthetic":
+        pages = synthetic_pages(ctx.years[-3:])
+    else:
+        pages = load_fixture_dir(ctx.args.fixtures)
+
+    def parse():
+        for name, html in pages.items():
+            tables = HtmlTables(html)
+            for table_id in table_ids_for(name):
+                tables.read(table_id)
+
+    size_mb = sum(len(html) for html in pages.values()) / 1e6
+    yield "parse.html_tables", parse, {"info": {"pages": len(pages), "html_mb": round(size_mb, 2)}}
+
+
+@benchmark("panel")
+def bench_panel(ctx: Context):
+    info = {"seasons": len(ctx.years)}
+    yield ("panel.build_uncached", lambda: build_panel_dataset(ctx.years, use_cache=False),
+           {"info": info})
+    # Fill the panel cache before timing reads from it
+    ctx.panel
+    yield "panel.build_cached", lambda: build_panel_dataset(ctx.years), {"info": info}
+    yield "panel.stream_feature_matrix", lambda: stream_feature_matrix(ctx.years), {"info": info}
+
+
+@benchmark("features")
+def bench_features(ctx: Context):
+    info = {"rows": len(ctx.panel)}
+    yield "features.engineer_features", lambda: engineer_features(ctx.panel), {"info": info}
+    yield "features.select_feature_matrix", lambda: select_feature_matrix(ctx.engineered), {"info": info}
+
+
+@benchmark("fit")
+def bench_fit(ctx: Context):
+    X, y, groups, fold_cache = ctx.fit_data
+    args = ctx.args
+    info = {"rows": len(y), "seasons": len(np.unique(groups)), "search": args.search}
+    options = {"repeat": args.fit_repeat, "info": info}
+    yield ("fit.ridge", lambda: fit_ridge_with_loso_cv(X, y, groups, n_jobs=args.n_jobs), options)
+    yield ("fit.random_forest",
+           lambda: fit_random_forest_with_loso_cv(X, y, groups, n_jobs=args.n_jobs, search=args.search,
+                                                  fold_cache=fold_cache),
+           options)
+    if HAS_XGB:
+        yield ("fit.xgboost",
+               lambda: fit_xgb_with_loso_cv(X, y, groups, n_jobs=args.n_jobs, search=args.search,
+                                            fold_cache=fold_cache),
+               options)
+    else:
+        print("  xgboost not installed; skipping fit.xgboost")
+
+
+@benchmark("predict")
+def bench_predict(ctx: Context):
+    from compact_model import FlatForest
+    from forecast import build_forecast_panel, forecast_feature_matrix, load_forecast_model
+    from model_registry import ModelRegistry
+
+    served = ModelRegistry().served_models()
+    with contextlib.redirect_stdout(io.StringIO()):
+        panel = build_forecast_panel([FORECAST_YEAR])
+    for name, path in served.items():
+        for inference in ["sklearn", "numpy"]:
+            with contextlib.redirect_stdout(io.StringIO()):
+                estimator, feature_cols, _ = load_forecast_model(path, inference=inference)
+                X = forecast_feature_matrix(panel, feature_cols)
+            if inference == "numpy" and not isinstance(estimator, FlatForest):
+                continue  # no flat export for this model
+            yield (f"predict.{name}.{inference}", lambda est=estimator, X=X: est.predict(X),
+                   {"warmup": True, "info": {"rows": len(X)}})
+
+
+@benchmark("api")
+def bench_api(ctx: Context):
+    # Memory-only leaderboard cache, so the benchmark leaves no files behind
+    os.environ["LEADERBOARD_CACHE_DIR"] = ""
+    sys.path.append(os.path.join(PROJECT_ROOT, "backend"))
+    try:
+        from fastapi.testclient import TestClient
+        with contextlib.redirect_stdout(io.StringIO()):
+            import api_utils
+            import main as api_main
+    except ImportError as e:
+        print(f"  {e}; skipping the api group")
+        return
+
+    n = ctx.args.requests
+    url = f"/api/leaderboard/{FORECAST_YEAR}"
+    client = TestClient(api_main.app)
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.__enter__()  # runs the startup hook (engine warm-up)
+
+    def get():
+        response = client.get(url)
+        assert response.status_code == 200, response.text
+
+    def get_uncached():
+        api_utils.leaderboard_cache.clear()
+        get()
+
+    try:
+        yield "api.leaderboard_hit", get, {"number": n, "warmup": True, "info": {"requests": n}}
+        yield "api.leaderboard_miss", get_uncached, {"number": n, "warmup": True, "info": {"requests": n}}
+    finally:
+        client.__exit__(None, None, None)
+
+
+# ---------------------------------------------------------------------------
+# Runs and result files
+# ---------------------------------------------------------------------------
+
+def environment() -> Dict:
+    def version(module_name: str) -> Optional[str]:
+        try:
+            return __import__(module_name).__version__
+        except ImportError:
+            return None
+
+    def git(*cmd) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *cmd], cwd=PROJECT_ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "git_commit": git("rev-parse", "--short", "HEAD"),
+        "git_dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": {name: version(name) for name in ["numpy", "pandas", "sklearn", "xgboost", "fastapi"]},
+    }
+
+
+def run_suite(args) -> Dict:
+    results = {}
+    for scale in args.scales:
+        ctx = Context(scale, args)
+        ctx.activate()
+        for group, bench in BENCHMARKS:
+            if group not in args.groups or (group in REAL_DATA_ONLY and not ctx.real):
+                continue
+            for name, fn, options in bench(ctx):
+                key = f"{scale}/{name}"
+                repeat = options.get("repeat", args.repeat)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stats = measure(fn, repeat, number=options.get("number", 1),
+                                    warmup=options.get("warmup", False))
+                stats.update(group=group, scale=scale, info=options.get("info", {}))
+                if options.get("number", 1) > 1:
+                    stats["per_second"] = 1.0 / stats["min"]
+                results[key] = stats
+                rate = f"  {stats['per_second']:8.0f}/s" if "per_second" in stats else ""
+                print(f"{key:45s} {stats['min'] * 1000:10.2f} ms  (median {stats['median'] * 1000:.2f}){rate}")
+    return results
+
+
+def compare(old: Dict, new: Dict, threshold: float) -> List[str]:
+    """
+    Print new/old min-time ratios of the benchmarks both runs have and
+    return the keys slower than `threshold`.
+    """
+    regressions = []
+    print(f"{'benchmark':45s} {'old ms':>10s} {'new ms':>10s} {'ratio':>7s}")
+    for key in sorted(set(old["results"]) & set(new["results"])):
+        before, after = old["results"][key]["min"], new["results"][key]["min"]
+        ratio = after / before if before else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:45s} {before * 1000:10.2f} {after * 1000:10.2f} {ratio:7.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmarks")
+    parser.add_argument("--groups", nargs="*", choices=GROUPS, default=GROUPS)
+    parser.add_argument("--scales", nargs="*", default=["1x1"],
+                        help="SEASONSxPLAYERS multipliers of data/, e.g. 1x1 10x1 1x10 100x1")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fit-repeat", type=int, default=1)
+    parser.add_argument("--fit-seasons", type=int, default=3,
+                        help="Train the fit benchmarks on the last N labelled seasons (LOSO over N folds)")
+    parser.add_argument("--search", choices=model.SEARCH_STRATEGIES, default="grid")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per api timing")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR,
+                        help="Directory of saved Basketball Reference pages for parse "
+                             "(default: tests/fixtures/bbref), or 'synthetic' for pages built from data/")
+    parser.add_argument("--out", help="Result file (default: results/benchmarks/<time>-<sha>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="JSON",
+                        help="OLD [NEW]: compare two result files (NEW defaults to a fresh run)")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="new/old time ratio above which --compare reports a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes OLD [NEW]")
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+    else:
+        env = environment()
+        new = {"created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+               "environment": env, "args": vars(args), "results": run_suite(args)}
+        out = args.out or os.path.join(
+            RESULTS_DIR, f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{env['git_commit'] or 'nogit'}.json")
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        with open(out, "w") as f:
+            json.dump(new, f, indent=2)
+        print(f"\nSaved {out}")
+        if not args.compare:
+            return
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+
+    print()
+    regressions = compare(old, new, args.threshold)
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Synthetic data/ trees for scaling benchmarks.
+
+Scales the checked-in seasons by a factor in two directions:
+
+- seasons: every real season is copied `season_scale` times under new
+  season_end_years (100, 101, ...; kept below 2025 so the completed-season
+  rules still apply), with season_end_year / season rewritten;
+- players: every player row of every player table (and of MVP voting) is
+  repeated `player_scale` times under distinct names ("LeBron James",
+  "LeBron James 2", ...). Standings are unchanged, so the team merge still
+  matches.
+
+Output has the same layout as data/ (<dir>/<year>/*.csv), so the pipeline
+runs on it unchanged once model.RAW_DATA_DIR points there. Generation is
+deterministic and skipped when the target directory is already complete.
+
+Usage:
+    python benchmarks/synthetic_data.py --season-scale 10 --player-scale 1 --out cache/benchmarks/s10p1
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import RAW_DATA_DIR  # noqa: E402
+
+PLAYER_FILES = ["players_totals.csv", "players_per_game.csv", "players_per_poss.csv",
+                "players_advanced.csv", "mvp_voting.csv"]
+
+SYNTHETIC_FIRST_YEAR = 100
+
+
+def source_years(data_dir: str = RAW_DATA_DIR, labelled_only: bool = True) -> List[int]:
+    years = []
+    for name in sorted(os.listdir(data_dir)):
+        if not name.isdigit():
+            continue
+        if labelled_only and not os.path.exists(os.path.join(data_dir, name, "mvp_voting.csv")):
+            continue
+        years.append(int(name))
+    return years
+
+
+def season_label(year: int) -> str:
+    return f"{year - 1}-{str(year)[-2:]}"
+
+
+def repeat_players(df: pd.DataFrame, player_scale: int) -> pd.DataFrame:
+    """
+    Each row repeated player_scale times; copy k > 0 gets " {k+1}" appended
+    to its name.
+    """
+    if player_scale <= 1 or "Player" not in df.columns:
+        return df
+    out = df.loc[df.index.repeat(player_scale)].reset_index(drop=True)
+    copy = np.tile(np.arange(player_scale), len(df))
+    suffix = np.where(copy > 0, " " + (copy + 1).astype(str), "")
+    names = out["Player"].astype("string")
+    out["Player"] = (names + suffix).where(names.notna(), out["Player"])
+    return out
+
+
+def generate(out_dir: str, season_scale: int = 1, player_scale: int = 1,
+             data_dir: str = RAW_DATA_DIR, years: Optional[List[int]] = None) -> List[int]:
+    """
+    Write the scaled tree to out_dir and return its season_end_years.
+    """
+    years = years or source_years(data_dir)
+    n_out = len(years) * season_scale
+    if SYNTHETIC_FIRST_YEAR + n_out > 2025:
+        raise ValueError(f"{n_out} synthetic seasons would run past 2025; lower season_scale")
+    out_years = list(range(SYNTHETIC_FIRST_YEAR, SYNTHETIC_FIRST_YEAR + n_out))
+
+    done_marker = os.path.join(out_dir, ".complete")
+    if os.path.exists(done_marker):
+        return out_years
+
+    for i, year in enumerate(out_years):
+        src = os.path.join(data_dir, str(years[i % len(years)]))
+        dst = os.path.join(out_dir, str(year))
+        os.makedirs(dst, exist_ok=True)
+        for name in sorted(os.listdir(src)):
+            if not name.endswith(".csv"):
+                continue
+            df = pd.read_csv(os.path.join(src, name), encoding="latin-1")
+            if name in PLAYER_FILES:
+                df = repeat_players(df, player_scale)
+            if "season_end_year" in df.columns:
+                df["season_end_year"] = year
+            if "season" in df.columns:
+                df["season"] = season_label(year)
+            df.to_csv(os.path.join(dst, name), index=False, encoding="latin-1")
+
+    with open(done_marker, "w") as f:
+        f.write(f"{season_scale} {player_scale}\n")
+    return out_years
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a scaled synthetic copy of data/")
+    parser.add_argument("--season-scale", type=int, default=10)
+    parser.add_argument("--player-scale", type=int, default=1)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    years = generate(args.out, args.season_scale, args.player_scale)
+    print(f"Wrote {len(years)} seasons ({years[0]}..{years[-1]}) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
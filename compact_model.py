@@ -0,0 +1,422 @@
+"""
+Compact model artifacts for serving.
+
+A trained bundle (models/<name>.pkl) holds a pickled sklearn forest: every
+tree's full node table (impurities, sample counts, ...), most of which is
+only needed for training. This module exports a smaller artifact next to
+it:
+
+    <name>.forest.npz   the forest flattened into contiguous node arrays
+                        (children, feature, float32 threshold, leaf value)
+                        plus feature_cols / metadata; loads without sklearn
+                        and predicts with FlatForest
+
+Thresholds: sklearn casts X to float32 before walking a tree and compares
+it with the float64 threshold. For a float32 x, `x <= t` holds exactly when
+`x <= float32_floor(t)`, so storing the largest float32 not above each
+threshold changes no prediction.
+
+The served model is loaded through load_served_bundle. With the numpy or
+numba kernel it memory-maps the .forest.npz when that is at least as new
+as the .pkl, and otherwise flattens the pickled forest in memory.
+FlatForest predicts with one of two kernels:
+
+    numpy   every tree advances one level per step over the whole batch
+    numba   compiled traversal, parallel over blocks of rows (needs numba)
+
+Both sum tree outputs in sklearn's order, so predictions are bit-identical
+to RandomForestRegressor.predict. inference="sklearn" skips all of this and
+returns the pickled estimator; "auto" picks numba when it is installed and
+sklearn otherwise, since the numpy kernel is slower than sklearn's own
+predict. So the fast (memory-mapped) load only happens with numba
+installed or with inference="numpy" (MODEL_INFERENCE=numpy for the API);
+the default without numba unpickles the full .pkl.
+
+Usage:
+    python compact_model.py                         # export the default RF bundle
+    python compact_model.py models/some_bundle.pkl
+"""
+import argparse
+import io
+import json
+import os
+import struct
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import joblib
+except ImportError:  # very old sklearn fallback
+    from sklearn.externals import joblib
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+import season_store
+
+FORMAT_VERSION = 1
+
+INFERENCE_BACKENDS = ["auto", "sklearn", "numpy", "numba"]
+
+# Rows per numpy-kernel block; bounds the (n_trees, rows) temporaries
+NUMPY_BLOCK_ROWS = 4096
+# Rows per numba work item; each thread walks every tree over its block
+NUMBA_BLOCK_ROWS = 64
+
+# Byte alignment of every array member of a saved .forest.npz, so the
+# server can memory-map them in place
+NPZ_ALIGN = 64
+# Zip extra-field id used for the alignment padding (ignored by readers)
+_PAD_EXTRA_ID = 0xA11C
+
+
+def float32_floor(values: np.ndarray) -> np.ndarray:
+    """
+    Largest float32 <= each float64 value.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = values.astype(np.float32)
+    over = out.astype(np.float64) > values
+    out[over] = np.nextafter(out[over], np.float32(-np.inf))
+    return out
+
+
+def compact_path(bundle_path: str) -> str:
+    return os.path.splitext(bundle_path)[0] + ".forest.npz"
+
+
+# ---------------------------------------------------------------------------
+# Flattened forest
+# ---------------------------------------------------------------------------
+
+class FlatForest:
+    """
+    A regression forest as contiguous node arrays. Node i of tree k lives at
+    roots[k] + i; children are stored as absolute indices, -1 marks a leaf.
+    Predictions are bit-identical to the sklearn forest it came from.
+    """
+
+    def __init__(self, children_left, children_right, feature, threshold,
+                 missing_go_to_left, value, roots, n_features_in_,
+                 feature_importances_=None, kernel: str = "numpy"):
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_go_to_left = missing_go_to_left
+        self.value = value
+        self.roots = roots
+        self.n_features_in_ = int(n_features_in_)
+        self.feature_importances_ = feature_importances_
+        self.kernel = kernel
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.feature)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "FlatForest":
+        """
+        Flatten a fitted single-output RandomForestRegressor (or any
+        sklearn forest whose prediction is the mean of its trees).
+        """
+        trees = [est.tree_ for est in model.estimators_]
+        if any(t.n_outputs != 1 for t in trees):
+            raise ValueError("Only single-output forests can be flattened.")
+        sizes = np.array([t.node_count for t in trees], dtype=np.int64)
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+        def absolute(children, offset):
+            children = children.astype(np.int64)
+            return np.where(children >= 0, children + offset, -1)
+
+        children_left = np.concatenate([absolute(t.children_left, o) for t, o in zip(trees, roots)])
+        children_right = np.concatenate([absolute(t.children_right, o) for t, o in zip(trees, roots)])
+        index_dtype = np.int32 if len(children_left) < np.iinfo(np.int32).max else np.int64
+        missing = [t.missing_go_to_left if hasattr(t, "missing_go_to_left")
+                   else np.zeros(t.node_count, dtype=np.uint8) for t in trees]
+
+        return cls(
+            children_left=children_left.astype(index_dtype),
+            children_right=children_right.astype(index_dtype),
+            feature=np.concatenate([t.feature for t in trees]).astype(np.int32),
+            threshold=float32_floor(np.concatenate([t.threshold for t in trees])),
+            missing_go_to_left=np.concatenate(missing).astype(np.uint8),
+            value=np.concatenate([t.value[:, 0, 0] for t in trees]).astype(np.float64),
+            roots=roots,
+            n_features_in_=model.n_features_in_,
+            feature_importances_=np.asarray(model.feature_importances_, dtype=np.float64),
+        )
+
+    def _as_float32(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got array of shape {X.shape}.")
+        return X
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Leaf node reached by every row in every tree, shape (n_trees, n_rows).
+        All trees advance one level per step, so the loop runs max-depth
+        times rather than once per tree.
+        """
+        node = np.repeat(self.roots[:, None], len(X), axis=1)
+        rows = np.broadcast_to(np.arange(len(X)), node.shape)
+        while True:
+            left = self.children_left[node]
+            is_split = left >= 0
+            if not is_split.any():
+                return node
+            # Leaves have feature == -2; the lookup is harmless and masked below
+            x = X[rows, self.feature[node]]
+            go_left = (x <= self.threshold[node]) | (np.isnan(x) & (self.missing_go_to_left[node] == 1))
+            node = np.where(is_split, np.where(go_left, left, self.children_right[node]), node)
+
+    def predict(self, X) -> np.ndarray:
+        X = self._as_float32(X)
+        if self.kernel == "numba":
+            return _predict_numba(
+                np.ascontiguousarray(X), self.children_left, self.children_right, self.feature,
+                self.threshold, self.missing_go_to_left, self.value, self.roots,
+            )
+
+        y_hat = np.zeros(len(X), dtype=np.float64)
+        for start in range(0, len(X), NUMPY_BLOCK_ROWS):
+            block = slice(start, start + NUMPY_BLOCK_ROWS)
+            leaf_values = self.value[self.apply(X[block])]
+            # Same accumulation order as sklearn: sum tree by tree, then divide
+            for tree_values in leaf_values:
+                y_hat[block] += tree_values
+        y_hat /= self.n_estimators
+        return y_hat
+
+    def save(self, path: str, feature_cols: List[str], metadata: Optional[Dict] = None) -> None:
+        """
+        Write an uncompressed .npz (atomic) whose array data is
+        NPZ_ALIGN-aligned in the file, so load can memory-map it. It is a
+        plain .npz: np.load reads it as well.
+        """
+        header = {
+            "format_version": FORMAT_VERSION,
+            "feature_cols": list(feature_cols),
+            "metadata": metadata or {},
+        }
+        arrays = {
+            "children_left": self.children_left,
+            "children_right": self.children_right,
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "missing_go_to_left": self.missing_go_to_left,
+            "value": self.value,
+            "roots": self.roots,
+            "n_features_in": np.array(self.n_features_in_),
+            "feature_importances": self.feature_importances_,
+            "header": np.array(json.dumps(header, default=str)),
+        }
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        with open(tmp, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_STORED) as zf:
+            for name, array in arrays.items():
+                buf = io.BytesIO()
+                np.lib.format.write_array(buf, np.asarray(array), allow_pickle=False)
+                info = zipfile.ZipInfo(f"{name}.npy", date_time=(1980, 1, 1, 0, 0, 0))
+                # .npy pads its own header to a multiple of 64 bytes, so
+                # aligning where the member starts aligns its data. The local
+                # header is 30 bytes plus the name plus the extra field.
+                start = f.tell() + 30 + len(info.filename.encode()) + 4
+                pad = -start % NPZ_ALIGN
+                info.extra = struct.pack("<HH", _PAD_EXTRA_ID, pad) + bytes(pad)
+                zf.writestr(info, buf.getvalue())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, kernel: str = "numpy",
+             mmap_mode: Optional[str] = None) -> Tuple["FlatForest", List[str], Dict]:
+        """
+        Read a saved forest. With mmap_mode (e.g. "r") the node arrays are
+        memory-mapped from the file instead of read into memory, so worker
+        processes serving the same file share its pages.
+        """
+        if mmap_mode is not None:
+            data = _memmap_npz(path, mmap_mode)
+        else:
+            with np.load(path, allow_pickle=False) as npz:
+                data = {name: npz[name] for name in npz.files}
+        header = json.loads(str(data["header"]))
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format in {path}")
+        forest = cls(
+            children_left=data["children_left"],
+            children_right=data["children_right"],
+            feature=data["feature"],
+            threshold=data["threshold"],
+            missing_go_to_left=data["missing_go_to_left"],
+            value=data["value"],
+            roots=data["roots"],
+            n_features_in_=int(data["n_features_in"]),
+            feature_importances_=data["feature_importances"],
+            kernel=kernel,
+        )
+        return forest, header["feature_cols"], header["metadata"]
+
+
+def _memmap_npz(path: str, mode: str = "r") -> Dict[str, np.ndarray]:
+    """
+    Arrays of an uncompressed .npz, memory-mapped in place where their data
+    is aligned; scalars and unaligned members (e.g. from np.savez) are read.
+    """
+    arrays = {}
+    with open(path, "rb") as f, zipfile.ZipFile(f) as zf:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Cannot memory-map compressed member {info.filename} of {path}")
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack("<HH", f.read(4))
+            member_start = info.header_offset + 30 + name_len + extra_len
+            f.seek(member_start)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+            if len(shape) == 0 or dtype.hasobject or offset % dtype.alignment:
+                f.seek(member_start)
+                arrays[name] = np.lib.format.read_array(f, allow_pickle=False)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape,
+                                         order="F" if fortran_order else "C")
+    return arrays
+
+
+if HAS_NUMBA:
+    @numba.njit(parallel=True, nogil=True, cache=True)
+    def _predict_numba(X, children_left, children_right, feature, threshold,
+                       missing_go_to_left, value, roots):
+        n_rows = X.shape[0]
+        n_trees = roots.shape[0]
+        out = np.zeros(n_rows)
+        n_blocks = (n_rows + NUMBA_BLOCK_ROWS - 1) // NUMBA_BLOCK_ROWS
+        for b in numba.prange(n_blocks):
+            start = b * NUMBA_BLOCK_ROWS
+            stop = min(n_rows, start + NUMBA_BLOCK_ROWS)
+            total = np.zeros(stop - start)
+            # One tree at a time over the whole block keeps its nodes in
+            # cache; each row still sums trees in sklearn's order
+            for t in range(n_trees):
+                for i in range(start, stop):
+                    node = roots[t]
+                    while children_left[node] >= 0:
+                        x = X[i, feature[node]]
+                        if x <= threshold[node] or (np.isnan(x) and missing_go_to_left[node] == 1):
+                            node = children_left[node]
+                        else:
+                            node = children_right[node]
+                    total[i - start] += value[node]
+            for i in range(start, stop):
+                out[i] = total[i - start] / n_trees
+        return out
+else:
+    def _predict_numba(*args):
+        raise ImportError("numba is required for the numba inference kernel (pip install numba).")
+
+
+# ---------------------------------------------------------------------------
+# Export / load
+# ---------------------------------------------------------------------------
+
+def is_flattenable(model) -> bool:
+    """
+    True for fitted sklearn forest regressors whose prediction is the plain
+    mean of their trees (RandomForestRegressor, ExtraTreesRegressor).
+    """
+    from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+    return isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)) and hasattr(model, "estimators_")
+
+
+def export_compact(bundle_path: str) -> Dict[str, str]:
+    """
+    Write <name>.forest.npz next to a saved .pkl bundle. Returns the
+    written paths; non-forest models get nothing.
+    """
+    bundle = joblib.load(bundle_path)
+    model = bundle["model"]
+    written = {}
+    if is_flattenable(model):
+        metadata = {k: v for k, v in bundle.items() if k not in ("model", "feature_cols")}
+        path = compact_path(bundle_path)
+        FlatForest.from_sklearn(model).save(path, bundle["feature_cols"], metadata)
+        written["flat"] = path
+    return written
+
+
+def resolve_kernel(inference: str) -> str:
+    """
+    Backend for `inference`: "auto" is numba when installed, else sklearn.
+    """
+    if inference not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend {inference!r}; choose from {INFERENCE_BACKENDS}")
+    if inference == "auto":
+        return "numba" if HAS_NUMBA else "sklearn"
+    if inference == "numba" and not HAS_NUMBA:
+        raise ImportError("numba is required for inference='numba' (pip install numba).")
+    return inference
+
+
+def load_served_bundle(bundle_path: str, inference: str = "auto"):
+    """
+    (model, feature_cols, metadata) for serving.
+
+    inference="sklearn" (and "auto" without numba) returns the pickled
+    estimator, unpickling the whole .pkl. Otherwise forests come back as a
+    FlatForest using the requested kernel: memory-mapped from a fresh
+    .forest.npz if there is one, else flattened from the pickle.
+    Non-forest models are returned as pickled.
+    """
+    from model import load_model_bundle
+
+    kernel = resolve_kernel(inference)
+    if kernel == "sklearn":
+        # Not memory-mapped: sklearn copies every tree's node arrays into
+        # its own buffers when unpickling, so joblib's mmap_mode="r" only
+        # adds page faults (slower to load, same resident memory)
+        return load_model_bundle(bundle_path)
+
+    flat = compact_path(bundle_path)
+    if season_store.is_fresh(flat, [bundle_path]):
+        try:
+            return FlatForest.load(flat, kernel=kernel, mmap_mode="r")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: could not load compact model {flat}: {e}")
+
+    model, feature_cols, metadata = load_model_bundle(bundle_path)
+    if is_flattenable(model):
+        model = FlatForest.from_sklearn(model)
+        model.kernel = kernel
+    return model, feature_cols, metadata
+
+
+def main():
+    from model import MODEL_DIR
+
+    parser = argparse.ArgumentParser(description="Export the compact flat forest for a saved model bundle")
+    parser.add_argument("bundle", nargs="?",
+                        default=os.path.join(MODEL_DIR, "mvp_random_forest_2016_2023_train_award_share.pkl"))
+    args = parser.parse_args()
+
+    written = export_compact(args.bundle)
+    for kind, path in written.items():
+        print(f"{kind:6s} {path} ({os.path.getsize(path) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
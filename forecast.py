@@ -1,18 +1,65 @@
 import os
+import argparse
+import hashlib
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
 from model import (
     build_panel_dataset,
     engineer_features,
+    add_row_features,
+    incremental_zscores,
+    clean_player_name,
     select_feature_matrix,
-    load_model_bundle,
-    MODEL_DIR,
+    FeatureSchema,
+    season_input_paths,
+    files_signature,
+    files_digest,
+    NON_FEATURE_COLS,
+    RAW_DATA_DIR,
+)
+import profiling
+from compact_model import INFERENCE_BACKENDS, load_served_bundle
+from model_registry import LEGACY_MODEL_PATH, ModelRegistry
+from scrape_basketball_reference import (
+    ScraperEngine,
+    scrape_player_stats_for_season,
+    scrape_standings_for_season,
+    scrape_mvp_voting_for_season,
 )
 
 FORECAST_YEARS = [2026]  # 2025-26 season
 
+# Minimum games for a player to appear on a forecast leaderboard
+MIN_GAMES = 9
+
+# Bundle served when the model registry is empty
+DEFAULT_MODEL_PATH = LEGACY_MODEL_PATH
+
+# Model selections besides a registered model name: the mean of every
+# served model, and all of them side by side
+ENSEMBLE = "ensemble"
+SIDE_BY_SIDE = "all"
+
+# Keys of a simulate stat line that are not panel columns
+SIMULATE_META_KEYS = ("name", "base_player")
 
-def build_forecast_features(forecast_years, feature_cols, hypothetical_player=None):
+
+class SeasonNotFoundError(FileNotFoundError):
+    """
+    No CSVs on disk for the requested season (as opposed to a missing
+    model file, which is a server problem).
+    """
+
+
+def build_forecast_features(forecast_years, feature_cols, hypothetical_player=None,
+                            use_cache=True, rebuild=False, workers=1):
     """
     Build the feature matrix for forecast seasons, using the SAME
     preprocessing and feature engineering as training.
@@ -21,15 +68,29 @@ def build_forecast_features(forecast_years, feature_cols, hypothetical_player=No
     - build the panel for the forecast years,
     - apply engineer_features,
     - select the same feature_cols the model was trained on.
+
+    feature_cols may be a list or a prebuilt FeatureSchema.
+    """
+    panel = build_forecast_panel(forecast_years, hypothetical_player,
+                                 use_cache=use_cache, rebuild=rebuild, workers=workers)
+    return panel, forecast_feature_matrix(panel, feature_cols)
+
+
+def build_forecast_panel(forecast_years, hypothetical_player=None,
+                         use_cache=True, rebuild=False, workers=1, return_zscore_stats=False):
+    """
+    Engineered panel for the forecast seasons (no labels required). With
+    return_zscore_stats=True, returns (panel, zscore_stats table).
     """
     # 1. Build panel for forecast seasons only
-    panel = build_panel_dataset(forecast_years)
+    panel = build_panel_dataset(forecast_years, use_cache=use_cache,
+                                rebuild=rebuild, workers=workers)
 
     # Inject hypothetical player if present
     if hypothetical_player is not None and not hypothetical_player.empty:
         panel = pd.concat([panel, hypothetical_player], ignore_index=True)
 
-    panel = engineer_features(panel)
+    panel, stats = engineer_features(panel, return_stats=True)
 
     # Ensure season info is present and non-NaN for forecast seasons.
     # In our case we are only forecasting for [2026], i.e., the 2025-26 season.
@@ -38,23 +99,46 @@ def build_forecast_features(forecast_years, feature_cols, hypothetical_player=No
         panel["season_end_year"] = year
         panel["season"] = f"{year-1}-{str(year)[-2:]}"
 
-    # 2. Restrict to the same feature columns used during training
-    missing = [c for c in feature_cols if c not in panel.columns]
-    if missing:
-        print("Warning: the following feature columns are missing in forecast panel:")
-        for c in missing:
-            print("   ", c)
+    return (panel, stats) if return_zscore_stats else panel
+
 
-    available_feature_cols = [c for c in feature_cols if c in panel.columns]
+@profiling.timed("forecast_feature_matrix")
+def forecast_feature_matrix(panel, schema):
+    """
+    The float32 feature matrix of a forecast panel in the column layout a
+    model was trained on (a FeatureSchema, or a feature_cols list compiled
+    on the fly). Missing feature columns and NaNs are 0.0.
+    """
+    if not isinstance(schema, FeatureSchema):
+        schema = FeatureSchema(schema)
+    return schema.frame(panel)
 
-    X_forecast = panel[available_feature_cols].copy()
 
-    # Optional: basic NaN handling for forecast features
-    X_forecast = X_forecast.fillna(0.0)
+def predict_models(models: Dict[str, Tuple[object, FeatureSchema]],
+                   build_matrix: Callable[[FeatureSchema], pd.DataFrame]) -> Dict[str, np.ndarray]:
+    """
+    Score the same rows with several models ({name: (model, schema)}).
+    build_matrix(schema) is called once per distinct feature list and the
+    matrix is shared by every model trained on that list.
+    """
+    matrices = {}
+    y_preds = {}
+    for name, (model, schema) in models.items():
+        if schema.key not in matrices:
+            matrices[schema.key] = build_matrix(schema)
+        with profiling.span("predict"):
+            y_preds[name] = np.asarray(model.predict(matrices[schema.key]), dtype=np.float64)
+    return y_preds
+
 
-    return panel, X_forecast
+def ensemble_prediction(y_preds: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Unweighted mean of the member models' predicted award shares.
+    """
+    return np.mean(np.vstack(list(y_preds.values())), axis=0)
 
 
+@profiling.timed("make_mvp_leaderboard")
 def make_mvp_leaderboard(panel, y_pred, top_k=10):
     """
     Attach predictions to the panel and produce a sorted MVP leaderboard
@@ -68,7 +152,6 @@ def make_mvp_leaderboard(panel, y_pred, top_k=10):
     for year in sorted(df["season_end_year"].unique()):
         df_year = df[df["season_end_year"] == year].copy()
 
-        MIN_GAMES = 9
         if "G" in df_year.columns:
             df_year = df_year[df_year["G"] >= MIN_GAMES].copy()
 
@@ -100,51 +183,578 @@ def make_mvp_leaderboard(panel, y_pred, top_k=10):
     return leaderboards
 
 
-def run_forecast(forecast_years=None, hypothetical_player=None):
+def make_side_by_side_leaderboard(panel, y_preds: Dict[str, np.ndarray], top_k=10):
+    """
+    Every model's predicted share and rank next to each other
+    (pred_<name>, rank_<name>, plus the ensemble) for each forecast season.
+    Rows are the union of each model's top_k, ordered by the ensemble.
+    """
+    scores = dict(y_preds)
+    scores[ENSEMBLE] = ensemble_prediction(y_preds)
+    df = panel.copy()
+    for name, pred in scores.items():
+        df[f"pred_{name}"] = pred
+
+    leaderboards = {}
+    for year in sorted(df["season_end_year"].unique()):
+        df_year = df[df["season_end_year"] == year]
+        if "G" in df_year.columns:
+            df_year = df_year[df_year["G"] >= MIN_GAMES]
+        df_year = df_year.copy()
+
+        in_top = np.zeros(len(df_year), dtype=bool)
+        for name in scores:
+            rank = df_year[f"pred_{name}"].rank(ascending=False, method="min")
+            df_year[f"rank_{name}"] = rank.astype(int)
+            in_top |= (rank <= top_k).to_numpy()
+        df_year = df_year[in_top].sort_values(f"pred_{ENSEMBLE}", ascending=False)
+
+        cols = [c for c in ["Player", "primary_team", "G"] if c in df_year.columns]
+        cols += [f"{kind}_{name}" for name in scores for kind in ("pred", "rank")]
+        leaderboards[year] = df_year[cols]
+    return leaderboards
+
+
+def make_model_leaderboards(panel, y_preds: Dict[str, np.ndarray], selection: str, top_k=10):
+    """
+    Leaderboards for one model selection: a model name, ENSEMBLE or
+    SIDE_BY_SIDE.
+    """
+    if selection == SIDE_BY_SIDE:
+        return make_side_by_side_leaderboard(panel, y_preds, top_k=top_k)
+    y_pred = ensemble_prediction(y_preds) if selection == ENSEMBLE else y_preds[selection]
+    return make_mvp_leaderboard(panel, y_pred, top_k=top_k)
+
+
+def load_forecast_model(model_path=None, inference="auto"):
+    """
+    Load a trained model bundle used for forecasting (by default the
+    registry's default model, see model_registry.py).
+
+    `inference` picks the predict backend (see compact_model.py): "sklearn"
+    for the pickled estimator, or "numpy" / "numba" for the flattened
+    forest ("auto" = numba when installed, else sklearn). The numpy /
+    numba kernels memory-map a fresh compact export (<name>.forest.npz)
+    when present; sklearn always unpickles the full bundle.
+    """
+    if model_path is None:
+        model_path = ModelRegistry().bundle_path()
+    # Check if model exists
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model file not found at {model_path}. Please run model.py to train it first.")
+
+    return load_served_bundle(model_path, inference=inference)
+
+
+def run_forecast(forecast_years=None, hypothetical_player=None, use_cache=True, rebuild=False,
+                 workers=1, inference="auto", model=None):
     """
     Run the forecast pipeline and return the leaderboards.
+
+    `model` is a registered model name (default: the registry's default
+    model), ENSEMBLE or SIDE_BY_SIDE.
     """
     if forecast_years is None:
         forecast_years = FORECAST_YEARS
 
     # ------------------------------------------------------------------
-    # 1. Load the trained model bundle
+    # 1. Load the trained model bundle(s)
     # ------------------------------------------------------------------
-    model_path = os.path.join(
-        MODEL_DIR,
-        "mvp_random_forest_2016_2023_train_award_share.pkl",
-    )
-    # Check if model exists
-    if not os.path.exists(model_path):
-        raise FileNotFoundError(f"Model file not found at {model_path}. Please run model.py to train it first.")
-
-    model, feature_cols, metadata = load_model_bundle(model_path)
+    registry = ModelRegistry()
+    served = registry.served_models()
+    selection = model or next(iter(served))
+    if selection in (ENSEMBLE, SIDE_BY_SIDE):
+        names = list(served)
+    elif selection in served:
+        names = [selection]
+    else:
+        raise ValueError(f"Unknown model {selection!r}; choose from {list(served) + [ENSEMBLE, SIDE_BY_SIDE]}")
+    bundles = {}
+    for name in names:
+        bundle_model, feature_cols, _ = load_forecast_model(served[name], inference=inference)
+        bundles[name] = (bundle_model, FeatureSchema(feature_cols))
 
     # ------------------------------------------------------------------
-    # 2. Build forecast feature matrix
+    # 2. Build forecast panel
     # ------------------------------------------------------------------
     print("\nBuilding forecast features for seasons:", forecast_years)
-    panel_forecast, X_forecast = build_forecast_features(forecast_years, feature_cols, hypothetical_player)
-    print("Forecast feature matrix shape:", X_forecast.shape)
+    panel_forecast = build_forecast_panel(
+        forecast_years, hypothetical_player,
+        use_cache=use_cache, rebuild=rebuild, workers=workers,
+    )
 
     # ------------------------------------------------------------------
-    # 3. Predict award shares
+    # 3. Predict award shares (one feature matrix per feature list)
     # ------------------------------------------------------------------
-    print("\nPredicting MVP award shares...")
-    y_pred = model.predict(X_forecast)
+    print(f"\nPredicting MVP award shares with {names}...")
+    y_preds = predict_models(bundles, lambda schema: forecast_feature_matrix(panel_forecast, schema))
 
     # ------------------------------------------------------------------
     # 4. Build MVP leaderboards
     # ------------------------------------------------------------------
-    leaderboards = make_mvp_leaderboard(panel_forecast, y_pred, top_k=10)
+    leaderboards = make_model_leaderboards(panel_forecast, y_preds, selection, top_k=10)
     return leaderboards
 
 
+def scrape_season_files(year, include_mvp=None):
+    """
+    Re-scrape one season into a staging directory, then move each CSV into
+    data/<year>/ with os.replace so readers never see a half-written file.
+    Files whose contents did not change are left alone (keeping their
+    mtime, so nothing downstream rebuilds). Returns the changed file names.
+
+    MVP voting is skipped for forecast seasons unless include_mvp is set.
+    Pages go through a revalidating ScraperEngine, so unchanged pages come
+    back as 304s from the HTML cache.
+    """
+    if include_mvp is None:
+        include_mvp = year not in FORECAST_YEARS
+    fetch = ScraperEngine(revalidate=True).fetch
+
+    season_dir = os.path.join(RAW_DATA_DIR, str(year))
+    staging = tempfile.mkdtemp(prefix=f".{year}-refresh-", dir=RAW_DATA_DIR)
+    try:
+        scrape_player_stats_for_season(year, staging, fetch=fetch)
+        scrape_standings_for_season(year, staging, fetch=fetch)
+        if include_mvp:
+            scrape_mvp_voting_for_season(year, staging, fetch=fetch)
+
+        os.makedirs(season_dir, exist_ok=True)
+        changed = []
+        for name in sorted(os.listdir(staging)):
+            new_path = os.path.join(staging, name)
+            old_path = os.path.join(season_dir, name)
+            if os.path.exists(old_path) and files_digest([old_path]) == files_digest([new_path]):
+                continue
+            os.replace(new_path, old_path)
+            changed.append(name)
+        return changed
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Long-lived forecast engine (used by the API)
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _ModelState:
+    name: str
+    path: str
+    model: object
+    feature_cols: List[str]
+    metadata: dict
+    signature: Tuple
+    digest: str
+    # feature_cols compiled once, reused for every matrix built for this model
+    schema: FeatureSchema = None
+
+    def __post_init__(self):
+        if self.schema is None:
+            self.schema = FeatureSchema(self.feature_cols)
+
+
+@dataclass
+class _SeasonState:
+    year: int
+    signature: Tuple
+    digest: str
+    # Combined digest of every served model the season was scored with
+    model_digest: str
+    panel: pd.DataFrame
+    # Predictions per served model; leaderboards per selection (each
+    # model name, ENSEMBLE and SIDE_BY_SIDE)
+    y_preds: Dict[str, np.ndarray]
+    leaderboards: Dict[str, pd.DataFrame]
+    # For simulation: z-score stats of the season, every row's score and
+    # leaderboard eligibility, predictions of the eligible players (sorted
+    # descending; scores and eligible_preds are per model and for the
+    # ensemble) and the median eligible player used as the default stat
+    # line
+    zscore_stats: pd.DataFrame
+    scores: Dict[str, np.ndarray]
+    eligible: np.ndarray
+    eligible_preds: Dict[str, np.ndarray]
+    template: pd.Series
+    # Per-file content digests, to report what a refresh changed
+    file_digests: Dict[str, str]
+
+
+def _combined_digest(digests: Dict[str, str]) -> str:
+    h = hashlib.sha256()
+    for name, digest in digests.items():
+        h.update(f"{name}:{digest}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+class ForecastEngine:
+    """
+    Keeps the served model bundles and each season's scored panel in memory
+    so that leaderboard requests don't re-load pickles or rebuild the panel.
+
+    The served models are the latest version of every model in the registry
+    (re-read when registry.json changes), or a fixed {name: bundle path}.
+    Each season is scored by all of them in one pass, so any model, the
+    ensemble or the side-by-side view is served from the same state.
+
+    Before serving, the model files and data/<year>/*.csv are stat'ed. If a
+    size/mtime moved, the files are re-hashed and the affected state is
+    rebuilt only when the contents actually changed. A rebuilt season is
+    swapped in as a whole, so readers never see a half-built state.
+    """
+
+    def __init__(self, models: Optional[Dict[str, str]] = None, top_k=10, inference="auto",
+                 registry: Optional[ModelRegistry] = None):
+        self.registry = registry or ModelRegistry()
+        self.top_k = top_k
+        self.inference = inference
+        self._fixed_models = dict(models) if models else None
+        self._served: Optional[Tuple[Tuple, Dict[str, str]]] = None
+        self._model_states: Dict[str, _ModelState] = {}
+        self._seasons: Dict[int, _SeasonState] = {}
+        self._digests: Dict[Tuple, str] = {}
+        self._build_lock = threading.Lock()
+
+    def _digest(self, paths: List[str], signature: Tuple) -> str:
+        # Hash each distinct signature once; touched-but-identical files
+        # produce a new signature and get re-hashed exactly once.
+        digest = self._digests.get(signature)
+        if digest is None:
+            if len(self._digests) > 256:
+                self._digests.clear()
+            digest = files_digest(paths)
+            self._digests[signature] = digest
+        return digest
+
+    # -- models -----------------------------------------------------------
+
+    def served_models(self) -> Dict[str, str]:
+        """
+        {name: bundle path} of the served models, default model first.
+        """
+        if self._fixed_models is not None:
+            return self._fixed_models
+        signature = files_signature([self.registry.path])
+        served = self._served
+        if served is None or served[0] != signature:
+            served = (signature, self.registry.served_models())
+            self._served = served
+        return served[1]
+
+    def resolve_selection(self, model: Optional[str] = None) -> str:
+        """
+        Validate a ?model= value; None selects the default model.
+        """
+        served = self.served_models()
+        if model is None:
+            return next(iter(served))
+        if model in served or model in (ENSEMBLE, SIDE_BY_SIDE):
+            return model
+        raise ValueError(f"Unknown model {model!r}; choose from {list(served) + [ENSEMBLE, SIDE_BY_SIDE]}")
+
+    def _current_model(self, name: str, path: str) -> _ModelState:
+        state = self._model_states.get(name)
+        signature = files_signature([path])
+        if state is not None and state.signature == signature:
+            return state
+
+        with self._build_lock:
+            state = self._model_states.get(name)
+            if state is not None and state.signature == signature:
+                return state
+            digest = self._digest([path], signature)
+            if state is not None and state.path == path and state.digest == digest:
+                # Touched but unchanged: remember the new signature only
+                state.signature = signature
+                return state
+
+            print(f"Loading {name} model bundle from {path}")
+            model, feature_cols, metadata = load_forecast_model(path, self.inference)
+            state = _ModelState(name, path, model, feature_cols, metadata, signature, digest)
+            self._model_states[name] = state
+            return state
+
+    def _current_models(self) -> Dict[str, _ModelState]:
+        served = self.served_models()
+        states = {name: self._current_model(name, path) for name, path in served.items()}
+        if len(self._model_states) > len(states):
+            # Drop models that are no longer served
+            self._model_states = dict(states)
+        return states
+
+    def model_info(self) -> List[dict]:
+        """
+        Served models with their registry entry (metrics, version, feature
+        hash) where there is one.
+        """
+        info = []
+        for name, path in self.served_models().items():
+            try:
+                entry = self.registry.entry(name)
+            except KeyError:
+                entry = {"path": os.path.basename(path)}
+            info.append(dict(entry, name=name))
+        return info
+
+    # -- seasons ----------------------------------------------------------
+
+    def _build_season(self, year: int, model_states: Dict[str, _ModelState], model_digest: str,
+                      paths: List[str], signature: Tuple, digest: str) -> _SeasonState:
+        # Only this season is rebuilt (the panel cache misses for it alone),
+        # its z-scores recomputed and its rows re-scored by every model
+        file_digests = {os.path.basename(p): files_digest([p]) for p in paths}
+        panel, stats = build_forecast_panel([year], return_zscore_stats=True)
+        y_preds = predict_models(
+            {name: (s.model, s.schema) for name, s in model_states.items()},
+            lambda schema: forecast_feature_matrix(panel, schema),
+        )
+        leaderboards = {
+            selection: make_model_leaderboards(panel, y_preds, selection, top_k=self.top_k)
+            .get(year, panel.iloc[0:0])
+            for selection in list(y_preds) + [ENSEMBLE, SIDE_BY_SIDE]
+        }
+
+        eligible = np.ones(len(panel), dtype=bool)
+        if "G" in panel.columns:
+            eligible = (panel["G"] >= MIN_GAMES).to_numpy()
+        scores = dict(y_preds)
+        scores[ENSEMBLE] = ensemble_prediction(y_preds)
+        eligible_preds = {name: np.sort(pred[eligible])[::-1] for name, pred in scores.items()}
+        template = panel[eligible].select_dtypes(include=[np.number]).median()
+
+        return _SeasonState(year, signature, digest, model_digest,
+                            panel, y_preds, leaderboards,
+                            stats, scores, eligible, eligible_preds, template,
+                            file_digests)
+
+    def season(self, year: int) -> _SeasonState:
+        """
+        Return the scored state for a season, rebuilding it first if a
+        served model or the season's CSVs changed since it was built.
+        """
+        model_states = self._current_models()
+        model_digest = _combined_digest({name: s.digest for name, s in model_states.items()})
+        paths = season_input_paths(year)
+        if not paths:
+            raise SeasonNotFoundError(f"No data found for season_end_year={year}")
+        signature = files_signature(paths)
+
+        state = self._seasons.get(year)
+        if (state is not None and state.signature == signature
+                and state.model_digest == model_digest):
+            return state
+
+        with self._build_lock:
+            state = self._seasons.get(year)
+            if (state is not None and state.signature == signature
+                    and state.model_digest == model_digest):
+                return state
+
+            digest = self._digest(paths, signature)
+            if (state is not None and state.digest == digest
+                    and state.model_digest == model_digest):
+                state.signature = signature
+                return state
+
+            state = self._build_season(year, model_states, model_digest, paths, signature, digest)
+            self._seasons[year] = state
+            return state
+
+    def refresh(self, year: int, scrape: bool = False) -> dict:
+        """
+        Incremental in-season update: optionally re-scrape the season, then
+        rebuild and re-score only that season and swap the new state in.
+        The rest of history is untouched.
+        """
+        previous = self._seasons.get(year)
+        scraped = scrape_season_files(year) if scrape else None
+        state = self.season(year)
+
+        if previous is None:
+            changed = sorted(state.file_digests)
+        else:
+            changed = sorted(
+                name for name, digest in state.file_digests.items()
+                if previous.file_digests.get(name) != digest
+            )
+        return {
+            "year": year,
+            "scraped_files_changed": scraped,
+            "changed_files": changed,
+            "rebuilt": state is not previous,
+            "digest": state.digest,
+        }
+
+    def fingerprint(self, year: int) -> Tuple[str, str, float]:
+        """
+        (combined model digest, season data digest, last-modified time) for
+        a season, computed from the files on disk without building anything.
+        Cheap enough to key per-request caches on.
+        """
+        paths = season_input_paths(year)
+        if not paths:
+            raise SeasonNotFoundError(f"No data found for season_end_year={year}")
+        served = self.served_models()
+        model_sigs = {name: files_signature([path]) for name, path in served.items()}
+        data_sig = files_signature(paths)
+        last_modified = max(
+            (mtime_ns for sig in list(model_sigs.values()) + [data_sig]
+             for _, _, mtime_ns in sig if mtime_ns),
+            default=0,
+        ) / 1e9
+        model_digest = _combined_digest({
+            name: self._digest([path], model_sigs[name]) for name, path in served.items()
+        })
+        return model_digest, self._digest(paths, data_sig), last_modified
+
+    def simulate(self, year: int, stat_lines: List[dict], model: Optional[str] = None) -> List[dict]:
+        """
+        Score a batch of hypothetical players against a season without
+        rebuilding its panel.
+
+        Each stat line is a dict of numeric panel stat columns (e.g.
+        PTS_per_g, PER, "W/L%_team"; any other key is a ValueError). It may
+        also hold "name" and "base_player"; the named real player's row is
+        used as the starting point, and otherwise the median eligible
+        player is. Z-scores are recomputed as if the line alone were added
+        to the season, or, for a base_player line, as if that player's row
+        were replaced by it; such a line is also ranked against the field
+        without the player's own real entry. The whole batch is scored in
+        one predict call per model and ranked against the cached real
+        leaderboard of the selected model (or the ensemble).
+        """
+        selection = self.resolve_selection(model)
+        if selection == SIDE_BY_SIDE:
+            raise ValueError(f"Simulation scores one model or the ensemble, not {SIDE_BY_SIDE!r}")
+        state = self.season(year)
+        model_states = self._current_models()
+
+        # Only the season's numeric stat columns can be set
+        stat_cols = set(state.template.index).difference(NON_FEATURE_COLS)
+        for line in stat_lines:
+            unknown = sorted(k for k in line if k not in stat_cols and k not in SIMULATE_META_KEYS)
+            if unknown:
+                raise ValueError(f"Unknown stat columns: {unknown}")
+
+        rows = []
+        # Panel position of each line's base player (None for new players)
+        positions: List[Optional[int]] = []
+        for line in stat_lines:
+            base_player = line.get("base_player")
+            position = None
+            if base_player:
+                # The CSVs are read as latin-1, so accented names are stored
+                # in that rendering; accept either spelling
+                names = {clean_player_name(base_player)}
+                try:
+                    names.add(clean_player_name(base_player.encode("utf-8").decode("latin-1")))
+                except UnicodeError:
+                    pass
+                matches = np.flatnonzero(state.panel["Player_clean"].isin(names).to_numpy())
+                if len(matches) == 0:
+                    raise ValueError(f"Unknown player for {year}: {base_player}")
+                position = int(matches[0])
+            row = state.panel.iloc[position].copy() if position is not None else state.template.copy()
+            for col, value in line.items():
+                if col in SIMULATE_META_KEYS:
+                    continue
+                row[col] = value
+            rows.append(row)
+            positions.append(position)
+
+        hyp = pd.DataFrame(rows).reset_index(drop=True)
+        add_row_features(hyp)
+        # An edited real player replaces their own row in the season moments
+        replaced = None
+        if any(p is not None for p in positions):
+            replaced = pd.DataFrame([state.panel.iloc[p] if p is not None else pd.Series(dtype=float)
+                                     for p in positions]).reset_index(drop=True)
+        incremental_zscores(hyp, state.zscore_stats, replaced=replaced)
+        # The panel's column layout, so every batch binds the feature
+        # schema the same way
+        hyp = hyp.reindex(columns=state.panel.columns)
+
+        members = model_states if selection == ENSEMBLE else {selection: model_states[selection]}
+        y_preds = predict_models(
+            {name: (s.model, s.schema) for name, s in members.items()},
+            lambda schema: schema.frame(hyp),
+        )
+        preds = ensemble_prediction(y_preds) if selection == ENSEMBLE else y_preds[selection]
+
+        # Rank = 1 + number of real eligible players predicted higher. An
+        # edited real player is not ranked against their own real entry.
+        ascending = state.eligible_preds[selection][::-1]
+        own_scores = state.scores[selection]
+        n_field = len(ascending)
+        results = []
+        for line, pred, position in zip(stat_lines, preds, positions):
+            higher = n_field - int(np.searchsorted(ascending, pred, side="right"))
+            field = n_field
+            if position is not None and state.eligible[position]:
+                field -= 1
+                higher -= int(own_scores[position] > pred)
+            results.append({
+                "name": line.get("name") or line.get("base_player") or "Hypothetical player",
+                "model": selection,
+                "pred_award_share": float(pred),
+                "rank": 1 + higher,
+                "field_size": field + 1,
+            })
+        return results
+
+    def leaderboard(self, year: int, model: Optional[str] = None) -> pd.DataFrame:
+        return self.season(year).leaderboards[self.resolve_selection(model)]
+
+    def warm(self, years=None):
+        """
+        Load the models and build the given seasons up front (FastAPI startup).
+        """
+        if years is None:
+            years = FORECAST_YEARS
+        for year in years:
+            self.season(year)
+
+
 def main():
-    leaderboards = run_forecast(FORECAST_YEARS)
+    parser = argparse.ArgumentParser(description="Forecast the MVP race for the current season")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Recompute the season panels and refresh the panel cache")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the per-season panel cache")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes used to build seasons in parallel (-1 = all cores)")
+    parser.add_argument("--scrape", action="store_true",
+                        help="Re-scrape the forecast seasons first; only changed seasons are rebuilt")
+    parser.add_argument("--inference", choices=INFERENCE_BACKENDS, default="auto",
+                        help="Predict backend: pickled sklearn forest, or the flattened forest "
+                             "with the numpy / numba kernel (auto = numba if installed, else sklearn)")
+    parser.add_argument("--model", default=None,
+                        help=f"Registered model to forecast with (default: the registry default), "
+                             f"'{ENSEMBLE}' for the mean of all models, or '{SIDE_BY_SIDE}' for side by side")
+    parser.add_argument("--profile", choices=profiling.PROFILE_MODES, default=None,
+                        help="Dump a cProfile (.prof) or pyinstrument (.html) profile of the forecast")
+    parser.add_argument("--profile-dir", default=None,
+                        help="Where profiles are written (default: cache/profiles)")
+    args = parser.parse_args()
+    profiling.configure_profiling(args.profile, args.profile_dir)
+
+    if args.scrape:
+        for year in FORECAST_YEARS:
+            changed = scrape_season_files(year)
+            print(f"Season {year}: {len(changed)} file(s) changed {changed}")
+
+    with profiling.collect_timings() as timings, profiling.profiled("forecast"):
+        leaderboards = run_forecast(FORECAST_YEARS, use_cache=not args.no_cache,
+                                    rebuild=args.rebuild, workers=args.workers,
+                                    inference=args.inference, model=args.model)
+    print("\nStage timings:")
+    for stage, (seconds, count) in timings.items():
+        print(f"  {stage:30s} {seconds * 1000:9.1f} ms  ({count} call{'s' if count != 1 else ''})")
 
     output_dir = "results"
     os.makedirs(output_dir, exist_ok=True)
+    # Non-default selections get their own file next to the default one
+    suffix = f"_{args.model}" if args.model else ""
 
     for year, df_leader in leaderboards.items():
         # Try to find the season string from the forecast panel
@@ -156,7 +766,7 @@ def main():
 
         csv_path = os.path.join(
             output_dir,
-            f"mvp_forecast_leaderboard_{season_str.replace('/', '-')}.csv",
+            f"mvp_forecast_leaderboard_{season_str.replace('/', '-')}{suffix}.csv",
         )
         df_leader.to_csv(csv_path, index=False)
         print(f"Saved leaderboard to {csv_path}")
@@ -9,6 +9,7 @@ import {
   Tooltip
 } from 'recharts';
 import { ShimmerButton } from './ui/shimmer-button';
+import { simulatePlayers } from '../services/api';
 
 const OracleSimulator = () => {
   const [stats, setStats] = useState({
@@ -19,6 +20,28 @@ const OracleSimulator = () => {
     per: 24
   });
 
+  const [result, setResult] = useState(null);
+  const [simulating, setSimulating] = useState(false);
+
+  const handleSimulate = async () => {
+    setSimulating(true);
+    try {
+      const [outcome] = await simulatePlayers([{
+        name: 'You',
+        PTS_per_g: stats.ppg,
+        TRB_per_g: stats.rpg,
+        AST_per_g: stats.apg,
+        PER: stats.per,
+        'W/L%_team': stats.teamWins / 82,
+      }]);
+      setResult(outcome);
+    } catch (err) {
+      setResult({ error: 'Simulation failed. Please try again.' });
+    } finally {
+      setSimulating(false);
+    }
+  };
+
   const handleInputChange = (field, value) => {
     const numValue = parseFloat(value) || 0;
     setStats(prev => ({
@@ -164,15 +187,25 @@ const OracleSimulator = () => {
           </div>
           
           <div className="oracle-button" style={{ marginTop: '30px', display: 'flex', justifyContent: 'center' }}>
-            <ShimmerButton onClick={() => {
-              // TODO: Implement MVP odds calculation
-              alert('MVP Odds calculation coming soon!');
-            }}>
+            <ShimmerButton onClick={handleSimulate} disabled={simulating}>
               <span className="text-center text-sm leading-none font-medium tracking-tight whitespace-pre-wrap text-white lg:text-base">
-                Calculate MVP Odds
+                {simulating ? 'Calculating...' : 'Calculate MVP Odds'}
               </span>
             </ShimmerButton>
           </div>
+
+          {result && (
+            <div className="oracle-result" style={{ marginTop: '20px', textAlign: 'center', color: '#e2e8f0' }}>
+              {result.error ? (
+                <p>{result.error}</p>
+              ) : (
+                <p>
+                  Projected award share {(result.pred_award_share * 100).toFixed(1)}% —
+                  rank #{result.rank} of {result.field_size} in the current race.
+                </p>
+              )}
+            </div>
+          )}
         </div>
       </div>
     </div>
@@ -1,17 +1,42 @@
 import axios from 'axios';
 
 
-const API_URL = import.meta.env.PROD 
-  ? 'https://nba-mvp-model.onrender.com' 
+const API_URL = import.meta.env.PROD
+  ? 'https://nba-mvp-model.onrender.com'
   : '/api';
 
+// Last payload + ETag per year, so repeat loads revalidate and get a 304
+// instead of downloading the leaderboard again.
+const leaderboardCache = new Map();
 
 export const fetchLeaderboard = async (year) => {
+  const cached = leaderboardCache.get(year);
   try {
-    const response = await axios.get(`${API_URL}/leaderboard/${year}`);
+    const response = await axios.get(`${API_URL}/leaderboard/${year}`, {
+      headers: cached ? { 'If-None-Match': cached.etag } : {},
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    });
+    if (response.status === 304 && cached) {
+      return cached.data;
+    }
+    const etag = response.headers.etag;
+    if (etag) {
+      leaderboardCache.set(year, { etag, data: response.data });
+    }
     return response.data;
   } catch (error) {
     console.error('Error fetching leaderboard:', error);
     throw error;
   }
 };
+
+// Score hypothetical stat lines (panel column -> value) against a season.
+export const simulatePlayers = async (players, year = 2026) => {
+  try {
+    const response = await axios.post(`${API_URL}/simulate`, { year, players });
+    return response.data;
+  } catch (error) {
+    console.error('Error running simulation:', error);
+    throw error;
+  }
+};
@@ -1,35 +1,63 @@
 import os
-from typing import List, Dict, Tuple, Optional
+import argparse
+import functools
+import hashlib
+import inspect
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Dict, Tuple, Optional
 
 import numpy as np
 import pandas as pd
 
-from sklearn.model_selection import GroupKFold, GridSearchCV
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import GroupKFold, GridSearchCV, HalvingGridSearchCV, ParameterGrid
 from sklearn.linear_model import Ridge
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error
-from scipy.stats import spearmanr
 
 try:
+    import xgboost as xgb
     from xgboost import XGBRegressor
     HAS_XGB = True
 except ImportError:
     HAS_XGB = False
     print("Warning: xgboost not installed; XGBRegressor will be skipped.")
 
+try:
+    import optuna
+    HAS_OPTUNA = True
+except ImportError:
+    HAS_OPTUNA = False
+
 try:
     import joblib
 except ImportError:  # very old sklearn fallback
     from sklearn.externals import joblib
 
+import model_registry
+import profiling
+import season_store
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
 
 PROJECT_ROOT = os.path.dirname(__file__)   
 RAW_DATA_DIR = os.path.join(PROJECT_ROOT, "data")    
-MODEL_DIR = os.path.join(PROJECT_ROOT, "models")
+MODEL_DIR = model_registry.MODEL_DIR
 os.makedirs(MODEL_DIR, exist_ok=True)
+CACHE_DIR = os.path.join(PROJECT_ROOT, "cache")  # derived artifacts, safe to delete
+SEASON_STORE_DIR = os.path.join(CACHE_DIR, "season_store")
+PANEL_CACHE_DIR = os.path.join(CACHE_DIR, "panels")
+
+# Panel cache format version. Code changes are picked up automatically
+# (see panel_code_version); bump this only when the cached pickle's layout
+# changes in a way the build functions' source doesn't show.
+PANEL_CACHE_VERSION = 2
 
 TRAIN_YEARS = list(range(2016, 2024)) 
 VAL_YEAR = 2024          
@@ -80,6 +108,64 @@ TEAM_NAME_TO_ABBREV: Dict[str, str] = {
     "Toronto Raptors*": "TOR",
 }
 
+# ---------------------------------------------------------------------------
+# Input fingerprints
+# ---------------------------------------------------------------------------
+
+def season_input_paths(season_end_year: int) -> List[str]:
+    """
+    All raw CSVs under data/{season_end_year}/, sorted so that signatures
+    and digests built from them are stable.
+    """
+    base = os.path.join(RAW_DATA_DIR, str(season_end_year))
+    if not os.path.isdir(base):
+        return []
+    return sorted(
+        os.path.join(base, f) for f in os.listdir(base) if f.endswith(".csv")
+    )
+
+
+def files_signature(paths: List[str]) -> Tuple:
+    """
+    Cheap (path, size, mtime_ns) signature. Only stats the files, so it is
+    fine to call on every request to notice that something changed.
+    """
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            sig.append((p, st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            sig.append((p, None, None))
+    return tuple(sig)
+
+
+def files_digest(paths: List[str]) -> str:
+    """
+    SHA-256 over the file names and contents. Used to confirm a changed
+    signature is a real content change (and not just a touched file).
+    """
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(os.path.basename(p).encode("utf-8"))
+        with open(p, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def source_digest(prefix: str, names: List[str]) -> str:
+    """
+    Short SHA-256 over `prefix` and the source of the named module-level
+    functions / classes. Cache keys include one so that editing the code
+    that produced a cached artifact invalidates it.
+    """
+    h = hashlib.sha256(prefix.encode("utf-8"))
+    for name in names:
+        h.update(inspect.getsource(globals()[name]).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
 # ---------------------------------------------------------------------------
 # Name + basic cleaning helpers
 # ---------------------------------------------------------------------------
@@ -102,94 +188,107 @@ def clean_team_name(raw_team: str) -> str:
     return str(raw_team).strip()
 
 
+def build_player_index(*frames: pd.DataFrame) -> pd.Series:
+    """
+    Map every distinct raw "Player" value in the given tables to its
+    clean_player_name() form. The cleaning runs once per distinct name
+    with vectorized .str operations, and the result is shared by all of a
+    season's tables.
+    """
+    names = pd.unique(pd.concat([f["Player"] for f in frames], ignore_index=True).dropna())
+    # Object dtype keeps Python's str/re semantics (an Arrow-backed string
+    # column would use RE2, whose \s misses characters like U+0085)
+    raw = pd.Series([str(n) for n in names], index=names, dtype=object)
+    clean = (
+        raw
+        .str.lower()
+        .str.replace(r"[.,]", "", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip(" ")
+    )
+    return clean
+
+
+def normalize_player_names(players: pd.Series,
+                           player_index: Optional[pd.Series] = None) -> pd.Series:
+    """
+    Vectorized clean_player_name over a column of raw names.
+    """
+    if player_index is None:
+        player_index = build_player_index(players.to_frame("Player"))
+    return players.map(player_index).fillna("").astype(str)
+
+
 # ---------------------------------------------------------------------------
 # Player-level helpers: collapse multi-team seasons, compute primary team
 # ---------------------------------------------------------------------------
 
-def collapse_multiteam_players(df: pd.DataFrame) -> pd.DataFrame:
+@profiling.timed("collapse_multiteam_players")
+def collapse_multiteam_players(df: pd.DataFrame,
+                               player_index: Optional[pd.Series] = None) -> pd.DataFrame:
     """
     Collapse to one row per (Player_clean, season).
     If a TOT row exists for a player-season, keep that only.
     Otherwise, sum numeric columns across team stints.
+
+    Pass the season's shared `player_index` (see build_player_index) to
+    skip re-cleaning names for every table.
     """
     df = df.copy()
-    df["Player_clean"] = df["Player"].apply(clean_player_name)
-    key = df["Player_clean"] + "::" + df["season"].astype(str)
-    df["key"] = key
-    df["is_tot"] = df["Team"] == "TOT"
+    df["Player_clean"] = normalize_player_names(df["Player"], player_index)
+    group_cols = ["Player_clean", "season"]
 
-    tot_rows = df[df["is_tot"]].copy()
-    non_tot = df[~df["is_tot"]].copy()
+    is_tot = (df["Team"] == "TOT").to_numpy()
+    keys = pd.MultiIndex.from_arrays([df["Player_clean"], df["season"]])
+    has_tot = keys.isin(keys[is_tot])
 
-    tot_keys = set(tot_rows["key"].unique())
-    non_tot_no_tot = non_tot[~non_tot["key"].isin(tot_keys)].copy()
+    tot_rows = df[is_tot]
+    # One TOT row per player-season; keep the first if names collide
+    tot_rows = tot_rows[~keys[is_tot].duplicated()]
+    non_tot_no_tot = df[~has_tot]
 
-    # Aggregate numeric columns for the no-TOT group
+    # Sum numeric columns and take the first non-null value of everything
+    # else. Both reductions share one grouping and run block-wise rather
+    # than column by column.
     numeric_cols = non_tot_no_tot.select_dtypes(include=[np.number]).columns.tolist()
-    group_cols = ["Player_clean", "season"]
-    agg_dict = {col: "sum" for col in numeric_cols}
-
-    agg_no_tot = (
-        non_tot_no_tot
-        .groupby(group_cols, as_index=False)
-        .agg(agg_dict)
-    )
-
-    # For non-numeric columns in aggregated rows, take "first" within each group
     non_numeric_cols = [c for c in non_tot_no_tot.columns
-                        if c not in numeric_cols + ["key", "is_tot"]]
-    meta = (
-        non_tot_no_tot.groupby(group_cols, as_index=False)[non_numeric_cols]
-        .first()
-    )
-
-    agg_no_tot = pd.merge(agg_no_tot, meta, on=group_cols, how="left")
-
-    # For tot_rows, we already have one row per player-season (hopefully).
-    # Just normalize columns to match.
-    tot_rows = tot_rows.drop(columns=["key", "is_tot"], errors="ignore")
-    agg_no_tot = agg_no_tot.drop(columns=["key", "is_tot"], errors="ignore")
+                        if c not in numeric_cols + group_cols]
+    grouped = non_tot_no_tot.groupby(group_cols, sort=True)
+    agg_no_tot = pd.concat(
+        [grouped[numeric_cols].sum(), grouped[non_numeric_cols].first()], axis=1
+    ).reset_index()
 
-    # Concat
     collapsed = pd.concat([tot_rows, agg_no_tot], ignore_index=True)
 
-    # Drop duplicated keys just in case
-    collapsed = collapsed.drop_duplicates(subset=["Player_clean", "season"])
-
     return collapsed
 
 
-def compute_primary_team(players_totals_raw: pd.DataFrame) -> pd.DataFrame:
+def compute_primary_team(players_totals_raw: pd.DataFrame,
+                         player_index: Optional[pd.Series] = None) -> pd.DataFrame:
     """
     Using the raw players_totals (before collapse), find for each
     (Player_clean, season) the team (excluding 'TOT') where the player
     logged the most minutes (MP). This version is robust to missing MP.
     """
-    df = players_totals_raw.copy()
-    df["Player_clean"] = df["Player"].apply(clean_player_name)
-
-    # Exclude TOT rows; we want a real NBA team for primary team
-    df = df[df["Team"] != "TOT"].copy()
-
-    # Coerce MP to numeric and drop rows with missing MP
-    df["MP"] = pd.to_numeric(df["MP"], errors="coerce")
-    df = df[df["MP"].notna()].copy()
+    # Coerce MP to numeric; exclude TOT rows (we want a real NBA team) and
+    # rows with missing MP
+    mp = pd.to_numeric(players_totals_raw["MP"], errors="coerce")
+    mask = (players_totals_raw["Team"] != "TOT") & mp.notna()
 
     # If still empty, return an empty frame with the right columns
-    if df.empty:
+    if not mask.any():
         return pd.DataFrame(columns=["Player_clean", "season", "primary_team"])
 
-    # Sort so that the highest-MP stint per (player, season) comes first
-    df = df.sort_values(
-        ["Player_clean", "season", "MP"],
-        ascending=[True, True, False]
-    )
-
-    # Keep the first row per (player, season)
-    primary = df.drop_duplicates(subset=["Player_clean", "season"], keep="first")
+    df = pd.DataFrame({
+        "Player_clean": normalize_player_names(players_totals_raw["Player"], player_index),
+        "season": players_totals_raw["season"],
+        "primary_team": players_totals_raw["Team"],
+        "MP": mp,
+    })[mask]
 
-    primary = primary[["Player_clean", "season", "Team"]].copy()
-    primary = primary.rename(columns={"Team": "primary_team"})
+    # Highest-MP stint per (player, season); idxmax keeps the first on ties
+    best = df.groupby(["Player_clean", "season"], sort=True)["MP"].idxmax()
+    primary = df.loc[best.to_numpy(), ["Player_clean", "season", "primary_team"]]
 
     return primary
 
@@ -203,35 +302,42 @@ def load_standings_for_year(season_end_year: int) -> pd.DataFrame:
     with team_abbrev, W, L, Wpct, GB, PS_G, PA_G, SRS, Conference, season_end_year, season.
 
     Expects: data/raw/{season_end_year}/standings.csv
+    Reads the compiled season store instead when it is up to date.
     """
     path = os.path.join(RAW_DATA_DIR, str(season_end_year), "standings.csv")
-    df = pd.read_csv(path, encoding="latin-1")
+    stored = season_store.read_table(
+        season_store_path(season_end_year, "standings"), [path]
+    )
+    if stored is not None:
+        return stored
 
-    # Remove obvious division headers if they ever appear (defensive)
-    def is_numeric_or_dash(x):
-        x = str(x)
-        if x == "—":
-            return True
-        try:
-            float(x)
-            return True
-        except ValueError:
-            return False
+    return clean_standings(pd.read_csv(path, encoding="latin-1"))
 
-    # If W is non-numeric in a row, it's probably a header row (like "Atlantic Division")
-    mask_valid = df["W"].apply(is_numeric_or_dash)
-    df = df[mask_valid].copy()
 
-    # Clean and convert
-    df["Team"] = df["Team"].apply(clean_team_name)
+def team_row_mask(w: pd.Series) -> np.ndarray:
+    """
+    True for standings rows whose W is a number, "—" or missing. Anything
+    else is probably a header row (like "Atlantic Division").
+    """
+    if pd.api.types.is_numeric_dtype(w):
+        return np.ones(len(w), dtype=bool)
+    # Done on the raw ndarray: on 30-odd rows, Series overhead costs more
+    # than the row-wise check it replaces
+    values = w.to_numpy()
+    return pd.notna(pd.to_numeric(values, errors="coerce")) | pd.isna(values) | (values == "—")
 
-    # Map to abbreviations where possible
-    def map_team_abbrev(name: str) -> str:
-        # strip trailing '*' if not already handled
-        base = name.replace("*", "").strip()
-        return TEAM_NAME_TO_ABBREV.get(base, base)  # fallback to original if missing
 
-    df["team_abbrev"] = df["Team"].apply(map_team_abbrev)
+def clean_standings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean a raw standings table (see load_standings_for_year).
+    """
+    # Remove obvious division headers if they ever appear (defensive)
+    df = df[team_row_mask(df["W"])].copy()
+
+    # Map to abbreviations where possible; strip trailing '*' if not already
+    # handled and fall back to the cleaned name if it is not in the lookup
+    base = df["Team"].fillna("").astype(str).str.replace("*", "", regex=False).str.strip()
+    df["team_abbrev"] = base.map(TEAM_NAME_TO_ABBREV).fillna(base)
 
     # Convert numeric columns
     for col in ["W", "L", "PS/G", "PA/G", "SRS"]:
@@ -259,6 +365,71 @@ def load_standings_for_year(season_end_year: int) -> pd.DataFrame:
 # Per-season merge
 # ---------------------------------------------------------------------------
 
+PLAYER_TABLES = ["players_totals", "players_per_game", "players_per_poss",
+                 "players_advanced", "mvp_voting"]
+
+
+# Functions whose output is written to the season store
+SEASON_STORE_FUNCTIONS = ["team_row_mask", "clean_standings", "compile_season_store"]
+
+
+@functools.lru_cache(maxsize=None)
+def season_store_version() -> str:
+    """
+    Hash of the store format / library versions and the source of
+    SEASON_STORE_FUNCTIONS; names the season store directory in use.
+    """
+    return source_digest(season_store.format_tag(), SEASON_STORE_FUNCTIONS)
+
+
+def season_store_path(season_end_year: int, table: str) -> str:
+    return season_store.store_path(SEASON_STORE_DIR, season_end_year, table,
+                                   version=season_store_version())
+
+
+def read_season_table(season_end_year: int, table: str) -> pd.DataFrame:
+    """
+    Read data/{season_end_year}/{table}.csv, preferring the memory-mapped
+    copy in the season store when it is newer than the CSV.
+    """
+    path = os.path.join(RAW_DATA_DIR, str(season_end_year), f"{table}.csv")
+    stored = season_store.read_table(
+        season_store_path(season_end_year, table), [path]
+    )
+    if stored is not None:
+        return stored
+    return pd.read_csv(path, encoding="latin-1")
+
+
+def compile_season_store(season_end_year: int) -> List[str]:
+    """
+    Parse a season's CSVs once and write them to the season store
+    (player tables as parsed, standings already cleaned). Returns the
+    names of the tables written.
+    """
+    base = os.path.join(RAW_DATA_DIR, str(season_end_year))
+    written = []
+    for table in PLAYER_TABLES:
+        path = os.path.join(base, f"{table}.csv")
+        if not os.path.exists(path):
+            continue
+        df = pd.read_csv(path, encoding="latin-1")
+        season_store.write_table(
+            df, season_store_path(season_end_year, table)
+        )
+        written.append(table)
+
+    path = os.path.join(base, "standings.csv")
+    if os.path.exists(path):
+        standings = clean_standings(pd.read_csv(path, encoding="latin-1"))
+        season_store.write_table(
+            standings, season_store_path(season_end_year, "standings")
+        )
+        written.append("standings")
+    return written
+
+
+@profiling.timed("load_player_tables_for_year")
 def load_player_tables_for_year(season_end_year: int) -> Tuple[pd.DataFrame, pd.DataFrame,
                                                                pd.DataFrame, pd.DataFrame,
                                                                pd.DataFrame]:
@@ -270,16 +441,14 @@ def load_player_tables_for_year(season_end_year: int) -> Tuple[pd.DataFrame, pd.
     MVP voting DataFrame with the expected columns so downstream
     code can still run without errors.
     """
-    base = os.path.join(RAW_DATA_DIR, str(season_end_year))
+    players_totals = read_season_table(season_end_year, "players_totals")
+    players_per_game = read_season_table(season_end_year, "players_per_game")
+    players_per_poss = read_season_table(season_end_year, "players_per_poss")
+    players_advanced = read_season_table(season_end_year, "players_advanced")
 
-    players_totals = pd.read_csv(os.path.join(base, "players_totals.csv"), encoding="latin-1")
-    players_per_game = pd.read_csv(os.path.join(base, "players_per_game.csv"), encoding="latin-1")
-    players_per_poss = pd.read_csv(os.path.join(base, "players_per_poss.csv"), encoding="latin-1")
-    players_advanced = pd.read_csv(os.path.join(base, "players_advanced.csv"), encoding="latin-1")
-
-    mvp_path = os.path.join(base, "mvp_voting.csv")
+    mvp_path = os.path.join(RAW_DATA_DIR, str(season_end_year), "mvp_voting.csv")
     if os.path.exists(mvp_path):
-        mvp_voting = pd.read_csv(mvp_path, encoding="latin-1")
+        mvp_voting = read_season_table(season_end_year, "mvp_voting")
     else:
         print(f"Warning: mvp_voting.csv not found for {season_end_year}; "
               f"using empty MVP voting table for this season.")
@@ -314,6 +483,7 @@ def load_player_tables_for_year(season_end_year: int) -> Tuple[pd.DataFrame, pd.
     return players_totals, players_per_game, players_per_poss, players_advanced, mvp_voting
 
 
+@profiling.timed("build_season_dataset")
 def build_season_dataset(season_end_year: int) -> pd.DataFrame:
     """
     Build a per-player-per-season DataFrame for one season_end_year,
@@ -327,21 +497,27 @@ def build_season_dataset(season_end_year: int) -> pd.DataFrame:
         mvp_voting_raw,
     ) = load_player_tables_for_year(season_end_year)
 
+    # One name normalization shared by every table in the season
+    player_index = build_player_index(
+        players_totals_raw, players_per_game_raw, players_per_poss_raw,
+        players_advanced_raw, mvp_voting_raw,
+    )
+
     # --- Canonical players_totals with collapse ---
-    players_totals = collapse_multiteam_players(players_totals_raw)
+    players_totals = collapse_multiteam_players(players_totals_raw, player_index)
     # Recompute basic per-game from totals
     for stat in ["PTS", "TRB", "AST", "STL", "BLK", "ORB", "DRB"]:
         col_pg = f"{stat}_per_g"
         players_totals[col_pg] = players_totals[stat] / players_totals["G"].replace(0, np.nan)
 
     # Clean advanced
-    players_adv = collapse_multiteam_players(players_advanced_raw)
+    players_adv = collapse_multiteam_players(players_advanced_raw, player_index)
 
     # Clean per-possession
-    players_poss = collapse_multiteam_players(players_per_poss_raw)
+    players_poss = collapse_multiteam_players(players_per_poss_raw, player_index)
 
     # Optionally, per-game table (you could also recompute everything from totals)
-    players_pg = collapse_multiteam_players(players_per_game_raw)
+    players_pg = collapse_multiteam_players(players_per_game_raw, player_index)
 
     # --- Merge all player stats on (Player_clean, season) ---
     base_cols = [
@@ -387,7 +563,7 @@ def build_season_dataset(season_end_year: int) -> pd.DataFrame:
 
     # --- Add MVP voting (target) ---
     mvp = mvp_voting_raw.copy()
-    mvp["Player_clean"] = mvp["Player"].apply(clean_player_name)
+    mvp["Player_clean"] = normalize_player_names(mvp["Player"], player_index)
     keep_mvp = ["Player_clean", "season",
                 "Voting_First", "Voting_Pts Won", "Voting_Pts Max", "Voting_Share"]
     keep_mvp = [c for c in keep_mvp if c in mvp.columns]
@@ -402,21 +578,15 @@ def build_season_dataset(season_end_year: int) -> pd.DataFrame:
     standings = load_standings_for_year(season_end_year)
 
     # Compute primary team per player using raw totals
-    primary_team = compute_primary_team(players_totals_raw)
+    primary_team = compute_primary_team(players_totals_raw, player_index)
     season_df = season_df.merge(primary_team,
                                 on=["Player_clean", "season"], how="left")
 
     # In many cases, collapsed Team will be 'TOT'; if primary_team is missing,
-    # fall back to Team (if not TOT)
-    def resolve_primary_team(row):
-        if pd.notna(row.get("primary_team")):
-            return row["primary_team"]
-        t = row.get("Team", None)
-        if t and t != "TOT":
-            return t
-        return np.nan
-
-    season_df["primary_team"] = season_df.apply(resolve_primary_team, axis=1)
+    # fall back to Team (if not TOT or empty)
+    team = season_df["Team"]
+    fallback_team = team.where((team != "TOT") & (team != ""))
+    season_df["primary_team"] = season_df["primary_team"].combine_first(fallback_team)
 
     # Merge with standings using team_abbrev == primary_team
     season_df = season_df.merge(
@@ -446,38 +616,153 @@ def build_season_dataset(season_end_year: int) -> pd.DataFrame:
 # Build panel dataset across many seasons
 # ---------------------------------------------------------------------------
 
-def build_panel_dataset(season_end_years: List[int], require_targets: bool = True) -> pd.DataFrame:
-    dfs = []
-    for year in season_end_years:
-        print(f"Building dataset for season_end_year={year}...")
-        df_year = build_season_dataset(year)
-        dfs.append(df_year)
+# Everything build_season_dataset runs to turn a season's CSVs into its
+# panel. Their source is part of the panel cache key.
+PANEL_BUILD_FUNCTIONS = [
+    "clean_player_name", "clean_team_name", "build_player_index",
+    "normalize_player_names", "collapse_multiteam_players", "compute_primary_team",
+    "load_standings_for_year", "team_row_mask", "clean_standings", "read_season_table",
+    "compile_season_store", "load_player_tables_for_year", "build_season_dataset",
+]
 
-    panel = pd.concat(dfs, ignore_index=True)
+
+@functools.lru_cache(maxsize=None)
+def panel_code_version() -> str:
+    """
+    Hash of PANEL_CACHE_VERSION and the source of PANEL_BUILD_FUNCTIONS,
+    so editing any of them invalidates cached panels.
+    """
+    return source_digest(f"v{PANEL_CACHE_VERSION}", PANEL_BUILD_FUNCTIONS)
+
+
+def panel_cache_key(season_end_year: int) -> str:
+    """
+    Cache key for one season's panel: the panel code version plus a hash
+    of every CSV under data/{season_end_year}/.
+    """
+    digest = files_digest(season_input_paths(season_end_year))
+    raw = f"{panel_code_version()}:{season_end_year}:{digest}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def load_or_build_season_dataset(season_end_year: int,
+                                 use_cache: bool = True,
+                                 rebuild: bool = False) -> pd.DataFrame:
+    """
+    build_season_dataset backed by a per-season cache in cache/panels/.
+
+    use_cache=False neither reads nor writes the cache; rebuild=True
+    recomputes the season and overwrites its cache entry.
+    """
+    if not use_cache:
+        print(f"Building dataset for season_end_year={season_end_year}...")
+        return build_season_dataset(season_end_year)
+
+    key = panel_cache_key(season_end_year)
+    path = os.path.join(PANEL_CACHE_DIR, f"{season_end_year}-{key}.pkl")
+    if not rebuild and os.path.exists(path):
+        print(f"Loading cached dataset for season_end_year={season_end_year}...")
+        return pd.read_pickle(path)
+
+    print(f"Building dataset for season_end_year={season_end_year}...")
+    df_year = build_season_dataset(season_end_year)
+
+    os.makedirs(PANEL_CACHE_DIR, exist_ok=True)
+    # Drop stale entries for this season before writing the new one
+    prefix = f"{season_end_year}-"
+    for name in os.listdir(PANEL_CACHE_DIR):
+        if name.startswith(prefix) and name.endswith(".pkl"):
+            os.remove(os.path.join(PANEL_CACHE_DIR, name))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df_year.to_pickle(tmp)
+    os.replace(tmp, path)
+    return df_year
+
+
+def _filter_completed_season(df_year: pd.DataFrame) -> pd.DataFrame:
+    """
+    Completed-season rules: 65-game eligibility and a valid target.
+    """
+    if "G" in df_year.columns:
+        df_year = df_year[df_year["G"] >= 65]
+    if "Voting_Share" in df_year.columns:
+        df_year = df_year[df_year["Voting_Share"].notna()]
+    return df_year.copy()
+
+
+def iter_panel_partitions(season_end_years: List[int], require_targets: bool = True,
+                          use_cache: bool = True, rebuild: bool = False,
+                          workers: int = 1) -> Iterator[pd.DataFrame]:
+    """
+    Yield each season's panel (built or loaded from cache) in the order
+    given, one at a time, so callers can process long histories without
+    holding every season in memory.
+
+    With workers > 1 seasons are built in a process pool, but at most
+    `workers` finished seasons are held ahead of the consumer.
+    """
+    if workers is not None and workers < 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers or 1, len(season_end_years))
 
     # For completed seasons (up through 2025), enforce the 65-game rule
     # and require a valid target. For future seasons (e.g. 2026), skip this
     # so we don't wipe out all players during forecasting.
-    if "season_end_year" in panel.columns and panel["season_end_year"].max() <= 2025:
-        # 65-game eligibility filter (only if require_targets is True, 
-        # because for historical lookbacks we might want to see everyone)
-        if require_targets and "G" in panel.columns:
-            panel = panel[panel["G"] >= 65].copy()
+    completed = require_targets and bool(season_end_years) and max(season_end_years) <= 2025
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            years = iter(season_end_years)
+            pending = deque(pool.submit(load_or_build_season_dataset, year, use_cache, rebuild)
+                            for year in islice(years, workers))
+            while pending:
+                df_year = pending.popleft().result()
+                year = next(years, None)
+                if year is not None:
+                    pending.append(pool.submit(load_or_build_season_dataset, year, use_cache, rebuild))
+                yield _filter_completed_season(df_year) if completed else df_year
+    else:
+        for year in season_end_years:
+            df_year = load_or_build_season_dataset(year, use_cache=use_cache, rebuild=rebuild)
+            yield _filter_completed_season(df_year) if completed else df_year
+
 
-        # Basic sanity: drop players with missing target (only if required)
-        if require_targets and "Voting_Share" in panel.columns:
-            panel = panel[panel["Voting_Share"].notna()].copy()
+def build_panel_dataset(season_end_years: List[int], require_targets: bool = True,
+                        use_cache: bool = True, rebuild: bool = False,
+                        workers: int = 1) -> pd.DataFrame:
+    """
+    Build (or load from cache) each season and stack them in the order given.
 
-    return panel
+    Seasons are independent, so with workers > 1 they are built in a
+    process pool; workers=-1 uses every core.
+    """
+    return pd.concat(list(iter_panel_partitions(season_end_years, require_targets=require_targets,
+                                                use_cache=use_cache, rebuild=rebuild,
+                                                workers=workers)),
+                     ignore_index=True)
 
 
 # ---------------------------------------------------------------------------
 # Feature engineering
 # ---------------------------------------------------------------------------
 
-def engineer_features(panel: pd.DataFrame) -> pd.DataFrame:
-    df = panel.copy()
+# Within-season z-scores for key metrics
+ZSCORE_COLS: Dict[str, str] = {
+    "PTS_per_g": "z_pts_pg",
+    "TRB_per_g": "z_trb_pg",
+    "AST_per_g": "z_ast_pg",
+    "PER": "z_per",
+    "WS": "z_ws",
+    "BPM": "z_bpm",
+    "VORP": "z_vorp"
+}
+
 
+def add_row_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Engineered features that only depend on the row itself (per-75 stats,
+    team win% and its interactions). Adds the columns to df in place.
+    """
     # Per-75 possession stats from per-100 (if available)
     for stat in ["PTS", "TRB", "AST"]:
         col100 = f"{stat}_per100"
@@ -494,30 +779,276 @@ def engineer_features(panel: pd.DataFrame) -> pd.DataFrame:
         if adv_col in df.columns and "team_win_pct" in df.columns:
             df[f"team_win_pct_x_{adv_col}"] = df["team_win_pct"] * df[adv_col]
 
-    # Within-season z-scores for key metrics
-    z_cols = {
-        "PTS_per_g": "z_pts_pg",
-        "TRB_per_g": "z_trb_pg",
-        "AST_per_g": "z_ast_pg",
-        "PER": "z_per",
-        "WS": "z_ws",
-        "BPM": "z_bpm",
-        "VORP": "z_vorp"
-    }
-    for src, dest in z_cols.items():
-        if src in df.columns:
-            df[dest] = (
-                df.groupby("season")[src]
-                .transform(lambda x: (x - x.mean()) / (x.std(ddof=0) + 1e-8))
-            )
+    return df
+
+
+ZSCORE_EPS = 1e-8
 
+ZSCORE_STATS_COLS = ["season", "column", "count", "sum", "sum_sq", "mean", "std"]
+
+
+def zscore_stats(panel: pd.DataFrame, season_col: str = "season") -> pd.DataFrame:
+    """
+    Per-season moments of every ZSCORE_COLS source column in panel: one row
+    per (season, column) with count, sum, sum of squares, mean and
+    population std, NaNs skipped.
+
+    All source columns are reduced at once: rows x columns are flattened
+    into (season, column) group codes and each moment is a single
+    np.bincount. The std is two-pass (centred on the group mean), as in
+    pandas.
+
+    The table is what engineer_features standardizes with, and it can be
+    kept to standardize new rows later (apply_zscores, incremental_zscores)
+    without regrouping the panel.
+    """
+    srcs = [src for src in ZSCORE_COLS if src in panel.columns]
+    season_codes, seasons = pd.factorize(panel[season_col])
+    n_seasons, n_cols = len(seasons), len(srcs)
+
+    values = np.empty((len(panel), n_cols), dtype=np.float64)
+    for j, src in enumerate(srcs):
+        values[:, j] = pd.to_numeric(panel[src], errors="coerce").to_numpy(dtype=np.float64,
+                                                                           na_value=np.nan)
+    group = season_codes[:, None] * n_cols + np.arange(n_cols)
+    valid = (season_codes[:, None] >= 0) & ~np.isnan(values)
+    group, x = group[valid], values[valid]
+    n_groups = n_seasons * n_cols
+
+    count = np.bincount(group, minlength=n_groups).astype(np.float64)
+    total = np.bincount(group, weights=x, minlength=n_groups)
+    total_sq = np.bincount(group, weights=x * x, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        centred = x - mean[group]
+        std = np.sqrt(np.bincount(group, weights=centred * centred, minlength=n_groups) / count)
+
+    return pd.DataFrame({
+        "season": np.repeat(np.asarray(seasons, dtype=object), n_cols),
+        "column": np.tile(np.asarray(srcs, dtype=object), n_seasons),
+        "count": count.astype(np.int64),
+        "sum": total,
+        "sum_sq": total_sq,
+        "mean": mean,
+        "std": std,
+    }, columns=ZSCORE_STATS_COLS)
+
+
+def apply_zscores(df: pd.DataFrame, stats: pd.DataFrame,
+                  season_col: str = "season") -> pd.DataFrame:
+    """
+    Standardize df's ZSCORE_COLS sources with a zscore_stats table, by
+    each row's season (rows whose season is not in the table get NaN).
+    Adds the columns to df in place.
+    """
+    season_codes, seasons = pd.factorize(df[season_col])
+    by_column = {col: g.set_index("season") for col, g in stats.groupby("column", sort=False)}
+    for src, dest in ZSCORE_COLS.items():
+        if src not in df.columns or src not in by_column:
+            continue
+        table = by_column[src].reindex(seasons)
+        mean = np.append(table["mean"].to_numpy(dtype=np.float64), np.nan)[season_codes]
+        std = np.append(table["std"].to_numpy(dtype=np.float64), np.nan)[season_codes]
+        x = pd.to_numeric(df[src], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        df[dest] = (x - mean) / (std + ZSCORE_EPS)
     return df
 
 
+@profiling.timed("engineer_features")
+def engineer_features(panel: pd.DataFrame, stats: Optional[pd.DataFrame] = None,
+                      return_stats: bool = False):
+    """
+    Row features plus within-season z-scores of ZSCORE_COLS.
+
+    The z-scores use `stats` (a zscore_stats table) when given, else the
+    panel's own per-season moments. With return_stats=True, returns
+    (df, stats) so the table can be reused.
+    """
+    df = panel.copy()
+
+    add_row_features(df)
+
+    if stats is None:
+        stats = zscore_stats(df)
+    apply_zscores(df, stats)
+
+    return (df, stats) if return_stats else df
+
+
+def incremental_zscores(rows: pd.DataFrame, stats: pd.DataFrame,
+                        replaced: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Within-season z-scores for `rows`, each treated as if it alone were
+    added to the season summarized by `stats` (that season's rows of a
+    zscore_stats table). Matches engineer_features for a panel of the
+    season plus that row. Adds the columns to rows in place.
+
+    `replaced`, aligned with rows, holds the season row each one stands in
+    for (all-NaN where it is a new row): its contribution is taken out of
+    the moments first, as if the season row had been edited rather than a
+    row added.
+    """
+    moments = stats.set_index("column")
+    for src, dest in ZSCORE_COLS.items():
+        if src not in rows.columns or src not in moments.index:
+            continue
+        n, total, total_sq = moments.loc[src, ["count", "sum", "sum_sq"]]
+        x = pd.to_numeric(rows[src], errors="coerce").to_numpy(dtype=float)
+        present = ~np.isnan(x)
+        x0 = np.where(present, x, 0.0)
+        n1 = n + present
+        total1 = total + x0
+        total_sq1 = total_sq + x0 * x0
+        if replaced is not None and src in replaced.columns:
+            r = pd.to_numeric(replaced[src], errors="coerce").to_numpy(dtype=float)
+            had = ~np.isnan(r)
+            r0 = np.where(had, r, 0.0)
+            n1 = n1 - had
+            total1 = total1 - r0
+            total_sq1 = total_sq1 - r0 * r0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total1 / n1
+            var = np.maximum(total_sq1 / n1 - mean * mean, 0.0)
+        rows[dest] = (x - mean) / (np.sqrt(var) + ZSCORE_EPS)
+    return rows
+
+
+# Columns that should NEVER be used as features
+NON_FEATURE_COLS = [
+    "Player",
+    "Player_clean",
+    "Team",
+    "Team_primary",
+    "Pos",
+    "season",
+    "season_end_year",
+    "Rank",
+    "award_share",
+    "Voting_Share",
+    "Voting_Pts Won",
+    "Voting_Pts Max",
+    "Voting_First",
+]
+
+
+def find_label_column(df: pd.DataFrame, label_col: Optional[str] = "award_share") -> str:
+    """
+    The label column present in df: label_col, else 'award_share', else
+    'Voting_Share'.
+    """
+    label_candidates = []
+    if label_col is not None:
+        label_candidates.append(label_col)
+    if "award_share" not in label_candidates:
+        label_candidates.append("award_share")
+    if "Voting_Share" not in label_candidates:
+        label_candidates.append("Voting_Share")
+
+    for c in label_candidates:
+        if c in df.columns:
+            return c
+
+    raise ValueError(
+        f"No label column found. Expected one of {label_candidates}, "
+        f"but DataFrame columns are: {list(df.columns)}"
+    )
+
+
+def infer_feature_cols(df: pd.DataFrame) -> List[str]:
+    """
+    Numeric columns of df that are not in NON_FEATURE_COLS.
+    """
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    return [c for c in numeric_cols if c not in NON_FEATURE_COLS]
+
+
+class FeatureSchema:
+    """
+    A model's feature columns compiled to array positions, built once (per
+    bundle) and reused for every matrix built for that model.
+
+    fill() writes a panel's feature columns into one contiguous array
+    (float32 by default, the dtype sklearn trees and XGBoost use
+    internally) column by column, with no intermediate DataFrame copies.
+    Feature columns missing from the panel and NaNs become 0.0. Which panel
+    columns are present is resolved once per panel column layout and
+    cached by layout, so one schema can be shared by threads filling
+    panels of different layouts.
+    """
+
+    def __init__(self, feature_cols: List[str], dtype=np.float32):
+        self.feature_cols = list(feature_cols)
+        self.dtype = np.dtype(dtype)
+        self.key = tuple(self.feature_cols)
+        self.positions = {col: j for j, col in enumerate(self.feature_cols)}
+        # layout -> (present [(position, column)], missing [position])
+        self._bindings: Dict[tuple, Tuple[List[Tuple[int, str]], List[int]]] = {}
+        self._warned = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.feature_cols)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _bind(self, columns: pd.Index) -> Tuple[List[Tuple[int, str]], List[int]]:
+        layout = tuple(columns)
+        binding = self._bindings.get(layout)
+        if binding is not None:
+            return binding
+
+        present = [(j, col) for j, col in enumerate(self.feature_cols) if col in columns]
+        missing = [j for j, col in enumerate(self.feature_cols) if col not in columns]
+        with self._lock:
+            binding = self._bindings.setdefault(layout, (present, missing))
+            warn = bool(missing) and tuple(missing) not in self._warned
+            self._warned.add(tuple(missing))
+        if warn:
+            print("Warning: the following feature columns are missing in the panel:")
+            for j in missing:
+                print("   ", self.feature_cols[j])
+        return binding
+
+    def fill(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None,
+             out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Feature matrix of df (restricted to a boolean row mask `rows`), in
+        feature_cols order. Written into `out` when given.
+        """
+        present, missing = self._bind(df.columns)
+        n_rows = len(df) if rows is None else int(np.count_nonzero(rows))
+        if out is None:
+            out = np.empty((n_rows, len(self.feature_cols)), dtype=self.dtype)
+        for j, col in present:
+            values = df[col].to_numpy(dtype=self.dtype, na_value=np.nan)
+            out[:, j] = values if rows is None else values[rows]
+        for j in missing:
+            out[:, j] = 0.0
+        np.nan_to_num(out, copy=False, nan=0.0)
+        return out
+
+    def frame(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        fill() wrapped in a DataFrame (no copy) with df's index, for
+        estimators fitted on named columns.
+        """
+        index = df.index if rows is None else df.index[rows]
+        return pd.DataFrame(self.fill(df, rows), index=index, columns=self.feature_cols, copy=False)
+
+
+@profiling.timed("select_feature_matrix")
 def select_feature_matrix(
     df: pd.DataFrame,
     feature_cols: Optional[List[str]] = None,
     label_col: str = "award_share",
+    schema: Optional[FeatureSchema] = None,
 ) -> Tuple[pd.DataFrame, np.ndarray, List[str]]:
     """
     Build the feature matrix X and label vector y from a panel DataFrame
@@ -530,62 +1061,148 @@ def select_feature_matrix(
     - drops rows with missing labels,
     - fills NaNs in features with 0.0,
     - returns X, y, and the feature_cols list.
+
+    X is filled through a FeatureSchema (float64 unless a schema is
+    passed), straight from df's columns without copying the panel.
     """
+    actual_label = find_label_column(df, label_col)
 
-    # First, find which column is actually present as the label
-    label_candidates = []
-    if label_col is not None:
-        label_candidates.append(label_col)
-    if "award_share" not in label_candidates:
-        label_candidates.append("award_share")
-    if "Voting_Share" not in label_candidates:
-        label_candidates.append("Voting_Share")
+    # 1) Rows with a label
+    labels = df[actual_label].to_numpy()
+    has_label = pd.notna(labels)
 
-    actual_label = None
-    for c in label_candidates:
-        if c in df.columns:
-            actual_label = c
-            break
+    # 2) Infer feature columns if not provided
+    if schema is None:
+        if feature_cols is None:
+            feature_cols = infer_feature_cols(df)
+        schema = FeatureSchema(feature_cols, dtype=np.float64)
 
-    if actual_label is None:
-        raise ValueError(
-            f"No label column found. Expected one of {label_candidates}, "
-            f"but DataFrame columns are: {list(df.columns)}"
-        )
+    # 3) Build X (NaNs filled with 0.0) and y
+    X = schema.frame(df, rows=has_label)
+    y = labels[has_label]
 
-    # Columns that should NEVER be used as features
-    non_feature_cols = [
-        "Player",
-        "Player_clean",
-        "Team",
-        "Team_primary",
-        "Pos",
-        "season",
-        "season_end_year",
-        "Rank",
-        "award_share",
-        "Voting_Share",
-        "Voting_Pts Won",
-        "Voting_Pts Max",
-        "Voting_First",
-    ]
+    return X, y, schema.feature_cols
 
-    # 1) Drop rows with missing labels
-    df_model = df.dropna(subset=[actual_label]).copy()
 
-    # 2) Infer feature columns if not provided
-    if feature_cols is None:
-        numeric_cols = df_model.select_dtypes(include=[np.number]).columns.tolist()
-        feature_cols = [c for c in numeric_cols if c not in non_feature_cols]
+# Everything between a season panel and a model's feature matrix
+FEATURE_CODE_FUNCTIONS = [
+    "add_row_features", "zscore_stats", "apply_zscores", "engineer_features",
+    "find_label_column", "infer_feature_cols", "FeatureSchema", "select_feature_matrix",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def feature_code_version() -> str:
+    """
+    Hash of the source of FEATURE_CODE_FUNCTIONS, for caches of artifacts
+    fitted on engineered features.
+    """
+    return source_digest("features", FEATURE_CODE_FUNCTIONS)
+
+
+# ---------------------------------------------------------------------------
+# Streaming panel -> feature matrix
+# ---------------------------------------------------------------------------
+#
+# build_panel_dataset + engineer_features + select_feature_matrix hold the
+# whole panel several times over (the season list, the concat, and a full
+# copy per stage). The streaming path runs the same stages one season at a
+# time and writes each season's rows straight into a float32 feature
+# matrix, so peak memory is the matrix plus one season's panel.
+
+STREAM_META_COLS = ["Player", "season", "season_end_year"]
+
+
+def stream_feature_matrix(
+    season_end_years: List[int],
+    feature_cols: Optional[List[str]] = None,
+    label_col: str = "award_share",
+    memmap_path: Optional[str] = None,
+    require_targets: bool = True,
+    use_cache: bool = True,
+    rebuild: bool = False,
+    workers: int = 1,
+    rows_hint: int = 600,
+) -> Tuple[np.ndarray, np.ndarray, List[str], pd.DataFrame]:
+    """
+    Streaming equivalent of build_panel_dataset -> engineer_features ->
+    select_feature_matrix.
+
+    Seasons go through the three stages one at a time (z-scores are
+    within-season, so engineering a season on its own matches engineering
+    the whole panel) and their rows are written into one float32 matrix:
+
+    - in memory (memmap_path=None): a preallocated array sized from
+      rows_hint rows per season, grown by doubling if a season overflows it
+      and trimmed to a view at the end;
+    - on disk (memmap_path given): each season is appended to a raw
+      C-order float32 file, returned as a read-only np.memmap of shape
+      (n_rows, len(feature_cols)).
+
+    If feature_cols is None it is inferred from the first season; columns a
+    later season lacks are filled with 0.0.
+
+    Returns X, y (float64), feature_cols and a small frame of
+    STREAM_META_COLS aligned with the rows of X (enough for LOSO groups and
+    leaderboard metrics).
+    """
+    n_rows = 0
+    X = None
+    schema = None
+    out_file = None
+    ys, metas = [], []
+    if memmap_path is not None:
+        os.makedirs(os.path.dirname(memmap_path) or ".", exist_ok=True)
+        out_file = open(memmap_path, "wb")
+
+    try:
+        for part in iter_panel_partitions(season_end_years, require_targets=require_targets,
+                                          use_cache=use_cache, rebuild=rebuild, workers=workers):
+            part = engineer_features(part)
+            actual_label = find_label_column(part, label_col)
+            has_label = part[actual_label].notna().to_numpy()
+            if schema is None:
+                schema = FeatureSchema(feature_cols or infer_feature_cols(part))
+                feature_cols = schema.feature_cols
+            n_part = int(has_label.sum())
+
+            if out_file is not None:
+                block = np.empty((n_part, len(feature_cols)), dtype=np.float32)
+                schema.fill(part, rows=has_label, out=block)
+                block.tofile(out_file)
+            else:
+                if X is None:
+                    capacity = max(rows_hint * len(season_end_years), n_part)
+                    X = np.empty((capacity, len(feature_cols)), dtype=np.float32)
+                elif n_rows + n_part > len(X):
+                    grown = np.empty((max(2 * len(X), n_rows + n_part), len(feature_cols)),
+                                     dtype=np.float32)
+                    grown[:n_rows] = X[:n_rows]
+                    X = grown
+                schema.fill(part, rows=has_label, out=X[n_rows:n_rows + n_part])
+
+            ys.append(part[actual_label].to_numpy(dtype=np.float64)[has_label])
+            metas.append(part.loc[has_label, [c for c in STREAM_META_COLS if c in part.columns]]
+                         .reset_index(drop=True))
+            n_rows += n_part
+    finally:
+        if out_file is not None:
+            out_file.close()
 
-    # 3) Build X and fill NaNs in features
-    X = df_model[feature_cols].copy()
-    X = X.fillna(0.0)
+    if feature_cols is None:
+        raise ValueError(f"No seasons to stream (season_end_years={season_end_years})")
 
-    # 4) Build y
-    y = df_model[actual_label].values
+    if memmap_path is not None:
+        if n_rows:
+            X = np.memmap(memmap_path, dtype=np.float32, mode="r", shape=(n_rows, len(feature_cols)))
+        else:
+            X = np.empty((0, len(feature_cols)), dtype=np.float32)
+    else:
+        X = X[:n_rows] if X is not None else np.empty((0, len(feature_cols)), dtype=np.float32)
 
-    return X, y, feature_cols
+    y = np.concatenate(ys) if ys else np.empty(0, dtype=np.float64)
+    meta = pd.concat(metas, ignore_index=True) if metas else pd.DataFrame(columns=STREAM_META_COLS)
+    return X, y, feature_cols, meta
 
 
 # ---------------------------------------------------------------------------
@@ -605,123 +1222,680 @@ def temporal_split(panel: pd.DataFrame):
     return train_df, val_df, test_df
 
 
-def fit_ridge_with_loso_cv(X_train, y_train, groups):
-    ridge = Ridge(random_state=42)
-    param_grid = {"alpha": [0.01, 0.1, 1.0, 10.0, 100.0]}
+def temporal_split_matrix(X: np.ndarray, y: np.ndarray, meta: pd.DataFrame,
+                          feature_cols: List[str]):
+    """
+    temporal_split for the output of stream_feature_matrix. Returns
+    (X, y, meta) for train, val and test; X is a DataFrame over the rows of
+    the streamed matrix (a view when a split's seasons are contiguous).
+    """
+    years = meta["season_end_year"].to_numpy()
+    splits = []
+    for mask in (np.isin(years, TRAIN_YEARS), years == VAL_YEAR, years == TEST_YEAR):
+        idx = np.flatnonzero(mask)
+        if len(idx) and idx[-1] - idx[0] + 1 == len(idx):
+            idx = slice(idx[0], idx[-1] + 1)
+        splits.append((pd.DataFrame(X[idx], columns=feature_cols, copy=False),
+                       y[idx], meta.iloc[idx].reset_index(drop=True)))
+    return tuple(splits)
+
+
+# ---------------------------------------------------------------------------
+# Training scheduler
+# ---------------------------------------------------------------------------
+#
+# Each LOSO search has two levels of parallelism: GridSearchCV fans out
+# (candidate, fold) fits, and RF / XGB fit trees on several cores. Giving
+# both levels n_jobs=-1 oversubscribes the machine, so one core budget is
+# split between them: the outer search gets as many workers as it has fits
+# (up to the budget) and each estimator gets the cores left per worker. The
+# winning configuration is refit once on the full budget.
+#
+# RF and Ridge fit the same model for any thread count, so their CV scores
+# and the chosen configuration don't depend on how the budget is split. (A
+# multi-threaded RF predict may still differ in the last ulp because tree
+# outputs are summed in completion order.) XGBoost's histogram reduction
+# order depends on its thread count, so its CV boosters always run with
+# XGB_CV_THREADS threads and the budget only sets how many run at once;
+# only the final refit uses the whole budget.
+
+TRAIN_BACKENDS = ["loky", "threading", "multiprocessing"]
+
+# Threads per XGBoost booster during CV scoring (fixed for reproducibility)
+XGB_CV_THREADS = 1
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """
+    Turn a joblib-style n_jobs (-1 = all cores, -2 = all but one, ...) into
+    a concrete core count.
+    """
+    cpus = os.cpu_count() or 1
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, cpus + 1 + n_jobs)
+    return n_jobs
+
+
+def split_core_budget(n_jobs: int, n_tasks: int) -> Tuple[int, int]:
+    """
+    Split a core budget between `n_tasks` independent fits (outer) and the
+    threads each fit may use (inner). outer * inner never exceeds the budget.
+    """
+    budget = resolve_n_jobs(n_jobs)
+    outer = max(1, min(budget, n_tasks))
+    inner = max(1, budget // outer)
+    return outer, inner
+
+
+def _search_backend(backend: str, inner: int):
+    # loky can also cap OpenMP/BLAS threads inside its worker processes
+    backend_kwargs = {"inner_max_num_threads": inner} if backend == "loky" else {}
+    return joblib.parallel_backend(backend, **backend_kwargs)
+
+
+# ---------------------------------------------------------------------------
+# LOSO fold cache
+# ---------------------------------------------------------------------------
+
+class FoldCache:
+    """
+    Leave-One-Season-Out splits materialized once and shared by every
+    candidate in a search.
+
+    Each fold's train/test features are contiguous float32 arrays (the
+    dtype sklearn trees and XGBoost convert to internally, so fitted models
+    are unchanged). For XGBoost, the quantile sketch of each training fold
+    is built once as a QuantileDMatrix and reused by every candidate with
+    the same max_bin.
+    """
+
+    def __init__(self, X, y, groups, dtype=np.float32):
+        self.X = np.ascontiguousarray(np.asarray(X, dtype=dtype))
+        self.y = np.ascontiguousarray(np.asarray(y, dtype=np.float64))
+        groups = np.asarray(groups)
+        cv = GroupKFold(n_splits=len(np.unique(groups)))
+        self.splits = list(cv.split(self.X, self.y, groups))
+        self.seasons = [groups[test_idx][0] for _, test_idx in self.splits]
+        # Fancy indexing copies, so every block below is already contiguous
+        self.folds = [
+            (self.X[train_idx], self.y[train_idx], self.X[test_idx], self.y[test_idx])
+            for train_idx, test_idx in self.splits
+        ]
+        self._dmatrices: Dict[Tuple[int, int], object] = {}
+
+    def __len__(self) -> int:
+        return len(self.folds)
+
+    def quantile_dmatrix(self, fold: int, max_bin: int = 256):
+        key = (fold, max_bin)
+        if key not in self._dmatrices:
+            X_tr, y_tr, _, _ = self.folds[fold]
+            self._dmatrices[key] = xgb.QuantileDMatrix(X_tr, y_tr, max_bin=max_bin)
+        return self._dmatrices[key]
+
+
+def _fold_mae(estimator, params: Dict, fold) -> float:
+    X_tr, y_tr, X_te, y_te = fold
+    model = clone(estimator).set_params(**params).fit(X_tr, y_tr)
+    return mean_absolute_error(y_te, model.predict(X_te))
+
+
+def _rf_warm_start_fold_maes(estimator, params: Dict, sizes: List[int], fold) -> List[float]:
+    """
+    Grow one forest through increasing n_estimators with warm_start=True,
+    scoring it at every size. sklearn advances the random state past the
+    existing trees, so the forest at each size has exactly the trees a
+    fresh fit of that size would have.
+    """
+    X_tr, y_tr, X_te, y_te = fold
+    model = clone(estimator).set_params(warm_start=True, **params)
+    maes = []
+    for n_estimators in sizes:
+        model.set_params(n_estimators=n_estimators).fit(X_tr, y_tr)
+        maes.append(mean_absolute_error(y_te, model.predict(X_te)))
+    return maes
+
+
+def _xgb_fold_maes(estimator, candidates: List[Dict], fold_cache: FoldCache,
+                   folds: List[int], n_threads: int) -> np.ndarray:
+    """
+    (len(candidates), len(folds)) MAEs of boosters trained on the cached
+    QuantileDMatrix of each fold in `folds`, with n_threads threads each.
+    """
+    maes = np.empty((len(candidates), len(folds)))
+    for c, params in enumerate(candidates):
+        model = clone(estimator).set_params(**params)
+        booster_params = {k: v for k, v in model.get_xgb_params().items() if v is not None}
+        booster_params["n_jobs"] = n_threads
+        max_bin = booster_params.get("max_bin", 256)
+        for f, i in enumerate(folds):
+            _, _, X_te, y_te = fold_cache.folds[i]
+            booster = xgb.train(booster_params, fold_cache.quantile_dmatrix(i, max_bin),
+                                num_boost_round=model.n_estimators)
+            maes[c, f] = mean_absolute_error(y_te, booster.inplace_predict(X_te))
+    return maes
+
+
+def evaluate_candidates(estimator, candidates: List[Dict], fold_cache: FoldCache,
+                        n_jobs: int = -1, backend: str = "loky",
+                        inner_param: Optional[str] = "n_jobs",
+                        warm_start: bool = True) -> np.ndarray:
+    """
+    Mean LOSO MAE of every candidate parameter set, computed on the cached
+    folds. sklearn estimators run as (candidate, fold) tasks under the core
+    budget split. XGBoost trains boosters directly on the cached
+    QuantileDMatrix objects, which can't be shipped to worker processes,
+    so the same split is made with threads (XGBoost releases the GIL while
+    training): the folds are dealt out to `outer` workers, each running
+    every candidate on its own folds' matrices with XGB_CV_THREADS threads
+    per booster, so the scores don't depend on n_jobs.
+
+    With warm_start, random-forest candidates that differ only in
+    n_estimators share one forest per fold, grown from the smallest size to
+    the largest, so the smaller sizes cost no extra trees.
+    """
+    n_folds = len(fold_cache)
+    if HAS_XGB and isinstance(estimator, XGBRegressor):
+        inner = XGB_CV_THREADS
+        outer, _ = split_core_budget(max(1, resolve_n_jobs(n_jobs) // inner), n_folds)
+        print(f"Scheduling {len(candidates)} candidates x {n_folds} folds: "
+              f"{outer} worker(s) x {inner} thread(s) (threading, cached QuantileDMatrix)")
+        # Worker w owns folds w, w + outer, ...: each fold's matrix is built
+        # and trained on by that worker only
+        fold_sets = [list(range(w, n_folds, outer)) for w in range(outer)]
+        results = joblib.Parallel(n_jobs=outer, backend="threading")(
+            joblib.delayed(_xgb_fold_maes)(estimator, candidates, fold_cache, folds, inner)
+            for folds in fold_sets
+        )
+        fold_maes = np.empty((len(candidates), n_folds))
+        for folds, maes in zip(fold_sets, results):
+            fold_maes[:, folds] = maes
+        # Same reduction as the other paths, so the means match bit for bit
+        return fold_maes.mean(axis=1)
+
+    if warm_start and isinstance(estimator, RandomForestRegressor):
+        return _evaluate_rf_warm_start(estimator, candidates, fold_cache,
+                                       n_jobs=n_jobs, backend=backend, inner_param=inner_param)
+
+    outer, inner = split_core_budget(n_jobs, len(candidates) * n_folds)
+    if inner_param is None:
+        inner = 1
+    else:
+        estimator = clone(estimator).set_params(**{inner_param: inner})
+    print(f"Scheduling {len(candidates)} candidates x {n_folds} folds: "
+          f"{outer} worker(s) x {inner} thread(s) ({backend}, cached folds)")
+    with _search_backend(backend, inner):
+        maes = joblib.Parallel(n_jobs=outer)(
+            joblib.delayed(_fold_mae)(estimator, params, fold)
+            for params in candidates for fold in fold_cache.folds
+        )
+    return np.asarray(maes).reshape(len(candidates), n_folds).mean(axis=1)
+
+
+def _evaluate_rf_warm_start(estimator, candidates: List[Dict], fold_cache: FoldCache,
+                            n_jobs: int = -1, backend: str = "loky",
+                            inner_param: Optional[str] = "n_jobs") -> np.ndarray:
+    default_size = estimator.get_params()["n_estimators"]
+    # Group candidates by everything except n_estimators
+    groups: Dict[Tuple, List[int]] = {}
+    for i, params in enumerate(candidates):
+        rest = tuple(sorted((k, v) for k, v in params.items() if k != "n_estimators"))
+        groups.setdefault(rest, []).append(i)
+    group_keys = list(groups)
+    group_sizes = [sorted({candidates[i].get("n_estimators", default_size) for i in groups[key]})
+                   for key in group_keys]
+
+    n_folds = len(fold_cache)
+    outer, inner = split_core_budget(n_jobs, len(group_keys) * n_folds)
+    estimator = clone(estimator).set_params(**{inner_param: inner})
+    print(f"Scheduling {len(group_keys)} warm-started forests x {n_folds} folds "
+          f"for {len(candidates)} candidates: {outer} worker(s) x {inner} thread(s) ({backend})")
+    with _search_backend(backend, inner):
+        results = joblib.Parallel(n_jobs=outer)(
+            joblib.delayed(_rf_warm_start_fold_maes)(estimator, dict(key), sizes, fold)
+            for key, sizes in zip(group_keys, group_sizes) for fold in fold_cache.folds
+        )
+
+    fold_maes = np.empty((len(candidates), n_folds))
+    for g, (key, sizes) in enumerate(zip(group_keys, group_sizes)):
+        per_fold = np.asarray(results[g * n_folds:(g + 1) * n_folds])  # (n_folds, n_sizes)
+        for i in groups[key]:
+            fold_maes[i] = per_fold[:, sizes.index(candidates[i].get("n_estimators", default_size))]
+    # Same reduction as the fresh-fit path, so the means match bit for bit
+    return fold_maes.mean(axis=1)
+
+
+# ---------------------------------------------------------------------------
+# Hyperparameter search
+# ---------------------------------------------------------------------------
+#
+# Three strategies, selected with --search:
+#   grid     exhaustive GridSearchCV over the small grids below (the original
+#            behaviour)
+#   halving  HalvingGridSearchCV over the wider grids, with n_estimators as
+#            the resource: every candidate starts with a few trees and only
+#            the best third survive into each round with 3x more trees
+#   optuna   TPE sampling over the ranges below, pruning a trial once its
+#            running LOSO MAE falls behind the median (requires optuna)
+#
+# All three score with Leave-One-Season-Out MAE and refit the winner on the
+# full training set. Ridge is cheap enough that it always uses the grid.
+
+SEARCH_STRATEGIES = ["grid", "halving", "optuna"]
+
+RF_PARAM_GRID = {
+    "n_estimators": [200, 500],
+    "max_depth": [None, 5, 10],
+    "min_samples_leaf": [1, 5]
+}
+RF_WIDE_GRID = {
+    "max_depth": [None, 5, 8, 10, 15, 20],
+    "min_samples_leaf": [1, 2, 5, 10],
+    "max_features": [1.0, 0.5, "sqrt"],
+}
+RF_OPTUNA_SPACE = {
+    "n_estimators": ("int", 100, 500, 50),
+    "max_depth": ("categorical", [None, 5, 8, 10, 15, 20]),
+    "min_samples_leaf": ("int", 1, 10, 1),
+    "max_features": ("categorical", [1.0, 0.5, "sqrt"]),
+}
+
+XGB_PARAM_GRID = {
+    "n_estimators": [300, 600],
+    "max_depth": [3, 5, 7],
+    "learning_rate": [0.05, 0.1]
+}
+XGB_WIDE_GRID = {
+    "max_depth": [2, 3, 4, 5, 7],
+    "learning_rate": [0.02, 0.05, 0.1],
+    "subsample": [0.7, 1.0],
+    "colsample_bytree": [0.5, 0.8, 1.0],
+}
+XGB_OPTUNA_SPACE = {
+    "n_estimators": ("int", 100, 600, 50),
+    "max_depth": ("int", 2, 8, 1),
+    "learning_rate": ("float", 0.01, 0.3, True),
+    "subsample": ("float", 0.6, 1.0, False),
+    "colsample_bytree": ("float", 0.5, 1.0, False),
+    "min_child_weight": ("float", 1.0, 10.0, True),
+}
+
+# Default --search-budget: trees in the last halving round / optuna trials
+DEFAULT_OPTUNA_TRIALS = 50
+
+
+def suggest_params(trial, space: Dict[str, tuple]) -> Dict:
+    params = {}
+    for name, spec in space.items():
+        kind = spec[0]
+        if kind == "int":
+            params[name] = trial.suggest_int(name, spec[1], spec[2], step=spec[3])
+        elif kind == "float":
+            params[name] = trial.suggest_float(name, spec[1], spec[2], log=spec[3])
+        else:
+            params[name] = trial.suggest_categorical(name, spec[1])
+    return params
+
+
+def run_loso_search(estimator, X_train, y_train, groups, param_grid: Dict[str, list],
+                    wide_grid: Optional[Dict[str, list]] = None,
+                    optuna_space: Optional[Dict[str, tuple]] = None,
+                    strategy: str = "grid", budget: Optional[int] = None,
+                    n_jobs: int = -1, backend: str = "loky",
+                    inner_param: Optional[str] = "n_jobs",
+                    fold_cache: Optional[FoldCache] = None, warm_start: bool = True):
+    """
+    Leave-One-Season-Out hyperparameter search under the scheduler above.
+
+    Parameters
+    ----------
+    estimator : sklearn-compatible regressor
+    param_grid : dict
+        Grid for strategy="grid".
+    wide_grid : dict, optional
+        Grid (without n_estimators) for strategy="halving".
+    optuna_space : dict, optional
+        Ranges for strategy="optuna", see suggest_params.
+    strategy : {"grid", "halving", "optuna"}
+    budget : int, optional
+        halving: n_estimators in the last round (default: the largest
+        n_estimators in param_grid). optuna: number of trials.
+    inner_param : str or None
+        The estimator's thread-count parameter (None for single-threaded
+        estimators like Ridge).
+    fold_cache : FoldCache, optional
+        Pre-split float32 folds. Grid and optuna searches evaluate every
+        candidate on these; halving runs on its arrays. Without one,
+        the grid search falls back to GridSearchCV on X_train.
+    warm_start : bool
+        Grow random forests across the n_estimators grid instead of fitting
+        each size from scratch (grid search on a fold cache only).
+
+    Returns
+    -------
+    best : estimator refit on the whole training set with the full budget
+    search_info : dict
+        Strategy, budget, best params and best CV MAE, for the bundle metadata.
+    """
+    if strategy != "grid" and (wide_grid is None or optuna_space is None):
+        strategy = "grid"
     cv = GroupKFold(n_splits=len(np.unique(groups)))
-    grid = GridSearchCV(
-        ridge,
-        param_grid,
-        scoring="neg_mean_absolute_error",
-        cv=cv,
-        n_jobs=-1
-    )
-    grid.fit(X_train, y_train, groups=groups)
-    print("Best Ridge params:", grid.best_params_)
-    print("Best Ridge CV MAE:", -grid.best_score_)
-    return grid.best_estimator_
-
-
-def fit_random_forest_with_loso_cv(X_train, y_train, groups):
-    from sklearn.ensemble import RandomForestRegressor
-    rf = RandomForestRegressor(random_state=42, n_jobs=-1)
-    param_grid = {
-        "n_estimators": [200, 500],
-        "max_depth": [None, 5, 10],
-        "min_samples_leaf": [1, 5]
+
+    if strategy == "optuna":
+        best_params, best_mae, n_candidates = _optuna_loso_search(
+            estimator, fold_cache or FoldCache(X_train, y_train, groups), optuna_space,
+            n_trials=budget or DEFAULT_OPTUNA_TRIALS, n_jobs=n_jobs, inner_param=inner_param,
+        )
+        budget = budget or DEFAULT_OPTUNA_TRIALS
+    elif strategy == "grid" and fold_cache is not None:
+        candidates = list(ParameterGrid(param_grid))
+        maes = evaluate_candidates(estimator, candidates, fold_cache, n_jobs=n_jobs,
+                                   backend=backend, inner_param=inner_param, warm_start=warm_start)
+        best_index = int(np.argmin(maes))  # first of any ties, like GridSearchCV
+        best_params, best_mae, n_candidates = candidates[best_index], maes[best_index], len(candidates)
+        budget = None
+    else:
+        if strategy == "halving":
+            budget = budget or max(param_grid["n_estimators"])
+            grid_params = wide_grid
+        else:
+            budget = None
+            grid_params = param_grid
+        n_candidates = len(ParameterGrid(grid_params))
+        outer, inner = split_core_budget(n_jobs, n_candidates * cv.get_n_splits())
+        if inner_param is None:
+            inner = 1
+        else:
+            estimator = clone(estimator).set_params(**{inner_param: inner})
+        print(f"Scheduling {n_candidates} candidates x {cv.get_n_splits()} folds: "
+              f"{outer} worker(s) x {inner} thread(s) ({backend}, {strategy} search)")
+
+        if strategy == "halving":
+            search = HalvingGridSearchCV(
+                estimator,
+                grid_params,
+                resource="n_estimators",
+                max_resources=budget,
+                min_resources="exhaust",
+                factor=3,
+                scoring="neg_mean_absolute_error",
+                cv=cv,
+                n_jobs=outer,
+                refit=False,
+                random_state=42,
+            )
+        else:
+            search = GridSearchCV(
+                estimator,
+                grid_params,
+                scoring="neg_mean_absolute_error",
+                cv=cv,
+                n_jobs=outer,
+                refit=False,
+            )
+        X_search, cv_search = X_train, cv
+        if fold_cache is not None:
+            X_search, cv_search = fold_cache.X, fold_cache.splits
+            search.set_params(cv=cv_search)
+        with _search_backend(backend, inner):
+            search.fit(X_search, y_train, groups=groups)
+        best_params, best_mae = search.best_params_, -search.best_score_
+
+    best = clone(estimator).set_params(**best_params)
+    if inner_param is not None:
+        best.set_params(**{inner_param: n_jobs})
+    best.fit(X_train, y_train)
+
+    search_info = {
+        "strategy": strategy,
+        "budget": budget,
+        "n_candidates": n_candidates,
+        "best_params": best_params,
+        "best_cv_mae": float(best_mae),
     }
-    cv = GroupKFold(n_splits=len(np.unique(groups)))
-    grid = GridSearchCV(
-        rf,
-        param_grid,
-        scoring="neg_mean_absolute_error",
-        cv=cv,
-        n_jobs=-1
+    return best, search_info
+
+
+def _optuna_loso_search(estimator, fold_cache: FoldCache, space, n_trials,
+                        n_jobs=-1, inner_param="n_jobs"):
+    if not HAS_OPTUNA:
+        raise ImportError("optuna is required for --search optuna (pip install optuna).")
+
+    # Trials run one after another (the TPE sampler learns from finished
+    # trials, and a fixed order keeps the search reproducible); each fit
+    # gets the whole core budget instead.
+    if inner_param is not None:
+        estimator = clone(estimator).set_params(**{inner_param: n_jobs})
+    print(f"Running {n_trials} optuna trials x {len(fold_cache)} folds ({n_jobs} thread budget)")
+
+    def objective(trial):
+        model = clone(estimator).set_params(**suggest_params(trial, space))
+        maes = []
+        for step, (X_tr, y_tr, X_te, y_te) in enumerate(fold_cache.folds):
+            model.fit(X_tr, y_tr)
+            maes.append(mean_absolute_error(y_te, model.predict(X_te)))
+            trial.report(float(np.mean(maes)), step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+        return float(np.mean(maes))
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(
+        direction="minimize",
+        sampler=optuna.samplers.TPESampler(seed=42),
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=2),
     )
-    grid.fit(X_train, y_train, groups=groups)
-    print("Best RF params:", grid.best_params_)
-    print("Best RF CV MAE:", -grid.best_score_)
-    return grid.best_estimator_
+    study.optimize(objective, n_trials=n_trials)
+    return study.best_params, study.best_value, n_trials
 
 
-def fit_xgb_with_loso_cv(X_train, y_train, groups):
+def fit_ridge_with_loso_cv(X_train, y_train, groups, n_jobs: int = -1, backend: str = "loky"):
+    ridge = Ridge(random_state=42)
+    param_grid = {"alpha": [0.01, 0.1, 1.0, 10.0, 100.0]}
+    best, info = run_loso_search(ridge, X_train, y_train, groups, param_grid,
+                                 n_jobs=n_jobs, backend=backend, inner_param=None)
+    print("Best Ridge params:", info["best_params"])
+    print("Best Ridge CV MAE:", info["best_cv_mae"])
+    return best, info
+
+
+def fit_random_forest_with_loso_cv(X_train, y_train, groups, n_jobs: int = -1, backend: str = "loky",
+                                   search: str = "grid", search_budget: Optional[int] = None,
+                                   fold_cache: Optional[FoldCache] = None, warm_start: bool = True):
+    rf = RandomForestRegressor(random_state=42, n_jobs=n_jobs)
+    best, info = run_loso_search(rf, X_train, y_train, groups, RF_PARAM_GRID,
+                                 wide_grid=RF_WIDE_GRID, optuna_space=RF_OPTUNA_SPACE,
+                                 strategy=search, budget=search_budget,
+                                 n_jobs=n_jobs, backend=backend,
+                                 fold_cache=fold_cache or FoldCache(X_train, y_train, groups),
+                                 warm_start=warm_start)
+    print("Best RF params:", info["best_params"])
+    print("Best RF CV MAE:", info["best_cv_mae"])
+    return best, info
+
+
+def fit_xgb_with_loso_cv(X_train, y_train, groups, n_jobs: int = -1, backend: str = "loky",
+                         search: str = "grid", search_budget: Optional[int] = None,
+                         fold_cache: Optional[FoldCache] = None):
     if not HAS_XGB:
-        return None
+        return None, None
 
-    xgb = XGBRegressor(
+    xgb_model = XGBRegressor(
         objective="reg:squarederror",
         tree_method="hist",
         random_state=42,
-        n_jobs=-1
+        n_jobs=n_jobs
     )
-    param_grid = {
-        "n_estimators": [300, 600],
-        "max_depth": [3, 5, 7],
-        "learning_rate": [0.05, 0.1]
-    }
-    cv = GroupKFold(n_splits=len(np.unique(groups)))
-    grid = GridSearchCV(
-        xgb,
-        param_grid,
-        scoring="neg_mean_absolute_error",
-        cv=cv,
-        n_jobs=-1
-    )
-    grid.fit(X_train, y_train, groups=groups)
-    print("Best XGB params:", grid.best_params_)
-    print("Best XGB CV MAE:", -grid.best_score_)
-    return grid.best_estimator_
+    best, info = run_loso_search(xgb_model, X_train, y_train, groups, XGB_PARAM_GRID,
+                                 wide_grid=XGB_WIDE_GRID, optuna_space=XGB_OPTUNA_SPACE,
+                                 strategy=search, budget=search_budget,
+                                 n_jobs=n_jobs, backend=backend,
+                                 fold_cache=fold_cache or FoldCache(X_train, y_train, groups))
+    print("Best XGB params:", info["best_params"])
+    print("Best XGB CV MAE:", info["best_cv_mae"])
+    return best, info
 
 
 # ---------------------------------------------------------------------------
-# Evaluation: MAE + hit rates + Spearman
+# Evaluation: MAE + hit rates + Spearman + NDCG
 # ---------------------------------------------------------------------------
 
-def evaluate_leaderboards(test_df: pd.DataFrame, y_true, y_pred):
-    df = test_df.copy()
-    df["y_true"] = y_true
-    df["y_pred"] = y_pred
+NDCG_K = 10
 
-    mae = mean_absolute_error(df["y_true"], df["y_pred"])
-    print(f"Test MAE on award share: {mae:.4f}")
 
-    seasons = df["season"].unique()
-    top1_hits = []
-    top3_hits = []
-    spearmans = []
+def leaderboard_metrics(eval_df: pd.DataFrame, y_true, predictions,
+                        season_col: str = "season", player_col: str = "Player",
+                        ndcg_k: int = NDCG_K) -> pd.DataFrame:
+    """
+    Leaderboard metrics for every (model, season) at once.
 
-    for s in seasons:
-        sub = df[df["season"] == s].copy()
-        if sub.empty:
-            continue
+    Parameters
+    ----------
+    eval_df : DataFrame
+        Rows being scored; only `season_col` (and `player_col`, if present)
+        are used.
+    y_true : array-like
+        True award shares, aligned with eval_df.
+    predictions : array-like or dict of str -> array-like
+        Predicted award shares of one model, or {model name: predictions}.
+    ndcg_k : int
+        Cut-off for NDCG (gain = true award share).
 
-        sub = sub.sort_values("y_pred", ascending=False)
-        top1_preds = sub.head(1)["Player"].tolist()
-        top3_preds = sub.head(3)["Player"].tolist()
+    Returns
+    -------
+    DataFrame with one row per (model, season), in order of first
+    appearance: model, season, n_players, mvp, mae, top1_hit, top3_hit,
+    spearman, ndcg_at_k.
+
+    Models are stacked into one long array and every statistic is a
+    grouped reduction over (model, season) codes, so the cost does not grow
+    with a Python loop over seasons. The true MVP is the first row with the
+    highest true share, and a hit is any row with that player's name in the
+    predicted top 1 / top 3; tied predictions rank in row order. Spearman
+    is NaN when either side is constant within a season.
+    """
+    if not isinstance(predictions, dict):
+        predictions = {"model": predictions}
+    names = list(predictions)
+    n_models = len(names)
+
+    season_codes, seasons = pd.factorize(eval_df[season_col], sort=False)
+    n_rows, n_seasons = len(season_codes), len(seasons)
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.concatenate([np.asarray(predictions[m], dtype=np.float64) for m in names])
+    truth = np.tile(y_true, n_models)
+    row = np.tile(np.arange(n_rows), n_models)
+    group = (np.repeat(np.arange(n_models), n_rows) * n_seasons + np.tile(season_codes, n_models))
+    n_groups = n_models * n_seasons
+
+    count = np.bincount(group, minlength=n_groups).astype(np.float64)
+    mae = np.bincount(group, weights=np.abs(truth - y_pred), minlength=n_groups) / count
+
+    long = pd.DataFrame({"group": group, "truth": truth, "pred": y_pred})
+    by_group = long.groupby("group", sort=False)
+    pred_rank = by_group["pred"].rank(ascending=False, method="first").to_numpy()
+    true_rank = by_group["truth"].rank(ascending=False, method="first").to_numpy()
+
+    # True MVP of each group = the row ranked first on true share. A hit
+    # is any row with the MVP's name in the predicted top 1 / top 3.
+    is_mvp = true_rank == 1
+    mvp_row = np.zeros(n_groups, dtype=np.int64)
+    mvp_row[group[is_mvp]] = row[is_mvp]
+    if player_col in eval_df.columns:
+        player_codes, _ = pd.factorize(eval_df[player_col])
+        player = np.tile(player_codes, n_models)
+    else:
+        player = row
+    is_mvp_name = player == player[mvp_row[group]]
+    top1_hit = np.bincount(group, weights=is_mvp_name & (pred_rank <= 1), minlength=n_groups) > 0
+    top3_hit = np.bincount(group, weights=is_mvp_name & (pred_rank <= 3), minlength=n_groups) > 0
+
+    # Spearman = Pearson correlation of average ranks, centred per group
+    centre = (count[group] + 1) / 2
+    rx = by_group["truth"].rank(method="average").to_numpy() - centre
+    ry = by_group["pred"].rank(method="average").to_numpy() - centre
+    cov = np.bincount(group, weights=rx * ry, minlength=n_groups)
+    var_x = np.bincount(group, weights=rx * rx, minlength=n_groups)
+    var_y = np.bincount(group, weights=ry * ry, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spearman = cov / np.sqrt(var_x * var_y)
+
+    # NDCG@k with the true share as gain
+    discount = 1.0 / np.log2(np.arange(2, ndcg_k + 2))
+    in_pred_top = pred_rank <= ndcg_k
+    in_true_top = true_rank <= ndcg_k
+    dcg = np.bincount(group[in_pred_top], minlength=n_groups,
+                      weights=truth[in_pred_top] * discount[pred_rank[in_pred_top].astype(np.int64) - 1])
+    idcg = np.bincount(group[in_true_top], minlength=n_groups,
+                       weights=truth[in_true_top] * discount[true_rank[in_true_top].astype(np.int64) - 1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ndcg = np.where(idcg > 0, dcg / idcg, np.nan)
+
+    if player_col in eval_df.columns:
+        mvp = eval_df[player_col].to_numpy()[mvp_row]
+    else:
+        mvp = mvp_row
+    return pd.DataFrame({
+        "model": np.repeat(names, n_seasons),
+        "season": np.tile(np.asarray(seasons), n_models),
+        "n_players": count.astype(np.int64),
+        "mvp": mvp,
+        "mae": mae,
+        "top1_hit": top1_hit.astype(np.int64),
+        "top3_hit": top3_hit.astype(np.int64),
+        "spearman": spearman,
+        "ndcg_at_k": ndcg,
+    })
+
+
+def summarize_leaderboard_metrics(metrics: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per model from a leaderboard_metrics frame: pooled MAE over all
+    rows, hit rates and mean NDCG over seasons, Spearman averaged over the
+    seasons where it is defined.
+    """
+    weighted = metrics.assign(abs_err=metrics["mae"] * metrics["n_players"])
+    grouped = weighted.groupby("model", sort=False)
+    return pd.DataFrame({
+        "n_seasons": grouped.size(),
+        "mae": grouped["abs_err"].sum() / grouped["n_players"].sum(),
+        "top1_hit_rate": grouped["top1_hit"].mean(),
+        "top3_hit_rate": grouped["top3_hit"].mean(),
+        "spearman": grouped["spearman"].mean(),
+        "ndcg_at_k": grouped["ndcg_at_k"].mean(),
+    }).reset_index()
+
+
+def save_metrics_json(metrics: pd.DataFrame, path: str) -> None:
+    """
+    Write a metrics frame as a JSON list of records (NaN -> null).
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    metrics.to_json(path, orient="records", indent=2)
 
-        # Actual MVP = player with max true Voting_Share
-        true_mvp_row = sub.loc[sub["y_true"].idxmax()]
-        true_mvp = true_mvp_row["Player"]
 
-        hit1 = int(true_mvp in top1_preds)
-        hit3 = int(true_mvp in top3_preds)
-        top1_hits.append(hit1)
-        top3_hits.append(hit3)
+def evaluate_leaderboards(test_df: pd.DataFrame, y_true, y_pred) -> pd.DataFrame:
+    """
+    Print the per-season leaderboard evaluation of one model and return
+    its leaderboard_metrics frame.
+    """
+    metrics = leaderboard_metrics(test_df, y_true, y_pred)
 
-        # Spearman rank corr (handle constant predictions edge case)
-        try:
-            rho, _ = spearmanr(sub["y_true"], sub["y_pred"])
-        except Exception:
-            rho = np.nan
-        spearmans.append(rho)
+    mae = mean_absolute_error(y_true, y_pred)
+    print(f"Test MAE on award share: {mae:.4f}")
 
-        print(f"Season {s}: MVP={true_mvp}, Top1Hit={hit1}, Top3Hit={hit3}, Spearman={rho:.3f}")
+    for r in metrics.itertuples(index=False):
+        print(f"Season {r.season}: MVP={r.mvp}, Top1Hit={r.top1_hit}, Top3Hit={r.top3_hit}, "
+              f"Spearman={r.spearman:.3f}")
 
-    print(f"Overall Top-1 hit rate: {np.mean(top1_hits):.3f}")
-    print(f"Overall Top-3 hit rate: {np.mean(top3_hits):.3f}")
-    print(f"Average Spearman over test seasons: {np.nanmean(spearmans):.3f}")
+    print(f"Overall Top-1 hit rate: {metrics['top1_hit'].mean():.3f}")
+    print(f"Overall Top-3 hit rate: {metrics['top3_hit'].mean():.3f}")
+    print(f"Average Spearman over test seasons: {np.nanmean(metrics['spearman']):.3f}")
+    return metrics
 
-def save_model_bundle(model, feature_cols, filepath):
+def save_model_bundle(model, feature_cols, filepath, metadata=None):
     """
     Save a trained model together with its feature column list.
 
@@ -733,6 +1907,8 @@ def save_model_bundle(model, feature_cols, filepath):
         The exact feature column names used for training.
     filepath : str
         Path to the .pkl file to save.
+    metadata : dict, optional
+        Extra metadata stored alongside (e.g. {"search": search_info}).
     """
     bundle = {
         "model": model,
@@ -741,6 +1917,7 @@ def save_model_bundle(model, feature_cols, filepath):
         "val_year": VAL_YEAR,
         "test_year": TEST_YEAR,
     }
+    bundle.update(metadata or {})
     joblib.dump(bundle, filepath)
     print(f"Saved model bundle to {filepath}")
 
@@ -754,7 +1931,8 @@ def load_model_bundle(filepath):
     model : fitted model
     feature_cols : list of str
     metadata : dict
-        Other stored metadata (train/val/test years).
+        Other stored metadata (train/val/test years, plus e.g. the
+        hyperparameter search settings for newer bundles).
     """
     bundle = joblib.load(filepath)
     model = bundle["model"]
@@ -764,6 +1942,7 @@ def load_model_bundle(filepath):
         "val_year": bundle.get("val_year"),
         "test_year": bundle.get("test_year"),
     }
+    metadata.update({k: v for k, v in bundle.items() if k not in ("model", "feature_cols")})
     return model, feature_cols, metadata
 
 
@@ -772,43 +1951,90 @@ def load_model_bundle(filepath):
 # ---------------------------------------------------------------------------
 
 def main():
+    parser = argparse.ArgumentParser(description="Train the MVP award-share models")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Recompute every season panel and refresh the panel cache")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the per-season panel cache")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes used to build seasons in parallel (-1 = all cores)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Build the feature matrix season by season into float32 instead of "
+                             "holding the whole panel in memory")
+    parser.add_argument("--memmap", default=None, metavar="PATH",
+                        help="With streaming, write the feature matrix to a raw float32 memmap at PATH")
+    parser.add_argument("--n-jobs", type=int, default=-1,
+                        help="Core budget for training, split between CV folds and estimator threads (-1 = all cores)")
+    parser.add_argument("--backend", choices=TRAIN_BACKENDS, default="loky",
+                        help="joblib backend for the cross-validation workers")
+    parser.add_argument("--search", choices=SEARCH_STRATEGIES, default="grid",
+                        help="Hyperparameter search for RF/XGB: exhaustive grid, successive halving "
+                             "over n_estimators, or optuna TPE with pruning")
+    parser.add_argument("--search-budget", type=int, default=None,
+                        help="halving: n_estimators in the final round; optuna: number of trials")
+    parser.add_argument("--no-warm-start", action="store_true",
+                        help="Fit every RF grid size from scratch instead of growing one forest per fold")
+    args = parser.parse_args()
+
     completed_years = TRAIN_YEARS + [VAL_YEAR, TEST_YEAR]
-    panel = build_panel_dataset(completed_years)
-    panel = engineer_features(panel)
+    if args.stream or args.memmap:
+        # Feature set comes from the first TRAIN season
+        X_all, y_all, feature_cols, meta = stream_feature_matrix(
+            completed_years, memmap_path=args.memmap, use_cache=not args.no_cache,
+            rebuild=args.rebuild, workers=args.workers)
+        ((X_train, y_train, train_df), (X_val, y_val, val_df),
+         (X_test, y_test, test_df)) = temporal_split_matrix(X_all, y_all, meta, feature_cols)
+    else:
+        panel = build_panel_dataset(completed_years, use_cache=not args.no_cache,
+                                    rebuild=args.rebuild, workers=args.workers)
+        panel = engineer_features(panel)
 
-    train_df, val_df, test_df = temporal_split(panel)
+        train_df, val_df, test_df = temporal_split(panel)
 
-    # Decide feature set on TRAIN, then reuse it for VAL/TEST
-    X_train, y_train, feature_cols = select_feature_matrix(train_df)
-    X_val, y_val, _ = select_feature_matrix(val_df, feature_cols=feature_cols)
-    X_test, y_test, _ = select_feature_matrix(test_df, feature_cols=feature_cols)
+        # Decide feature set on TRAIN, then reuse it for VAL/TEST
+        X_train, y_train, feature_cols = select_feature_matrix(train_df)
+        X_val, y_val, _ = select_feature_matrix(val_df, feature_cols=feature_cols)
+        X_test, y_test, _ = select_feature_matrix(test_df, feature_cols=feature_cols)
 
     # Group labels (season_end_year) for LOSO CV
     groups_train = train_df["season_end_year"].values
+    # RF and XGB searches share one set of pre-split float32 folds
+    fold_cache = FoldCache(X_train, y_train, groups_train)
 
     print("\n=== Fitting Ridge with LOSO CV ===")
-    ridge_model = fit_ridge_with_loso_cv(X_train, y_train, groups_train)
+    ridge_model, ridge_search = fit_ridge_with_loso_cv(X_train, y_train, groups_train,
+                                                       n_jobs=args.n_jobs, backend=args.backend)
 
     print("\n=== Fitting Random Forest with LOSO CV ===")
-    rf_model = fit_random_forest_with_loso_cv(X_train, y_train, groups_train)
+    rf_model, rf_search = fit_random_forest_with_loso_cv(
+        X_train, y_train, groups_train, n_jobs=args.n_jobs, backend=args.backend,
+        search=args.search, search_budget=args.search_budget, fold_cache=fold_cache,
+        warm_start=not args.no_warm_start,
+    )
 
     if HAS_XGB:
         print("\n=== Fitting XGBoost with LOSO CV ===")
-        xgb_model = fit_xgb_with_loso_cv(X_train, y_train, groups_train)
+        xgb_model, xgb_search = fit_xgb_with_loso_cv(
+            X_train, y_train, groups_train, n_jobs=args.n_jobs, backend=args.backend,
+            search=args.search, search_budget=args.search_budget, fold_cache=fold_cache,
+        )
     else:
-        xgb_model = None
+        xgb_model, xgb_search = None, None
 
     # ------------------------------------------------------------------
     # Evaluate ALL models on validation + test
     # ------------------------------------------------------------------
+    # display name -> (registry name, model, search info)
     models = {
-        "Ridge": ridge_model,
-        "RandomForest": rf_model,
+        "Ridge": ("ridge", ridge_model, ridge_search),
+        "RandomForest": (model_registry.DEFAULT_MODEL_NAME, rf_model, rf_search),
     }
     if HAS_XGB and xgb_model is not None:
-        models["XGBoost"] = xgb_model
+        models["XGBoost"] = ("xgboost", xgb_model, xgb_search)
 
-    for name, model in models.items():
+    metrics = {}
+    test_preds = {}
+    for name, (_, model, search_info) in models.items():
         print(f"\n=== Evaluating {name} on validation and test sets ===")
 
         # Validation
@@ -819,18 +2045,34 @@ def main():
         # Test (2023–24 season)
         y_test_pred = model.predict(X_test)
         print(f"\nLeaderboard evaluation for {name} on TEST:")
-        evaluate_leaderboards(test_df, y_test, y_test_pred)
+        test_metrics = summarize_leaderboard_metrics(
+            evaluate_leaderboards(test_df, y_test, y_test_pred)).iloc[0]
+
+        metrics[name] = {
+            "cv_mae": search_info["best_cv_mae"],
+            "val_mae": float(val_mae),
+            "test_mae": float(test_metrics["mae"]),
+            "test_top1_hit_rate": float(test_metrics["top1_hit_rate"]),
+            "test_top3_hit_rate": float(test_metrics["top3_hit_rate"]),
+            "test_spearman": float(test_metrics["spearman"]),
+            f"test_ndcg_at_{NDCG_K}": float(test_metrics["ndcg_at_k"]),
+        }
+        test_preds[name] = y_test_pred
+
+    metrics_path = os.path.join(PROJECT_ROOT, "results", "model_metrics_test.json")
+    save_metrics_json(leaderboard_metrics(test_df, y_test, test_preds), metrics_path)
+    print(f"Saved per-season test metrics to {metrics_path}")
 
     # ------------------------------------------------------------------
-    # Save the primary model (Random Forest) for future use
+    # Register every model; the Random Forest stays the default one served
     # ------------------------------------------------------------------
-    primary_model = rf_model  # choose RF as our main model
-
-    model_path = os.path.join(
-        MODEL_DIR,
-        "mvp_random_forest_2016_2023_train_award_share.pkl",
-    )
-    save_model_bundle(primary_model, feature_cols, model_path)
+    registry = model_registry.ModelRegistry()
+    for name, (registry_name, model, search_info) in models.items():
+        registry.register(
+            registry_name, model, feature_cols,
+            metrics=metrics[name], metadata={"search": search_info},
+            make_default=registry_name == model_registry.DEFAULT_MODEL_NAME,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,204 @@
+"""
+Local model registry.
+
+models/registry.json records every trained bundle by model name and
+version, together with its evaluation metrics and a hash of its feature
+columns:
+
+    {
+      "format_version": 1,
+      "default": "random_forest",
+      "models": {
+        "random_forest": {
+          "latest": 2,
+          "versions": [
+            {"version": 2, "path": "mvp_random_forest_v2.pkl",
+             "created": "2026-10-16T12:00:00+00:00",
+             "feature_hash": "3f0c...", "n_features": 93,
+             "train_years": [2016, ...], "val_year": 2024, "test_year": 2025,
+             "metrics": {"cv_mae": ..., "val_mae": ..., "test_mae": ...},
+             "params": {...}},
+            ...
+          ]
+        },
+        "ridge": {...},
+        "xgboost": {...}
+      }
+    }
+
+Bundle paths are relative to the registry's directory. model.py registers
+every model it trains; forecast.py and the API serve the latest version of
+each registered model. A tree with no registry yet (bundles trained before
+it existed) serves the legacy random-forest pickle as "random_forest".
+
+Usage:
+    python model_registry.py            # list registered models
+"""
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# model.py imports this module and takes MODEL_DIR from here
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+REGISTRY_PATH = os.path.join(MODEL_DIR, "registry.json")
+LEGACY_MODEL_PATH = os.path.join(MODEL_DIR, "mvp_random_forest_2016_2023_train_award_share.pkl")
+
+REGISTRY_FORMAT_VERSION = 1
+DEFAULT_MODEL_NAME = "random_forest"
+
+
+def feature_hash(feature_cols: List[str]) -> str:
+    """
+    Short, order-sensitive hash of a feature column list. Two bundles with
+    the same hash take the same feature matrix.
+    """
+    return hashlib.sha256("\n".join(feature_cols).encode("utf-8")).hexdigest()[:16]
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class ModelRegistry:
+    """
+    Reads and appends to a registry.json manifest. The manifest is re-read
+    on every call (it is tiny) and rewritten atomically on register.
+    """
+
+    def __init__(self, path: str = REGISTRY_PATH):
+        self.path = path
+        self.root = os.path.dirname(os.path.abspath(path))
+
+    def manifest(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {"format_version": REGISTRY_FORMAT_VERSION, "default": None, "models": {}}
+        if manifest.get("format_version") != REGISTRY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported model registry format in {self.path}")
+        return manifest
+
+    def _write(self, manifest: Dict) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, default=_json_default)
+        os.replace(tmp, self.path)
+
+    def register(self, name: str, model, feature_cols: List[str],
+                 metrics: Optional[Dict] = None, metadata: Optional[Dict] = None,
+                 make_default: bool = False) -> Dict:
+        """
+        Save `model` as the next version of `name` (bundle + compact
+        export, see compact_model.py) and record it in the manifest.
+        Returns the new manifest entry.
+        """
+        import compact_model
+        from model import TEST_YEAR, TRAIN_YEARS, VAL_YEAR, save_model_bundle
+
+        manifest = self.manifest()
+        record = manifest["models"].setdefault(name, {"latest": 0, "versions": []})
+        version = record["latest"] + 1
+        filename = f"mvp_{name}_v{version}.pkl"
+        bundle_path = os.path.join(self.root, filename)
+
+        save_model_bundle(model, feature_cols, bundle_path, metadata=metadata)
+        compact_model.export_compact(bundle_path)
+
+        search = (metadata or {}).get("search") or {}
+        entry = {
+            "version": version,
+            "path": filename,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "feature_hash": feature_hash(feature_cols),
+            "n_features": len(feature_cols),
+            "train_years": TRAIN_YEARS,
+            "val_year": VAL_YEAR,
+            "test_year": TEST_YEAR,
+            "metrics": metrics or {},
+            "params": search.get("best_params"),
+        }
+
+        record["versions"].append(entry)
+        record["latest"] = version
+        if make_default or not manifest.get("default"):
+            manifest["default"] = name
+        self._write(manifest)
+        print(f"Registered {name} v{version} ({bundle_path})")
+        return entry
+
+    def default_name(self) -> str:
+        return self.manifest().get("default") or DEFAULT_MODEL_NAME
+
+    def entry(self, name: Optional[str] = None, version: Optional[int] = None) -> Dict:
+        """
+        Manifest entry for a model version (latest by default).
+        """
+        manifest = self.manifest()
+        name = name or manifest.get("default") or DEFAULT_MODEL_NAME
+        record = manifest["models"].get(name)
+        if record is None:
+            raise KeyError(f"No registered model named {name!r}; "
+                           f"available: {sorted(manifest['models'])}")
+        version = version or record["latest"]
+        for entry in record["versions"]:
+            if entry["version"] == version:
+                return entry
+        raise KeyError(f"Model {name!r} has no version {version}")
+
+    def bundle_path(self, name: Optional[str] = None, version: Optional[int] = None) -> str:
+        """
+        Path of a registered bundle. With an empty registry the default
+        name resolves to the legacy random-forest pickle.
+        """
+        if not self.manifest()["models"] and (name or DEFAULT_MODEL_NAME) == DEFAULT_MODEL_NAME:
+            return LEGACY_MODEL_PATH
+        return os.path.join(self.root, self.entry(name, version)["path"])
+
+    def served_models(self) -> Dict[str, str]:
+        """
+        {name: bundle path} of the latest version of every registered model,
+        default model first. Falls back to the legacy pickle.
+        """
+        manifest = self.manifest()
+        if not manifest["models"]:
+            return {DEFAULT_MODEL_NAME: LEGACY_MODEL_PATH}
+        default = manifest.get("default")
+        served = {}
+        for name in sorted(manifest["models"], key=lambda n: (n != default, n)):
+            record = manifest["models"][name]
+            latest = next(e for e in record["versions"] if e["version"] == record["latest"])
+            served[name] = os.path.join(self.root, latest["path"])
+        return served
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the models in the local registry")
+    parser.add_argument("--registry", default=REGISTRY_PATH)
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    manifest = registry.manifest()
+    if not manifest["models"]:
+        print(f"No registry at {args.registry}; serving the legacy bundle {LEGACY_MODEL_PATH}")
+        return
+    print(f"Default model: {manifest['default']}")
+    for name, record in sorted(manifest["models"].items()):
+        for entry in record["versions"]:
+            latest = "*" if entry["version"] == record["latest"] else " "
+            metrics = ", ".join(f"{k}={v:.4f}" for k, v in entry["metrics"].items()
+                                if isinstance(v, (int, float)))
+            print(f"{latest} {name:15s} v{entry['version']:<3d} {entry['created']}  "
+                  f"features={entry['feature_hash']}  {metrics}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,12 @@
-import os
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from model import load_model_bundle, MODEL_DIR
+from compact_model import load_served_bundle
+from model_registry import DEFAULT_MODEL_NAME, ModelRegistry
 
-# Load the trained model bundle
-model_path = os.path.join(
-    MODEL_DIR,
-    "mvp_random_forest_2016_2023_train_award_share.pkl"
-)
-model, feature_cols, metadata = load_model_bundle(model_path)
+# Load the latest registered Random Forest (or the legacy bundle)
+model_path = ModelRegistry().bundle_path(DEFAULT_MODEL_NAME)
+model, feature_cols, metadata = load_served_bundle(model_path)
 
 # Extract feature importance scores
 importances = model.feature_importances_
@@ -0,0 +1,220 @@
+"""
+Pipeline timing spans and optional profiling.
+
+Stages of the pipeline are wrapped in named spans (`timed` decorator or
+`span` context manager). Every span is recorded twice:
+
+- in the per-request collector opened with `collect_timings()`, if any,
+  which the API turns into a Server-Timing header;
+- in process-wide totals (count and seconds per stage) exposed in
+  Prometheus text format by `prometheus_text()` (GET /metrics).
+
+Spans nest, and each reports its own wall time, so an outer stage
+includes its inner ones. Spans run in worker processes (parallel season
+builds) are not seen by the parent.
+
+Profiling is off unless configured with `configure_profiling` (the API
+reads MVP_PROFILE / MVP_PROFILE_DIR; forecast.py has --profile). Each
+`profiled(label)` block is then dumped to the profile directory: a .prof
+file for cProfile (open with snakeviz or pstats) or an .html report for
+pyinstrument. Only one block is profiled at a time; concurrent blocks run
+unprofiled.
+"""
+import contextvars
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import pyinstrument
+    HAS_PYINSTRUMENT = True
+except ImportError:
+    HAS_PYINSTRUMENT = False
+
+PROFILE_MODES = ["cprofile", "pyinstrument"]
+
+# name -> [seconds, count] of the spans of the current request
+_request_timings: contextvars.ContextVar[Optional[Dict[str, List[float]]]] = \
+    contextvars.ContextVar("request_timings", default=None)
+
+_totals: Dict[Tuple[str, str], List[float]] = {}
+_totals_lock = threading.Lock()
+
+
+def _record(metric: str, label: str, seconds: float) -> None:
+    with _totals_lock:
+        total = _totals.setdefault((metric, label), [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block as stage `name`.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _record("stage", name, seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            entry = timings.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+
+def timed(name: str):
+    """
+    Decorator form of span().
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, List[float]]]:
+    """
+    Collect the spans run inside the block (including in threads that
+    copy the current context, e.g. FastAPI's sync endpoints) into a
+    {name: [seconds, count]} dict.
+    """
+    timings: Dict[str, List[float]] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def record_request(route: str, seconds: float) -> None:
+    """
+    Add one served request to the process-wide totals.
+    """
+    _record("request", route, seconds)
+
+
+# ---------------------------------------------------------------------------
+# Output formats
+# ---------------------------------------------------------------------------
+
+def server_timing_header(timings: Dict[str, List[float]],
+                         total: Optional[float] = None) -> str:
+    """
+    Server-Timing header value, durations in milliseconds:
+    `engineer_features;dur=12.3, predict;dur=4.1, total;dur=20.0`.
+    """
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, (seconds, _) in timings.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    """
+    Process-wide stage and request totals in Prometheus text format (as
+    summaries without quantiles).
+    """
+    with _totals_lock:
+        totals = {key: tuple(value) for key, value in _totals.items()}
+
+    metrics = [
+        ("stage", "mvp_stage_seconds", "stage", "Wall time spent in pipeline stages."),
+        ("request", "mvp_request_seconds", "route", "Wall time spent serving API requests."),
+    ]
+    lines = []
+    for kind, metric, label, help_text in metrics:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} summary")
+        for (k, name), (seconds, count) in sorted(totals.items()):
+            if k != kind:
+                continue
+            tag = f'{label}="{_escape_label(name)}"'
+            lines.append(f"{metric}_sum{{{tag}}} {seconds:.6f}")
+            lines.append(f"{metric}_count{{{tag}}} {int(count)}")
+    return "\n".join(lines) + "\n"
+
+
+def reset_totals() -> None:
+    with _totals_lock:
+        _totals.clear()
+
+
+# ---------------------------------------------------------------------------
+# Profile dumps
+# ---------------------------------------------------------------------------
+
+_profile_mode: Optional[str] = None
+_profile_dir: Optional[str] = None
+_profile_lock = threading.Lock()
+
+
+def configure_profiling(mode: Optional[str], out_dir: Optional[str] = None) -> None:
+    """
+    Turn profile dumps on ("cprofile" or "pyinstrument") or off (None).
+    """
+    global _profile_mode, _profile_dir
+    if mode and mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode {mode!r}; choose from {PROFILE_MODES}")
+    if mode == "pyinstrument" and not HAS_PYINSTRUMENT:
+        raise ImportError("pyinstrument is required for --profile pyinstrument (pip install pyinstrument).")
+    _profile_mode = mode or None
+    _profile_dir = out_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                           "cache", "profiles")
+
+
+def _dump_path(label: str, ext: str) -> str:
+    os.makedirs(_profile_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(_profile_dir, f"{label}-{stamp}-{os.getpid()}-{time.perf_counter_ns()}.{ext}")
+
+
+@contextmanager
+def profiled(label: str) -> Iterator[None]:
+    """
+    Profile the enclosed block and dump it under the profile directory,
+    if profiling is configured and no other block is being profiled.
+    """
+    mode = _profile_mode
+    if mode is None or not _profile_lock.acquire(blocking=False):
+        yield
+        return
+    try:
+        if mode == "cprofile":
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                profiler.dump_stats(_dump_path(label, "prof"))
+        else:
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(_dump_path(label, "html"), "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+    finally:
+        _profile_lock.release()
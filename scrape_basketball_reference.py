@@ -1,11 +1,22 @@
 import argparse
+import functools
+import hashlib
+import json
 import os
+import re
+import threading
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from io import StringIO
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
 
+import numpy as np
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup, Comment
+import lxml.etree
+from requests.adapters import HTTPAdapter
 
 # --- Config ---
 USER_AGENT = (
@@ -16,6 +27,9 @@ USER_AGENT = (
 HEADERS = {"User-Agent": USER_AGENT}
 REQUEST_TIMEOUT = 30
 PAUSE_SECONDS = 3  # be polite to the site
+RETRY_BACKOFF_SECONDS = 2.0  # first wait after a 5xx or connection error, doubled per retry
+BASE_URL = "https://www.basketball-reference.com"
+SCRAPE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "scrape")
 
 
 # --- Helpers ---
@@ -34,6 +48,278 @@ def fetch_html(url: str) -> Optional[str]:
         return None
 
 
+# --- Scraper engine: pooled session, rate limiting, HTML cache, resume ---
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests per second on average, with
+    bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HtmlCache:
+    """
+    Content-addressed store for raw HTML. Bodies live in
+    objects/<sha256>.html; index.jsonl maps each URL to its body hash and
+    the ETag / Last-Modified validators the server sent with it.
+
+    The index is append-only: each put adds one line and the last line for
+    a URL wins, so concurrent fetches never rewrite the whole file. It is
+    compacted on load once superseded lines outnumber live ones.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.index_path = os.path.join(cache_dir, "index.jsonl")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.index: Dict[str, dict] = {}
+
+        # index.json: the whole-file index of older caches
+        legacy_path = os.path.join(cache_dir, "index.json")
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                self.index.update(json.load(f))
+        except (FileNotFoundError, ValueError):
+            pass
+        n_lines = 0
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    n_lines += 1
+                    try:
+                        entry = json.loads(line)
+                        self.index[entry.pop("url")] = entry
+                    except (ValueError, KeyError):  # torn last line of an interrupted run
+                        continue
+        except FileNotFoundError:
+            pass
+        has_legacy = os.path.exists(legacy_path)
+        if has_legacy or n_lines > 2 * len(self.index):
+            self._compact()
+            if has_legacy:
+                os.remove(legacy_path)
+
+    def _compact(self) -> None:
+        lines = "".join(json.dumps(dict(entry, url=url)) + "\n" for url, entry in self.index.items())
+        _atomic_write(self.index_path, lines.encode("utf-8"))
+
+    def get(self, url: str) -> Optional[dict]:
+        with self._lock:
+            entry = self.index.get(url)
+        if entry is None:
+            return None
+        path = os.path.join(self.objects_dir, f"{entry['sha256']}.html")
+        if not os.path.exists(path):
+            return None
+        return entry
+
+    def read(self, entry: dict) -> str:
+        path = os.path.join(self.objects_dir, f"{entry['sha256']}.html")
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def put(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        data = body.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.objects_dir, f"{sha}.html")
+        if not os.path.exists(path):
+            _atomic_write(path, data)
+        entry = {
+            "sha256": sha,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        line = json.dumps(dict(entry, url=url)) + "\n"
+        with self._lock:
+            self.index[url] = entry
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ScraperEngine:
+    """
+    HTTP layer for the scrapers: one pooled requests.Session, a token
+    bucket per host instead of fixed sleeps, and an on-disk HTML cache.
+
+    With revalidate=False, cached pages are returned without touching the
+    network (completed seasons don't change). With revalidate=True, cached
+    pages are re-checked with If-None-Match / If-Modified-Since and a 304
+    is served from the cache. fetch(url, revalidate=...) overrides the
+    setting for one request.
+
+    429s wait for Retry-After; 5xx responses and connection errors are
+    retried with exponential backoff (`backoff` seconds, doubled each
+    time), up to max_retries times.
+    """
+
+    def __init__(self, cache_dir: str = SCRAPE_CACHE_DIR, rate: float = 1.0 / PAUSE_SECONDS,
+                 burst: int = 1, pool_size: int = 4, revalidate: bool = False,
+                 max_retries: int = 3, backoff: float = RETRY_BACKOFF_SECONDS):
+        self.cache = HtmlCache(cache_dir)
+        self.rate = rate
+        self.burst = burst
+        self.revalidate = revalidate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def fetch(self, url: str, revalidate: Optional[bool] = None) -> Optional[str]:
+        if revalidate is None:
+            revalidate = self.revalidate
+        cached = self.cache.get(url)
+        if cached is not None and not revalidate:
+            print(f"Cached: {url}")
+            return self.cache.read(cached)
+
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        for attempt in range(self.max_retries + 1):
+            self._bucket(url).acquire()
+            print(f"Fetching: {url}")
+            wait = self.backoff * 2 ** attempt
+            try:
+                resp = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt < self.max_retries:
+                    print(f"  Request failed ({e}); retrying in {wait:.0f}s")
+                    time.sleep(wait)
+                    continue
+                print(f"  ERROR: request failed: {e}")
+                break
+            except requests.RequestException as e:
+                print(f"  ERROR: request failed: {e}")
+                break
+
+            if resp.status_code == 429 and attempt < self.max_retries:
+                retry_after = resp.headers.get("Retry-After", "")
+                wait = float(retry_after) if retry_after.isdigit() else 60.0
+                print(f"  Rate limited; retrying in {wait:.0f}s")
+                time.sleep(wait)
+                continue
+            if resp.status_code >= 500 and attempt < self.max_retries:
+                print(f"  Server error {resp.status_code}; retrying in {wait:.0f}s")
+                time.sleep(wait)
+                continue
+            if resp.status_code == 304 and cached is not None:
+                return self.cache.read(cached)
+            try:
+                resp.raise_for_status()
+            except requests.HTTPError as e:
+                print(f"  ERROR: request failed: {e}")
+                break
+
+            body = resp.text
+            self.cache.put(url, body, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            return body
+
+        # Network trouble: fall back to the cached copy if we have one
+        if cached is not None:
+            print(f"  Using cached copy of {url}")
+            return self.cache.read(cached)
+        return None
+
+
+def season_in_progress(year: int, today: Optional[date] = None) -> bool:
+    """
+    True until the July after a season ends: its stats, standings and
+    voting can still change, so it is never recorded as done.
+    """
+    today = today or date.today()
+    return today < date(year, 7, 1)
+
+
+class ResumeManifest:
+    """
+    JSON record of completed (season, task) pairs so an interrupted scrape
+    picks up where it stopped.
+
+    Entries are grouped by scope, the (base_url, out_dir) pair they were
+    scraped from and written to, so a run against another site root or
+    into another data directory starts fresh instead of skipping seasons
+    it never saved.
+    """
+
+    def __init__(self, path: str, base_url: str = BASE_URL, out_root: str = "data"):
+        self.path = path
+        self.scope = self.scope_key(base_url, out_root)
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                scopes = json.load(f)
+        except (FileNotFoundError, ValueError):
+            scopes = {}
+        # Unscoped entries from older manifests can't be trusted: drop them
+        self.scopes: Dict[str, Dict[str, float]] = {
+            k: v for k, v in scopes.items() if isinstance(v, dict)
+        }
+        self.done = self.scopes.setdefault(self.scope, {})
+
+    @staticmethod
+    def scope_key(base_url: str, out_root: str) -> str:
+        return f"{base_url.rstrip('/')} -> {os.path.abspath(out_root)}"
+
+    @staticmethod
+    def key(year: int, task: str) -> str:
+        return f"{year}:{task}"
+
+    def is_done(self, year: int, task: str) -> bool:
+        with self._lock:
+            return self.key(year, task) in self.done
+
+    def mark_done(self, year: int, task: str) -> None:
+        with self._lock:
+            self.done[self.key(year, task)] = time.time()
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            _atomic_write(self.path, json.dumps(self.scopes, indent=1, sort_keys=True).encode("utf-8"))
+
+
 def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
     def clean_parts(parts):
         out = []
@@ -79,93 +365,235 @@ def clean_df(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def read_table_from_html(html: str, table_id: str, url_for_fallback: Optional[str] = None) -> Optional[pd.DataFrame]:
-    """Try reading a <table id=...> even if Basketball Reference placed it inside an HTML comment.
-    If not found, optionally fall back to scanning all tables from the URL and heuristically selecting the target.
+# --- HTML table extraction ---
+
+_WHITESPACE_RE = re.compile(r"[\r\n]+|\s{2,}")  # same collapse rule as pd.read_html
+
+# Columns that identify a stats table when its id is missing
+FALLBACK_COLUMN_SETS = [
+    {"Player", "Tm"},
+    {"Player", "Team"},
+    {"Team", "W"},
+    {"Rank", "Player"},
+]
+
+
+class HtmlTables:
     """
-    # First try: direct parse of the full HTML
-    try:
-        tables = pd.read_html(html, attrs={"id": table_id})
-        if tables:
-            return tables[0]
-    except ValueError:
-        pass
-    except Exception as e:
-        print(f"  WARN: pd.read_html(full) failed for '{table_id}': {e}")
+    Every <table> on a page, indexed by id after a single lxml parse.
 
-    # Second try: pull the exact table block via BeautifulSoup
-    soup = BeautifulSoup(html, "lxml")
-    table_tag = soup.find("table", id=table_id)
-    if table_tag is not None:
-        try:
-            tables = pd.read_html(str(table_tag))
-            if tables:
-                return tables[0]
-        except Exception as e:
-            print(f"  WARN: pd.read_html(direct table) failed for '{table_id}': {e}")
+    Basketball Reference ships most secondary tables inside HTML comments;
+    those comments are parsed as fragments once and their tables added to
+    the same index, so pulling several tables from one page (e.g. both
+    conference standings) costs one parse.
+    """
 
-    # Third try: scan HTML comments, Basketball Reference often comments out tables
-    comments = soup.find_all(string=lambda text: isinstance(text, Comment))
-    for c in comments:
-        if table_id in c:
-            try:
-                tables = pd.read_html(str(c), attrs={"id": table_id})
-                if tables:
-                    return tables[0]
-            except Exception:
+    def __init__(self, html: str):
+        self._frames: Dict[str, Optional[pd.DataFrame]] = {}
+        # Plain etree elements: lxml.html's element-class lookup costs more
+        # than the parse itself on tables with tens of thousands of cells.
+        # lxml.etree.HTML uses a per-thread parser, so this is safe from the
+        # scraper's worker threads.
+        root = lxml.etree.HTML(html)
+        self.by_id: Dict[str, lxml.etree._Element] = {}
+        self.anonymous: List[lxml.etree._Element] = []
+        if root is None:
+            return
+        self._add_tables(root)
+        for comment in root.iter(lxml.etree.Comment):
+            text = comment.text or ""
+            if "<table" not in text:
                 continue
+            fragment = lxml.etree.HTML(text)
+            if fragment is not None:
+                self._add_tables(fragment)
+
+    def _add_tables(self, root) -> None:
+        for table in root.iter("table"):
+            table_id = table.get("id")
+            if table_id:
+                self.by_id.setdefault(table_id, table)
+            else:
+                self.anonymous.append(table)
+
+    @staticmethod
+    def _column_names(head: List[List[str]]):
+        """
+        Column labels from the header rows, named the way pd.read_html names
+        them: blank labels become "Unnamed: i" (or "Unnamed: i_level_j" with
+        several header rows) and repeated single-row labels get ".1", ".2".
+        """
+        head = [row for row in head if any(row)]
+        if not head:
+            return None
+        if len(head) == 1:
+            names, seen = [], {}
+            for i, label in enumerate(head[0]):
+                label = label or f"Unnamed: {i}"
+                if label in seen:
+                    seen[label] += 1
+                    label = f"{label}.{seen[label]}"
+                else:
+                    seen[label] = 0
+                names.append(label)
+            return pd.Index(names)
+        levels = [[label or f"Unnamed: {i}_level_{j}" for i, label in enumerate(row)]
+                  for j, row in enumerate(head)]
+        return pd.MultiIndex.from_arrays(levels)
+
+    @staticmethod
+    def _infer_column(values: List[str]) -> pd.Series:
+        """
+        Blank cells become NaN; a column whose other cells all parse as
+        numbers (thousands separators allowed) becomes numeric, otherwise
+        it keeps its text.
+        """
+        cells = [v if v else np.nan for v in values]
+        n_present = sum(1 for v in values if v)
+        digits = np.array([v.replace(",", "") if v else np.nan for v in values], dtype=object)
+        numeric = pd.to_numeric(digits, errors="coerce")
+        if np.count_nonzero(pd.notna(numeric)) == n_present:
+            return pd.Series(numeric)
+        return pd.Series(cells)
+
+    @staticmethod
+    def _to_frame(table) -> Optional[pd.DataFrame]:
+        """
+        Convert an already-parsed <table> without serializing it back to
+        HTML. Mirrors pd.read_html: <thead> rows (or leading all-<th> rows)
+        form the header, colspans are repeated, whitespace is collapsed and
+        each column is made numeric when all of its cells are. Tables using
+        rowspan or inline styles (hidden cells) go through pd.read_html
+        itself.
+        """
+        if table.xpath(".//*[@rowspan or @style] | .//style"):
+            try:
+                tables = pd.read_html(StringIO(lxml.etree.tostring(table, encoding="unicode", method="html")))
+            except ValueError:
+                return None
+            return tables[0] if tables else None
+
+        header_rows = table.xpath(".//thead//tr")
+        body_rows = table.xpath(".//tbody//tr") + table.xpath("./tr")
+        footer_rows = table.xpath(".//tfoot//tr")
+        if not header_rows:
+            while body_rows and all(c.tag == "th" for c in body_rows[0].iterchildren("td", "th")):
+                header_rows.append(body_rows.pop(0))
+
+        def expand(rows):
+            out = []
+            for tr in rows:
+                texts = []
+                for cell in tr.iterchildren("td", "th"):
+                    text = (cell.text or "") if len(cell) == 0 else "".join(cell.itertext())
+                    # Only non-printable characters and double spaces can match
+                    if "  " in text or not text.isprintable():
+                        text = _WHITESPACE_RE.sub(" ", text)
+                    text = text.strip()
+                    colspan = cell.get("colspan")
+                    if colspan is None:
+                        texts.append(text)
+                    else:
+                        texts.extend([text] * int(colspan))
+                out.append(texts)
+            return out
+
+        head, body = expand(header_rows), expand(body_rows) + expand(footer_rows)
+        if not head and not body:
+            return None
+        width = max(len(r) for r in head + body)
+        head = [r + [""] * (width - len(r)) for r in head]
+        body = [r + [""] * (width - len(r)) for r in body]
+        columns = HtmlTables._column_names(head)
+        cells = list(zip(*body)) if body else [()] * width
+        frame = pd.DataFrame({i: HtmlTables._infer_column(list(values)) for i, values in enumerate(cells)})
+        frame.columns = columns if columns is not None else pd.RangeIndex(width)
+        return frame
+
+    @staticmethod
+    def _header_text(table) -> set:
+        return {"".join(th.itertext()).strip() for th in table.iter("th")}
+
+    def read(self, table_id: str) -> Optional[pd.DataFrame]:
+        """
+        DataFrame for `table_id`. If no table has that id, fall back to the
+        first table on the page whose header has a familiar column set, or
+        failing that to the first non-empty table.
+        """
+        if table_id in self._frames:
+            return self._frames[table_id]
+
+        table = self.by_id.get(table_id)
+        df = self._to_frame(table) if table is not None else None
+        if table is None:
+            print(f"  WARN: table id='{table_id}' not found by-id")
+            candidates = list(self.by_id.values()) + self.anonymous
+            for want in FALLBACK_COLUMN_SETS:
+                table = next((t for t in candidates if want <= self._header_text(t)), None)
+                if table is not None:
+                    df = self._to_frame(table)
+                    break
+            else:
+                for table in candidates:
+                    df = self._to_frame(table)
+                    if df is not None and not df.empty:
+                        break
+                else:
+                    df = None
+
+        self._frames[table_id] = df
+        return df
 
-    print(f"  WARN: table id='{table_id}' not found by-id")
 
-    # Final fallback: read all tables from the URL and pick one with expected columns
-    if url_for_fallback:
-        try:
-            all_tables = pd.read_html(url_for_fallback)
-            # Prefer tables that contain typical columns
-            priorities = [
-                {"Player", "Tm"},
-                {"Team", "W"},
-                {"Rank", "Player"},
-            ]
-            for want in priorities:
-                for t in all_tables:
-                    cols = set([str(c) for c in t.columns])
-                    if want.issubset(cols):
-                        return t
-            # Or just return the first non-empty
-            for t in all_tables:
-                if not t.empty:
-                    return t
-        except Exception as e:
-            print(f"  WARN: fallback read_html(url) failed: {e}")
+def read_table_from_html(html: str, table_id: str, url_for_fallback: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Read a <table id=...> even if Basketball Reference placed it inside an HTML comment.
 
-    return None
+    Kept for callers that need a single table; when reading several tables
+    from one page, build one HtmlTables and call .read() for each. The page
+    is never downloaded again: `url_for_fallback` is accepted for backwards
+    compatibility only.
+    """
+    return HtmlTables(html).read(table_id)
 
 
 # --- Scrapers ---
+#
+# Each scraper takes an optional `fetch` callable (url -> html or None).
+# Without one it uses fetch_html and pauses PAUSE_SECONDS between player
+# pages; with one (normally ScraperEngine.fetch) pacing is the fetcher's
+# job. Each returns True when everything it was asked for was saved.
+
+def _pause(fetch: Optional[Callable]) -> None:
+    if fetch is None:
+        time.sleep(PAUSE_SECONDS)
 
-def scrape_player_stats_for_season(year: int, out_dir: str) -> None:
+
+def scrape_player_stats_for_season(year: int, out_dir: str,
+                                   fetch: Optional[Callable[[str], Optional[str]]] = None,
+                                   base_url: str = BASE_URL) -> bool:
     print(f"\n[Players] Season {season_label(year)} ({year})")
+    get_html = fetch or fetch_html
     endpoints = {
-        "totals": (f"https://www.basketball-reference.com/leagues/NBA_{year}_totals.html", "totals_stats"),
-        "per_game": (f"https://www.basketball-reference.com/leagues/NBA_{year}_per_game.html", "per_game_stats"),
-        "per_poss": (f"https://www.basketball-reference.com/leagues/NBA_{year}_per_poss.html", "per_poss_stats"),
-        "advanced": (f"https://www.basketball-reference.com/leagues/NBA_{year}_advanced.html", "advanced_stats"),
+        "totals": (f"{base_url}/leagues/NBA_{year}_totals.html", "totals_stats"),
+        "per_game": (f"{base_url}/leagues/NBA_{year}_per_game.html", "per_game_stats"),
+        "per_poss": (f"{base_url}/leagues/NBA_{year}_per_poss.html", "per_poss_stats"),
+        "advanced": (f"{base_url}/leagues/NBA_{year}_advanced.html", "advanced_stats"),
     }
     os.makedirs(out_dir, exist_ok=True)
 
+    saved = 0
     for label, (url, table_id) in endpoints.items():
         print(f"  -> {label}: downloading")
-        html = fetch_html(url)
+        html = get_html(url)
         if not html:
             print(f"  -> {label}: skipped (no HTML)")
-            time.sleep(PAUSE_SECONDS)
+            _pause(fetch)
             continue
 
-        df = read_table_from_html(html, table_id, url)
+        df = HtmlTables(html).read(table_id)
         if df is None or df.empty:
             print(f"  -> {label}: no data")
-            time.sleep(PAUSE_SECONDS)
+            _pause(fetch)
             continue
 
         df = clean_df(df)
@@ -174,25 +602,30 @@ def scrape_player_stats_for_season(year: int, out_dir: str) -> None:
         out_path = os.path.join(out_dir, f"players_{label}.csv")
         df.to_csv(out_path, index=False)
         print(f"  -> {label}: saved {out_path} ({len(df)} rows)")
-        time.sleep(PAUSE_SECONDS)
+        saved += 1
+        _pause(fetch)
+    return saved == len(endpoints)
 
 
-def scrape_standings_for_season(year: int, out_dir: str) -> None:
+def scrape_standings_for_season(year: int, out_dir: str,
+                                fetch: Optional[Callable[[str], Optional[str]]] = None,
+                                base_url: str = BASE_URL) -> bool:
     print(f"\n[Standings] Season {season_label(year)} ({year})")
-    url = f"https://www.basketball-reference.com/leagues/NBA_{year}_standings.html"
+    url = f"{base_url}/leagues/NBA_{year}_standings.html"
     os.makedirs(out_dir, exist_ok=True)
 
-    html = fetch_html(url)
+    html = (fetch or fetch_html)(url)
     if not html:
         print("  -> standings: skipped (no HTML)")
-        return
+        return False
 
-    east = read_table_from_html(html, "confs_standings_E", url)
-    west = read_table_from_html(html, "confs_standings_W", url)
+    tables = HtmlTables(html)
+    east = tables.read("confs_standings_E")
+    west = tables.read("confs_standings_W")
 
     if (east is None or east.empty) and (west is None or west.empty):
         print("  -> standings: no data")
-        return
+        return False
 
     # Normalize columns: first column is conference name header; rename to 'Team'
     def normalize_conf(df: pd.DataFrame, conf_name: str) -> pd.DataFrame:
@@ -227,22 +660,25 @@ def scrape_standings_for_season(year: int, out_dir: str) -> None:
         out_path = os.path.join(out_dir, "standings.csv")
         out.to_csv(out_path, index=False)
         print(f"  -> standings(all): saved {out_path} ({len(out)} rows)")
+    return east_norm is not None and west_norm is not None
 
 
-def scrape_mvp_voting_for_season(year: int, out_dir: str) -> None:
+def scrape_mvp_voting_for_season(year: int, out_dir: str,
+                                 fetch: Optional[Callable[[str], Optional[str]]] = None,
+                                 base_url: str = BASE_URL) -> bool:
     print(f"\n[MVP Voting] Season {season_label(year)} ({year})")
-    url = f"https://www.basketball-reference.com/awards/awards_{year}.html"
+    url = f"{base_url}/awards/awards_{year}.html"
     os.makedirs(out_dir, exist_ok=True)
 
-    html = fetch_html(url)
+    html = (fetch or fetch_html)(url)
     if not html:
         print("  -> mvp: skipped (no HTML)")
-        return
+        return False
 
-    df = read_table_from_html(html, "mvp", url)
+    df = HtmlTables(html).read("mvp")
     if df is None or df.empty:
         print("  -> mvp: no data")
-        return
+        return False
 
     df = clean_df(df)
     df["season_end_year"] = year
@@ -250,14 +686,72 @@ def scrape_mvp_voting_for_season(year: int, out_dir: str) -> None:
     out_path = os.path.join(out_dir, "mvp_voting.csv")
     df.to_csv(out_path, index=False)
     print(f"  -> mvp: saved {out_path} ({len(df)} rows)")
+    return True
+
+
+SCRAPE_TASKS = {
+    "players": scrape_player_stats_for_season,
+    "standings": scrape_standings_for_season,
+    "mvp": scrape_mvp_voting_for_season,
+}
+
+
+def scrape_seasons(years, out_root: str = "data", engine: Optional[ScraperEngine] = None,
+                   base_url: str = BASE_URL, workers: int = 4,
+                   manifest: Optional[ResumeManifest] = None) -> Dict[str, bool]:
+    """
+    Run every (season, task) pair through a shared ScraperEngine on a thread
+    pool. Pairs already recorded in `manifest` are skipped, and each pair is
+    recorded as soon as it succeeds, so an interrupted run can be resumed.
+    Seasons still in progress are always re-fetched (revalidating cached
+    pages) and never recorded. The per-host token bucket keeps the request
+    rate polite no matter how many workers are running.
+    """
+    engine = engine or ScraperEngine(pool_size=workers)
+    jobs = []
+    for year in years:
+        for task in SCRAPE_TASKS:
+            if manifest is not None and manifest.is_done(year, task):
+                print(f"Skipping {year} {task} (already done)")
+                continue
+            jobs.append((year, task))
+
+    def run(job):
+        year, task = job
+        season_dir = os.path.join(out_root, str(year))
+        in_progress = season_in_progress(year)
+        fetch = functools.partial(engine.fetch, revalidate=True) if in_progress else engine.fetch
+        try:
+            ok = SCRAPE_TASKS[task](year, season_dir, fetch=fetch, base_url=base_url)
+        except Exception as e:
+            print(f"  ERROR: {task} {year} failed: {e}")
+            ok = False
+        if ok and manifest is not None and not in_progress:
+            manifest.mark_done(year, task)
+        return ResumeManifest.key(year, task), ok
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return dict(pool.map(run, jobs))
 
 
 # --- Main ---
 
 def main():
-    parser = argparse.ArgumentParser(description="Basketball Reference scraper (simple)")
+    parser = argparse.ArgumentParser(description="Basketball Reference scraper")
     parser.add_argument("--start-year", type=int, default=2009, help="First season end year (e.g., 2009)")
     parser.add_argument("--end-year", type=int, default=2024, help="Last season end year (e.g., 2024)")
+    parser.add_argument("--out-dir", default="data", help="Root directory for data/<year>/ CSVs")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="Site root; point at a local fixture server for offline runs")
+    parser.add_argument("--cache-dir", default=SCRAPE_CACHE_DIR, help="HTML cache and resume manifest directory")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent page fetches")
+    parser.add_argument("--rate", type=float, default=1.0 / PAUSE_SECONDS,
+                        help="Requests per second allowed per host")
+    parser.add_argument("--burst", type=int, default=1, help="Token bucket burst size")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="Re-check cached pages with conditional GETs instead of trusting the cache")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore the resume manifest and redo every season")
     args = parser.parse_args()
 
     start, end = args.start_year, args.end_year
@@ -266,15 +760,20 @@ def main():
 
     print(f"Starting scrape for seasons {start}..{end}")
 
-    for year in range(start, end + 1):
-        season_dir = os.path.join("data", str(year))
-        # Players
-        scrape_player_stats_for_season(year, season_dir)
-        # Standings
-        scrape_standings_for_season(year, season_dir)
-        # MVP voting
-        scrape_mvp_voting_for_season(year, season_dir)
+    engine = ScraperEngine(cache_dir=args.cache_dir, rate=args.rate, burst=args.burst,
+                           pool_size=args.workers, revalidate=args.revalidate)
+    base_url = args.base_url.rstrip("/")
+    manifest_path = os.path.join(args.cache_dir, "manifest.json")
+    if args.force and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    manifest = ResumeManifest(manifest_path, base_url=base_url, out_root=args.out_dir)
+
+    results = scrape_seasons(range(start, end + 1), out_root=args.out_dir, engine=engine,
+                             base_url=base_url, workers=args.workers, manifest=manifest)
 
+    failed = sorted(k for k, ok in results.items() if not ok)
+    if failed:
+        print(f"\nIncomplete: {', '.join(failed)} (rerun to resume)")
     print("\nAll done.")
 
 
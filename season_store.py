@@ -0,0 +1,112 @@
+"""
+Columnar season store.
+
+Each season's tables are parsed from data/<year>/*.csv once, cleaned and
+type-coerced, and written as uncompressed Arrow (Feather v2) files under
+cache/season_store/<year>/. Uncompressed Arrow can be memory-mapped, so the
+loaders in model.py get typed columns back without re-parsing latin-1 CSVs.
+
+Stored tables live under a version directory,
+cache/season_store/<version>/<year>/, where the version (computed by the
+caller) covers FORMAT_VERSION, the code that cleans the tables and the
+pandas / pyarrow versions. Changing any of them starts a fresh store
+instead of reusing tables written by other code. Within a version, a
+stored table is only used while it is newer than the CSV it came from;
+otherwise the loaders fall back to the CSV.
+
+Usage:
+    python season_store.py                      # compile every season in data/
+    python season_store.py --years 2024 2025 2026
+"""
+import argparse
+import os
+from typing import List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# Bump when the stored file layout changes
+FORMAT_VERSION = 1
+
+
+def format_tag() -> str:
+    """
+    FORMAT_VERSION plus the library versions that read and write the files.
+    """
+    arrow = pa.__version__ if HAS_PYARROW else "none"
+    return f"v{FORMAT_VERSION}:pandas-{pd.__version__}:pyarrow-{arrow}"
+
+
+def store_path(store_dir: str, season_end_year: int, table: str, version: str = "") -> str:
+    return os.path.join(store_dir, version, str(season_end_year), f"{table}.feather")
+
+
+def is_fresh(path: str, source_paths: List[str]) -> bool:
+    """
+    True if `path` exists and is at least as new as every source file.
+    """
+    try:
+        stored_mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+    for src in source_paths:
+        try:
+            if os.stat(src).st_mtime_ns > stored_mtime:
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def read_table(path: str, source_paths: List[str]) -> Optional[pd.DataFrame]:
+    """
+    Memory-map a stored table. Returns None when pyarrow is unavailable or
+    the stored file is missing or older than its sources, so the caller can
+    fall back to parsing the CSV.
+    """
+    if not HAS_PYARROW or not is_fresh(path, source_paths):
+        return None
+    try:
+        return feather.read_table(path, memory_map=True).to_pandas()
+    except (OSError, pa.ArrowInvalid) as e:
+        print(f"Warning: could not read season store file {path}: {e}")
+        return None
+
+
+def write_table(df: pd.DataFrame, path: str) -> None:
+    """
+    Write a table atomically as uncompressed Arrow so it can be memory-mapped.
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required to write the season store.")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(pa.Table.from_pandas(df), tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+
+def main():
+    from model import RAW_DATA_DIR, compile_season_store
+
+    parser = argparse.ArgumentParser(description="Compile data/<year>/*.csv into the Arrow season store")
+    parser.add_argument("--years", type=int, nargs="*", help="Season end years (default: every year in data/)")
+    args = parser.parse_args()
+
+    years = args.years
+    if not years:
+        years = sorted(int(d) for d in os.listdir(RAW_DATA_DIR) if d.isdigit())
+
+    for year in years:
+        written = compile_season_store(year)
+        print(f"Season {year}: stored {', '.join(written)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Vectorized collapse_multiteam_players / compute_primary_team against the
+row-wise implementations they replaced, on every season in data/.
+benchmarks/bench_collapse.py times the two against each other.
+"""
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from model import (  # noqa: E402
+    RAW_DATA_DIR,
+    build_player_index,
+    clean_player_name,
+    collapse_multiteam_players,
+    compute_primary_team,
+    load_player_tables_for_year,
+)
+
+YEARS = sorted(int(d) for d in os.listdir(RAW_DATA_DIR) if d.isdigit())
+
+
+# ---------------------------------------------------------------------------
+# Reference (row-wise) implementations
+# ---------------------------------------------------------------------------
+
+def reference_collapse_multiteam_players(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["Player_clean"] = df["Player"].apply(clean_player_name)
+    key = df["Player_clean"] + "::" + df["season"].astype(str)
+    df["key"] = key
+    df["is_tot"] = df["Team"] == "TOT"
+
+    tot_rows = df[df["is_tot"]].copy()
+    non_tot = df[~df["is_tot"]].copy()
+
+    tot_keys = set(tot_rows["key"].unique())
+    non_tot_no_tot = non_tot[~non_tot["key"].isin(tot_keys)].copy()
+
+    numeric_cols = non_tot_no_tot.select_dtypes(include=[np.number]).columns.tolist()
+    group_cols = ["Player_clean", "season"]
+    agg_dict = {col: "sum" for col in numeric_cols}
+
+    agg_no_tot = (
+        non_tot_no_tot
+        .groupby(group_cols, as_index=False)
+        .agg(agg_dict)
+    )
+
+    non_numeric_cols = [c for c in non_tot_no_tot.columns
+                        if c not in numeric_cols + ["key", "is_tot"]]
+    meta = (
+        non_tot_no_tot.groupby(group_cols, as_index=False)[non_numeric_cols]
+        .first()
+    )
+
+    agg_no_tot = pd.merge(agg_no_tot, meta, on=group_cols, how="left")
+
+    tot_rows = tot_rows.drop(columns=["key", "is_tot"], errors="ignore")
+    agg_no_tot = agg_no_tot.drop(columns=["key", "is_tot"], errors="ignore")
+
+    collapsed = pd.concat([tot_rows, agg_no_tot], ignore_index=True)
+    collapsed = collapsed.drop_duplicates(subset=["Player_clean", "season"])
+
+    return collapsed
+
+
+def reference_compute_primary_team(players_totals_raw: pd.DataFrame) -> pd.DataFrame:
+    df = players_totals_raw.copy()
+    df["Player_clean"] = df["Player"].apply(clean_player_name)
+    df = df[df["Team"] != "TOT"].copy()
+    df["MP"] = pd.to_numeric(df["MP"], errors="coerce")
+    df = df[df["MP"].notna()].copy()
+    if df.empty:
+        return pd.DataFrame(columns=["Player_clean", "season", "primary_team"])
+    df = df.sort_values(
+        ["Player_clean", "season", "MP"],
+        ascending=[True, True, False]
+    )
+    primary = df.drop_duplicates(subset=["Player_clean", "season"], keep="first")
+    primary = primary[["Player_clean", "season", "Team"]].copy()
+    primary = primary.rename(columns={"Team": "primary_team"})
+    return primary
+
+
+def load_tables(year: int):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return load_player_tables_for_year(year)
+
+
+@pytest.mark.parametrize("year", YEARS)
+def test_matches_reference(year):
+    tabs = load_tables(year)
+    player_index = build_player_index(*tabs)
+    for df in tabs[:4]:
+        pd.testing.assert_frame_equal(
+            reference_collapse_multiteam_players(df),
+            collapse_multiteam_players(df, player_index),
+        )
+    pd.testing.assert_frame_equal(
+        reference_compute_primary_team(tabs[0]),
+        compute_primary_team(tabs[0], player_index),
+    )
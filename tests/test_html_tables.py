@@ -0,0 +1,66 @@
+"""
+HtmlTables against pd.read_html on the checked-in fixture pages.
+"""
+import os
+import sys
+from io import StringIO
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scrape_basketball_reference import HtmlTables  # noqa: E402
+
+FIXTURE_DIR = os.path.join(ROOT, "tests", "fixtures", "bbref")
+
+PAGES = {
+    "leagues/NBA_2024_totals.html": ["totals_stats"],
+    "leagues/NBA_2024_per_game.html": ["per_game_stats"],
+    "leagues/NBA_2024_per_poss.html": ["per_poss_stats"],
+    "leagues/NBA_2024_advanced.html": ["advanced_stats"],
+    "leagues/NBA_2024_standings.html": ["confs_standings_E", "confs_standings_W", "divs_standings_E"],
+    "awards/awards_2024.html": ["mvp", "roy"],
+}
+
+
+def _page(rel: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, rel), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("rel", sorted(PAGES))
+def test_matches_read_html(rel):
+    html = _page(rel)
+    tables = HtmlTables(html)
+    for table_id in PAGES[rel]:
+        # Commented-out tables are not visible to read_html on the full page
+        source = html.replace("<!--", "").replace("-->", "")
+        expected = pd.read_html(StringIO(source), attrs={"id": table_id})[0]
+        pd.testing.assert_frame_equal(tables.read(table_id), expected)
+
+
+def test_multi_level_header():
+    df = HtmlTables(_page("awards/awards_2024.html")).read("mvp")
+    assert isinstance(df.columns, pd.MultiIndex)
+    assert ("Voting", "Share") in df.columns
+    assert df[("Voting", "Share")].dtype == float
+
+
+def test_fallback_by_columns_then_first_non_empty():
+    tables = HtmlTables(_page("leagues/NBA_2024_standings.html"))
+    # No table here has a FALLBACK_COLUMN_SETS header (standings say
+    # "Eastern Conference", not "Team"), so the first non-empty one is used
+    df = tables.read("no_such_table")
+    pd.testing.assert_frame_equal(df, tables.read("confs_standings_E"))
+
+    html = ("<html><body><table><tr><th>A</th></tr></table>"
+            "<table><tr><th>Player</th><th>Tm</th></tr><tr><td>X</td><td>BOS</td></tr></table>"
+            "</body></html>")
+    df = HtmlTables(html).read("missing")
+    assert list(df.columns) == ["Player", "Tm"]
+
+    html = "<html><body><table><tr><th>A</th></tr></table><table><tr><th>B</th></tr><tr><td>1</td></tr></table></body></html>"
+    df = HtmlTables(html).read("missing")
+    assert list(df.columns) == ["B"] and df["B"].tolist() == [1]
@@ -0,0 +1,52 @@
+"""
+Warm-started random-forest tuning against fitting every n_estimators size
+from scratch: the per-candidate LOSO MAEs, and so the chosen
+configuration, must be identical. benchmarks/bench_rf_warm_start.py times
+the two on the full grid.
+"""
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+from sklearn.model_selection import ParameterGrid  # noqa: E402
+
+from model import (  # noqa: E402
+    FoldCache,
+    build_panel_dataset,
+    engineer_features,
+    evaluate_candidates,
+    select_feature_matrix,
+)
+
+SEASONS = [2016, 2017, 2018]
+GRID = {"n_estimators": [5, 10, 20], "max_depth": [3, None], "min_samples_leaf": [1, 2]}
+
+
+@pytest.fixture(scope="module")
+def fold_cache():
+    with contextlib.redirect_stdout(io.StringIO()):
+        panel = engineer_features(build_panel_dataset(SEASONS))
+    # As temporal_split does for the training seasons
+    panel = panel[panel["season_end_year"].isin(SEASONS)]
+    X, y, _ = select_feature_matrix(panel)
+    return FoldCache(X, y, panel["season_end_year"].values)
+
+
+def test_warm_start_matches_fresh_fits(fold_cache):
+    candidates = list(ParameterGrid(GRID))
+    rf = RandomForestRegressor(random_state=42)
+    with contextlib.redirect_stdout(io.StringIO()):
+        fresh = evaluate_candidates(rf, candidates, fold_cache, n_jobs=2, warm_start=False)
+        warm = evaluate_candidates(rf, candidates, fold_cache, n_jobs=2, warm_start=True)
+
+    assert len(fold_cache) == len(SEASONS)
+    np.testing.assert_array_equal(fresh, warm)
+    assert np.argmin(fresh) == np.argmin(warm)
@@ -0,0 +1,170 @@
+"""
+Offline scraper run against the pages in tests/fixtures/bbref, served by a
+local HTTP server laid out like the site (leagues/, awards/). The fixtures
+hold the first rows of the 2023-24 pages, so every scraped table is
+checked against the matching rows of data/2024.
+"""
+import functools
+import os
+import sys
+import threading
+from datetime import date
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scrape_basketball_reference as scraper  # noqa: E402
+
+FIXTURE_DIR = os.path.join(ROOT, "tests", "fixtures", "bbref")
+DATA_DIR = os.path.join(ROOT, "data", "2024")
+YEAR = 2024
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    handler = functools.partial(_QuietHandler, directory=FIXTURE_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _engine(tmp_path):
+    return scraper.ScraperEngine(cache_dir=str(tmp_path / "cache"), rate=1000.0, burst=100)
+
+
+def _assert_matches_data(scraped_path: str, expected_name: str) -> None:
+    scraped = pd.read_csv(scraped_path)
+    expected = pd.read_csv(os.path.join(DATA_DIR, expected_name), encoding="latin-1")
+    assert list(scraped.columns) == list(expected.columns)
+
+    # Fixture pages keep the first rows (and the League Average footer, if any)
+    if "Player" in expected.columns and (expected["Player"] == "League Average").any():
+        expected = pd.concat([expected.head(len(scraped) - 1), expected.tail(1)], ignore_index=True)
+    else:
+        expected = expected.head(len(scraped))
+
+    for col in expected.columns:
+        if col in ("Player", "Team") or not pd.api.types.is_numeric_dtype(expected[col]):
+            continue
+        assert np.allclose(scraped[col].astype(float), expected[col].astype(float), equal_nan=True), col
+
+
+def test_scrape_season_from_fixtures(tmp_path, base_url):
+    out_root = tmp_path / "data"
+    manifest = scraper.ResumeManifest(str(tmp_path / "manifest.json"), base_url, str(out_root))
+
+    results = scraper.scrape_seasons([YEAR], out_root=str(out_root), engine=_engine(tmp_path),
+                                     base_url=base_url, workers=2, manifest=manifest)
+
+    assert results == {"2024:players": True, "2024:standings": True, "2024:mvp": True}
+    season_dir = out_root / str(YEAR)
+    for name in ["players_totals.csv", "players_per_game.csv", "players_per_poss.csv",
+                 "players_advanced.csv", "standings_east.csv", "standings_west.csv", "mvp_voting.csv"]:
+        _assert_matches_data(str(season_dir / name), name)
+
+    standings = pd.read_csv(season_dir / "standings.csv")
+    assert len(standings) == 30
+    assert standings.loc[0, "Team"] == "Boston Celtics*"
+    mvp = pd.read_csv(season_dir / "mvp_voting.csv")
+    assert mvp.loc[1, "Player"] == "Shai Gilgeous-Alexander"
+
+
+def test_manifest_is_scoped_to_site_and_out_dir(tmp_path, base_url):
+    path = str(tmp_path / "manifest.json")
+    out_root = str(tmp_path / "data")
+    manifest = scraper.ResumeManifest(path, base_url, out_root)
+    scraper.scrape_seasons([YEAR], out_root=out_root, engine=_engine(tmp_path),
+                           base_url=base_url, workers=2, manifest=manifest)
+
+    # Same site and directory: nothing left to do
+    resumed = scraper.ResumeManifest(path, base_url, out_root)
+    assert scraper.scrape_seasons([YEAR], out_root=out_root, engine=_engine(tmp_path),
+                                  base_url=base_url, manifest=resumed) == {}
+
+    # Another out_dir or another site root shares the file but not the entries
+    assert not scraper.ResumeManifest(path, base_url, str(tmp_path / "other")).is_done(YEAR, "mvp")
+    assert not scraper.ResumeManifest(path, scraper.BASE_URL, out_root).is_done(YEAR, "mvp")
+    assert scraper.ResumeManifest(path, base_url + "/", out_root).is_done(YEAR, "mvp")
+
+
+def test_season_in_progress_is_never_marked_done(tmp_path, base_url, monkeypatch):
+    monkeypatch.setattr(scraper, "season_in_progress", lambda year, today=None: True)
+    out_root = str(tmp_path / "data")
+    manifest = scraper.ResumeManifest(str(tmp_path / "manifest.json"), base_url, out_root)
+
+    results = scraper.scrape_seasons([YEAR], out_root=out_root, engine=_engine(tmp_path),
+                                     base_url=base_url, workers=2, manifest=manifest)
+
+    assert all(results.values())
+    assert not any(manifest.is_done(YEAR, task) for task in scraper.SCRAPE_TASKS)
+
+
+def test_season_in_progress_dates():
+    assert scraper.season_in_progress(2026, today=date(2026, 4, 10))
+    assert scraper.season_in_progress(2027, today=date(2026, 10, 16))
+    assert not scraper.season_in_progress(2026, today=date(2026, 7, 1))
+    assert not scraper.season_in_progress(2024, today=date(2026, 10, 16))
+
+
+class _FlakyHandler(_QuietHandler):
+    # Answers 503 to the first request for every path
+    failed = set()
+
+    def do_GET(self):
+        if self.path not in self.failed:
+            self.failed.add(self.path)
+            self.send_error(503)
+            return
+        super().do_GET()
+
+
+def test_fetch_retries_server_errors(tmp_path):
+    handler = functools.partial(_FlakyHandler, directory=FIXTURE_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        engine = scraper.ScraperEngine(cache_dir=str(tmp_path / "cache"), rate=1000.0, burst=100,
+                                       backoff=0.01)
+        url = f"http://127.0.0.1:{server.server_address[1]}/awards/awards_2024.html"
+        assert "Most Valuable Player" in engine.fetch(url)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_gives_up_on_connection_errors(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _QuietHandler)
+    port = server.server_address[1]
+    server.server_close()  # nothing listens on the port any more
+    engine = scraper.ScraperEngine(cache_dir=str(tmp_path / "cache"), rate=1000.0, burst=100,
+                                   max_retries=2, backoff=0.01)
+    assert engine.fetch(f"http://127.0.0.1:{port}/leagues/NBA_2024_totals.html") is None
+
+
+def test_html_cache_index_is_append_only(tmp_path):
+    cache = scraper.HtmlCache(str(tmp_path))
+    cache.put("u1", "<html>1</html>", '"a"', None)
+    cache.put("u2", "<html>2</html>", None, None)
+    cache.put("u1", "<html>3</html>", '"b"', None)
+    with open(cache.index_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
+
+    reloaded = scraper.HtmlCache(str(tmp_path))
+    assert reloaded.read(reloaded.get("u1")) == "<html>3</html>"
+    assert reloaded.get("u1")["etag"] == '"b"'
+    assert reloaded.read(reloaded.get("u2")) == "<html>2</html>"